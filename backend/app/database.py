@@ -1,8 +1,117 @@
 import os
+import time
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import AsyncClient, AsyncClientOptions
+from app.timing import observe
 
 load_dotenv()
 url = os.getenv("SUPABASE_URL")
 key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key) 
\ No newline at end of file
+
+
+REST_VERBS = {"GET": "select", "HEAD": "count", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+
+def supabase_operation(request: httpx.Request):
+    """(dependency, operation) labels for a Supabase API call, e.g. ("supabase", "transactions.select")."""
+    parts = request.url.path.strip("/").split("/")
+    if parts[:2] == ["rest", "v1"] and len(parts) > 2:
+        if parts[2] == "rpc" and len(parts) > 3:
+            return "supabase", f"rpc.{parts[3]}"
+        return "supabase", f"{parts[2]}.{REST_VERBS.get(request.method, request.method.lower())}"
+    if parts[:2] == ["auth", "v1"] and len(parts) > 2:
+        return "supabase-auth", "jwks" if parts[-1] == "jwks.json" else parts[2]
+    return "supabase", "other"
+
+
+class TimedTransport(httpx.AsyncBaseTransport):
+    """Times every Supabase call (until its response headers arrive) and retries idempotent
+    ones once when the connection drops — usually a keep-alive connection the server closed."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, retries: int = 1):
+        self.transport = transport
+        self.retries = retries
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        dependency, operation = supabase_operation(request)
+        attempts = 1 + (self.retries if request.method in IDEMPOTENT_METHODS else 0)
+        for attempt in range(1, attempts + 1):
+            started = time.perf_counter()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError):
+                last = attempt == attempts
+                observe(dependency, operation, time.perf_counter() - started, "error" if last else "retried")
+                if last:
+                    raise
+            except Exception:
+                observe(dependency, operation, time.perf_counter() - started, "error")
+                raise
+            else:
+                # 4xx are answers (no rows, a failed check); only server errors count against Supabase
+                outcome = "error" if response.status_code >= 500 else "ok"
+                observe(dependency, operation, time.perf_counter() - started, outcome)
+                return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class Database:
+    """App-wide async Supabase client on one pooled, keep-alive HTTP/2 connection pool.
+
+    Opened and closed by the app lifespan; services keep a reference to this object
+    and reach the client through it.
+    """
+
+    def __init__(self, url: str, key: str):
+        self.url = url
+        self.key = key
+        self.http = None
+        self.client = None
+
+    async def connect(self):
+        self.http = httpx.AsyncClient(
+            transport=TimedTransport(httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("DB_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=int(os.getenv("DB_MAX_KEEPALIVE", "20")),
+                    keepalive_expiry=float(os.getenv("DB_KEEPALIVE_EXPIRY", "30")),
+                ),
+            ), retries=int(os.getenv("DB_RETRIES", "1"))),
+            timeout=httpx.Timeout(float(os.getenv("DB_TIMEOUT", "30")), connect=5.0),
+            follow_redirects=True,
+        )
+        self.client = AsyncClient(self.url, self.key, AsyncClientOptions(
+            httpx_client=self.http,
+            # Server-side client: no session storage and no token refresh timers
+            persist_session=False,
+            auto_refresh_token=False,
+        ))
+
+    async def close(self):
+        if self.http is not None:
+            await self.http.aclose()
+        self.http = None
+        self.client = None
+
+    def _require_client(self) -> AsyncClient:
+        if self.client is None:
+            raise RuntimeError("Database is not connected — it is opened by the app lifespan.")
+        return self.client
+
+    def table(self, table_name: str):
+        return self._require_client().table(table_name)
+
+    def rpc(self, fn: str, params: dict = None):
+        return self._require_client().rpc(fn, params)
+
+    @property
+    def auth(self):
+        return self._require_client().auth
+
+
+supabase = Database(url, key)
@@ -1,21 +1,69 @@
 import os
-from fastapi import Depends, HTTPException, status
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.database import supabase
+from app.services.token_service import TokenService, InvalidTokenError
+from app.services.data_versions import data_versions
+from app.metrics import NOT_MODIFIED_RESPONSES
 from dotenv import load_dotenv
 
 load_dotenv()
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
+# Tokens are verified locally (JWKS or the legacy JWT secret); the auth server is only
+# asked when no key can verify the token or when a session's recheck window has passed.
+token_service = TokenService(
+    supabase,
+    supabase_url=os.getenv("SUPABASE_URL"),
+    jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+    cache_size=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")),
+    cache_ttl=int(os.getenv("AUTH_TOKEN_CACHE_TTL", "300")),
+    session_recheck=int(os.getenv("AUTH_SESSION_RECHECK", "300")),
+    key_refresh_interval=int(os.getenv("AUTH_JWKS_REFRESH", "600")),
+)
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     token = credentials.credentials
     try:
-        # Verifica o token directamente no Supabase — sem precisar do JWT secret
-        response = supabase.auth.get_user(token)
-        if not response.user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        return {"user_id": response.user.id, "email": response.user.email}
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
\ No newline at end of file
+        return await token_service.verify(token)
+    except InvalidTokenError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+
+async def get_client_id(request: Request,
+                        credentials: HTTPAuthorizationCredentials = Depends(optional_security)) -> str:
+    """Who is calling an endpoint that doesn't require login, for per-caller limits:
+    the user when a valid token is sent, otherwise the client address. Behind a proxy that address
+    comes from X-Forwarded-For only if the proxy is in FORWARDED_ALLOW_IPS (uvicorn then takes the
+    nearest untrusted entry, which the caller can't choose)."""
+    if credentials:
+        try:
+            return (await token_service.verify(credentials.credentials))["user_id"]
+        except InvalidTokenError:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def conditional_get(*collections: str):
+    """Dependency for list endpoints: tags the response with an ETag built from the user's
+    collection versions and answers a matching If-None-Match with 304 before the endpoint runs."""
+
+    async def check(request: Request, response: Response, current_user: dict = Depends(get_current_user)):
+        # The body also depends on the query string and, for "this month" views, on the date
+        variant = f"{request.url.path}?{request.url.query}|{datetime.utcnow().date().isoformat()}"
+        etag = data_versions.etag(current_user["user_id"], collections, variant)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            NOT_MODIFIED_RESPONSES.labels(path=request.url.path).inc()
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+
+    return check
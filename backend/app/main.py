@@ -1,11 +1,46 @@
+import time
+STARTED = time.perf_counter()  # before the imports below, which are most of the cold start
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
-from app.routers import auth, accounts, transactions, budgets, budgets, predict
+from app.routers import auth, accounts, transactions, budgets, budgets, goals, predict, reports, exports, dashboard, sync, events
+from app.database import supabase
+from app.repositories import DB_BACKEND, postgres
+from app.dependencies import token_service
+from app.services.forecast_jobs import forecast_jobs
+from app.timing import ServerTimingMiddleware
+from app.metrics import STARTUP_DURATION
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP/2 client for every Supabase call, opened and closed with the app
+    await supabase.connect()
+    # DB_BACKEND=postgres: hot read paths skip PostgREST and use a direct asyncpg pool
+    if DB_BACKEND == "postgres":
+        await postgres.connect()
+    # JWKS is fetched once at startup and refreshed in the background
+    key_refresher = asyncio.create_task(token_service.run_key_refresher())
+    # Forecast training runs in worker processes, never on this event loop.
+    # The predict stack (pandas, torch…) is imported in the background once we are serving.
+    forecast_jobs.start()
+    STARTUP_DURATION.set(time.perf_counter() - STARTED)
+    logging.getLogger("uvicorn.error").info("API ready in %.0f ms", (time.perf_counter() - STARTED) * 1000)
+    yield
+    forecast_jobs.shutdown()
+    key_refresher.cancel()
+    await postgres.close()
+    await supabase.close()
+
 
 app = FastAPI(
     title="Finance Control API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # ==========================================================
@@ -21,10 +56,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition", "Server-Timing"],
 )
 
 # ── Prometheus ──────────────────────────────────────────────
-Instrumentator().instrument(app).expose(app)
+# Event streams stay open for minutes, which would swamp the request latency histograms
+Instrumentator(excluded_handlers=["^/events/?$"]).instrument(app).expose(app)
+# Per-dependency time of each request: histograms on /metrics, breakdown in Server-Timing
+app.add_middleware(ServerTimingMiddleware)
 
 # ==========================================================
 # Routers
@@ -33,7 +72,13 @@ app.include_router(auth.router)
 app.include_router(accounts.router)
 app.include_router(transactions.router)
 app.include_router(budgets.router)
+app.include_router(goals.router)
 app.include_router(predict.router)
+app.include_router(reports.router)
+app.include_router(exports.router)
+app.include_router(dashboard.router)
+app.include_router(sync.router)
+app.include_router(events.router)
 
 
 @app.get("/")
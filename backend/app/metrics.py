@@ -0,0 +1,97 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+# Custom application metrics. They are registered on the default prometheus_client
+# registry, so they are served by the same /metrics endpoint as the Instrumentator ones.
+
+# ── Auth ────────────────────────────────────────────────────
+AUTH_TOKEN_CACHE_HITS = Counter(
+    "auth_token_cache_hits_total",
+    "Bearer tokens answered from the validated-token cache."
+)
+AUTH_TOKEN_CACHE_MISSES = Counter(
+    "auth_token_cache_misses_total",
+    "Bearer tokens that had to be verified (locally or remotely)."
+)
+AUTH_TOKEN_VERIFICATIONS = Counter(
+    "auth_token_verifications_total",
+    "Bearer token verifications by method and outcome.",
+    ["method", "outcome"]
+)
+
+# ── Account ownership cache ─────────────────────────────────
+ACCOUNT_CACHE_HITS = Counter(
+    "account_cache_hits_total",
+    "User account-ID lookups served from the ownership cache."
+)
+ACCOUNT_CACHE_MISSES = Counter(
+    "account_cache_misses_total",
+    "User account-ID lookups that queried the accounts table."
+)
+ACCOUNT_CACHE_INVALIDATIONS = Counter(
+    "account_cache_invalidations_total",
+    "Ownership cache entries dropped after an account was created or deleted."
+)
+
+# ── Conditional GETs ────────────────────────────────────────
+NOT_MODIFIED_RESPONSES = Counter(
+    "http_not_modified_total",
+    "List requests answered 304 from the If-None-Match ETag, without a database read.",
+    ["path"]
+)
+
+# ── External dependencies ───────────────────────────────────
+# dependency: supabase, supabase-auth, postgres, auth, market-data, model
+# operation: what was asked of it — "<table>.<verb>", "rpc.<fn>", "verify", "history", "<model>.fit"…
+DEPENDENCY_LATENCY = Histogram(
+    "dependency_duration_seconds",
+    "Time spent waiting on an external dependency, per attempt.",
+    ["dependency", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+DEPENDENCY_ERRORS = Counter(
+    "dependency_errors_total",
+    "External calls that failed after their last attempt.",
+    ["dependency", "operation"]
+)
+DEPENDENCY_RETRIES = Counter(
+    "dependency_retries_total",
+    "Failed attempts at an external call that were retried.",
+    ["dependency", "operation"]
+)
+
+# ── Startup ─────────────────────────────────────────────────
+STARTUP_DURATION = Gauge(
+    "app_startup_seconds",
+    "Time from importing app.main to serving requests."
+)
+IMPORT_DURATION = Gauge(
+    "predict_import_seconds",
+    "Import time of each predict-stack module, measured by the background pre-warm.",
+    ["process", "module"]
+)
+
+# ── Forecasts ───────────────────────────────────────────────
+FORECASTS_COALESCED = Counter(
+    "forecasts_coalesced_total",
+    "Forecast requests that joined an identical job already in progress instead of starting one."
+)
+FORECASTS_REJECTED = Counter(
+    "forecasts_rejected_total",
+    "Forecast requests refused with 429, by which limit was hit (client or global).",
+    ["reason"]
+)
+
+# ── Live updates ────────────────────────────────────────────
+LIVE_CONNECTIONS = Gauge(
+    "live_streams_open",
+    "Event streams (GET /events) currently open on this process."
+)
+LIVE_EVENTS = Counter(
+    "live_events_delivered_total",
+    "Events queued to open streams, by event type.",
+    ["event"]
+)
+LIVE_OVERFLOWS = Counter(
+    "live_stream_overflows_total",
+    "Streams that fell a full queue behind and were told to resync."
+)
@@ -0,0 +1,30 @@
+"""Data access for the API's hot read paths: transaction listing, ownership checks, report
+and budget aggregation.
+
+DB_BACKEND picks the implementation: "supabase" (default) goes through PostgREST with the
+Supabase client; "postgres" queries the database directly over an asyncpg pool (DATABASE_URL).
+Both return the same rows, so services don't know which one they are talking to.
+"""
+import os
+
+from app.repositories.postgres_repository import PostgresRepository
+from app.repositories.supabase_repository import SupabaseRepository
+
+DB_BACKENDS = ["supabase", "postgres"]
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+if DB_BACKEND not in DB_BACKENDS:
+    raise RuntimeError(f"Invalid DB_BACKEND '{DB_BACKEND}'. Must be: {DB_BACKENDS}")
+
+postgres = PostgresRepository(
+    os.getenv("DATABASE_URL"),
+    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+    statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+    command_timeout=float(os.getenv("DB_TIMEOUT", "30")),
+)
+
+
+def get_repository(supabase_client):
+    if DB_BACKEND == "postgres":
+        return postgres
+    return SupabaseRepository(supabase_client)
@@ -0,0 +1,135 @@
+import json
+import asyncpg
+
+from app.timing import track
+
+
+class PostgresRepository:
+    """The same hot read paths as SupabaseRepository, straight over an asyncpg pool.
+
+    Skips the PostgREST hop (HTTP, request parsing, JSON re-encoding in a second server).
+    Rows are rendered to JSON by Postgres with json_agg, exactly as PostgREST renders them,
+    so timestamps, numerics and nulls come back identical whichever backend is selected.
+    asyncpg prepares each distinct statement once per connection and reuses it; set
+    DB_STATEMENT_CACHE_SIZE=0 behind a transaction-mode pooler (pgbouncer, Supavisor :6543).
+
+    Writes still go through the Supabase client.
+    """
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10,
+                 statement_cache_size: int = 100, command_timeout: float = 30):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_cache_size = statement_cache_size
+        self.command_timeout = command_timeout
+        self.pool = None
+
+    async def connect(self):
+        if not self.dsn:
+            raise RuntimeError("DATABASE_URL is required when DB_BACKEND=postgres.")
+        self.pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=self.min_size,
+            max_size=self.max_size,
+            statement_cache_size=self.statement_cache_size,
+            command_timeout=self.command_timeout,
+        )
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+        self.pool = None
+
+    def _require_pool(self) -> asyncpg.Pool:
+        if self.pool is None:
+            raise RuntimeError("Postgres pool is not connected — it is opened by the app lifespan.")
+        return self.pool
+
+    async def _fetch_json(self, operation: str, query: str, *args) -> list:
+        with track("postgres", operation):
+            rows = await self._require_pool().fetchval(
+                f"select coalesce(json_agg(r), '[]') from ({query}) r", *args
+            )
+        return json.loads(rows)
+
+    # ==========================================================
+    # region Queries
+    # ==========================================================
+
+    async def account_ids(self, user_id: str) -> list:
+        with track("postgres", "accounts.select"):
+            rows = await self._require_pool().fetch("select id from public.accounts where user_id = $1", user_id)
+        return [r["id"] for r in rows]
+
+    async def list_transactions(self, account_ids: list, limit: int, tx_type: str = None,
+                                category: str = None, min_amount: float = None, max_amount: float = None,
+                                date_from: str = None, date_before: str = None, date_until: str = None,
+                                after: tuple = None) -> list:
+        args = [list(account_ids)]
+
+        def param(value) -> str:
+            args.append(value)
+            return f"${len(args)}"
+
+        # Only the filters in use make it into the SQL: each combination is its own prepared
+        # statement, planned for the index on (account_id, date desc, id desc)
+        where = ["account_id = any($1::bigint[])"]
+        if tx_type:
+            where.append(f"type = {param(tx_type)}")
+        if category is not None:
+            where.append(f"category ilike {param(category)}")
+        if min_amount is not None:
+            where.append(f"amount >= {param(min_amount)}")
+        if max_amount is not None:
+            where.append(f"amount <= {param(max_amount)}")
+        # Timestamps are passed as text and parsed by Postgres, as PostgREST does
+        if date_from:
+            where.append(f"date >= {param(date_from)}::text::timestamptz")
+        if date_before:
+            where.append(f"date < {param(date_before)}::text::timestamptz")
+        if date_until:
+            where.append(f"date <= {param(date_until)}::text::timestamptz")
+        if after:
+            last_date, last_id = after
+            where.append(f"(date, id) < ({param(last_date)}::text::timestamptz, {param(last_id)})")
+
+        query = (
+            f"select * from public.transactions where {' and '.join(where)} "
+            f"order by date desc, id desc limit {param(limit)}"
+        )
+        return await self._fetch_json("transactions.select", query, *args)
+
+    async def report_aggregates(self, user_id: str, date_from: str, date_before: str,
+                                granularity: str, account_id: int = None) -> list:
+        return await self._fetch_json(
+            "rpc.report_aggregates",
+            "select * from public.report_aggregates($1, $2::text::timestamptz, $3::text::timestamptz, $4, $5)",
+            user_id, date_from, date_before, granularity, account_id,
+        )
+
+    async def budgets_with_spent(self, user_id: str, year: int, month: int) -> list:
+        # setof jsonb: aggregate the values themselves, not one-column records
+        with track("postgres", "rpc.budgets_with_spent"):
+            rows = await self._require_pool().fetchval(
+                "select coalesce(json_agg(b), '[]') from public.budgets_with_spent($1, $2, $3) b",
+                user_id, year, month,
+            )
+        return json.loads(rows)
+
+    async def budget_history(self, user_id: str, first_month: int, last_month: int) -> list:
+        return await self._fetch_json(
+            "rpc.budget_history",
+            "select * from public.budget_history($1, $2, $3)",
+            user_id, first_month, last_month,
+        )
+
+    async def sync_changes(self, user_id: str, after_xact: int, after_id: int, limit: int) -> dict:
+        with track("postgres", "rpc.sync_changes"):
+            result = await self._require_pool().fetchval(
+                "select public.sync_changes($1, $2, $3, $4)::text",
+                user_id, after_xact, after_id, limit,
+            )
+        return json.loads(result)
+
+    # endregion Queries
@@ -0,0 +1,88 @@
+class SupabaseRepository:
+    """Hot read paths over PostgREST, through the app-wide Supabase client (the default backend)."""
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+
+    async def account_ids(self, user_id: str) -> list:
+        response = await (
+            self.supabase.table("accounts")
+            .select("id")
+            .eq("user_id", user_id)
+            .execute()
+        )
+        return [a["id"] for a in response.data]
+
+    async def list_transactions(self, account_ids: list, limit: int, tx_type: str = None,
+                                category: str = None, min_amount: float = None, max_amount: float = None,
+                                date_from: str = None, date_before: str = None, date_until: str = None,
+                                after: tuple = None) -> list:
+        query = self.supabase.table("transactions").select("*")
+        if len(account_ids) == 1:
+            query = query.eq("account_id", account_ids[0])
+        else:
+            query = query.in_("account_id", account_ids)
+
+        if tx_type:
+            query = query.eq("type", tx_type)
+        if category is not None:
+            query = query.ilike("category", category)
+        if min_amount is not None:
+            query = query.gte("amount", min_amount)
+        if max_amount is not None:
+            query = query.lte("amount", max_amount)
+        if date_from:
+            query = query.gte("date", date_from)
+        if date_before:
+            query = query.lt("date", date_before)
+        if date_until:
+            query = query.lte("date", date_until)
+
+        if after:
+            last_date, last_id = after
+            query = query.or_(f'date.lt."{last_date}",and(date.eq."{last_date}",id.lt.{last_id})')
+
+        response = await (
+            query
+            .order("date", desc=True)
+            .order("id", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return response.data
+
+    async def report_aggregates(self, user_id: str, date_from: str, date_before: str,
+                                granularity: str, account_id: int = None) -> list:
+        response = await self.supabase.rpc("report_aggregates", {
+            "p_user_id": user_id,
+            "p_from": date_from,
+            "p_to": date_before,
+            "p_granularity": granularity,
+            "p_account_id": account_id,
+        }).execute()
+        return response.data or []
+
+    async def budgets_with_spent(self, user_id: str, year: int, month: int) -> list:
+        response = await self.supabase.rpc("budgets_with_spent", {
+            "p_user_id": user_id,
+            "p_year": year,
+            "p_month": month,
+        }).execute()
+        return response.data or []
+
+    async def budget_history(self, user_id: str, first_month: int, last_month: int) -> list:
+        response = await self.supabase.rpc("budget_history", {
+            "p_user_id": user_id,
+            "p_from_month": first_month,
+            "p_to_month": last_month,
+        }).execute()
+        return response.data or []
+
+    async def sync_changes(self, user_id: str, after_xact: int, after_id: int, limit: int) -> dict:
+        response = await self.supabase.rpc("sync_changes", {
+            "p_user_id": user_id,
+            "p_after_xact": after_xact,
+            "p_after_id": after_id,
+            "p_limit": limit,
+        }).execute()
+        return response.data
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from app.database import supabase
 from app.services.account_service import AccountService
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, conditional_get
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 account_service = AccountService(supabase)
@@ -27,16 +27,16 @@ class UpdateAccountRequest(BaseModel):
 # region Endpoints
 # ==========================================================
 
-@router.get("/")
-def list_accounts(current_user: dict = Depends(get_current_user)):
-    accounts = account_service.list_accounts(current_user["user_id"])
+@router.get("/", dependencies=[Depends(conditional_get("accounts"))])
+async def list_accounts(current_user: dict = Depends(get_current_user)):
+    accounts = await account_service.list_accounts(current_user["user_id"])
     return accounts
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_account(body: CreateAccountRequest, current_user: dict = Depends(get_current_user)):
+async def create_account(body: CreateAccountRequest, current_user: dict = Depends(get_current_user)):
     try:
-        account = account_service.create_account(
+        account = await account_service.create_account(
             user_id=current_user["user_id"],
             name=body.name,
             acc_type=body.type,
@@ -48,24 +48,24 @@ def create_account(body: CreateAccountRequest, current_user: dict = Depends(get_
 
 
 @router.get("/{account_id}")
-def get_account(account_id: int, current_user: dict = Depends(get_current_user)):
-    account = account_service.get_account(current_user["user_id"], account_id)
+async def get_account(account_id: int, current_user: dict = Depends(get_current_user)):
+    account = await account_service.get_account(current_user["user_id"], account_id)
     if not account:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Account not found.")
     return account
 
 
 @router.patch("/{account_id}")
-def update_account(account_id: int, body: UpdateAccountRequest, current_user: dict = Depends(get_current_user)):
+async def update_account(account_id: int, body: UpdateAccountRequest, current_user: dict = Depends(get_current_user)):
     try:
-        updated = account_service.update_account_name(current_user["user_id"], account_id, body.name)
+        updated = await account_service.update_account_name(current_user["user_id"], account_id, body.name)
         return updated
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_account(account_id: int, current_user: dict = Depends(get_current_user)):
-    account_service.delete_account(current_user["user_id"], account_id)
+async def delete_account(account_id: int, current_user: dict = Depends(get_current_user)):
+    await account_service.delete_account(current_user["user_id"], account_id)
 
 # endregion Endpoints
\ No newline at end of file
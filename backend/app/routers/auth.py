@@ -31,9 +31,9 @@ class LoginRequest(BaseModel):
 # ==========================================================
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(body: RegisterRequest):
+async def register(body: RegisterRequest):
     try:
-        user = auth_service.register_user(
+        user = await auth_service.register_user(
             username=body.username,
             email=body.email,
             password=body.password,
@@ -48,9 +48,9 @@ def register(body: RegisterRequest):
 
 
 @router.post("/login")
-def login(body: LoginRequest):
+async def login(body: LoginRequest):
     try:
-        session = auth_service.login_user(
+        session = await auth_service.login_user(
             identifier=body.identifier,
             password=body.password
         )
@@ -1,8 +1,12 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from app.database import supabase
 from app.services.budget_service import BudgetService
-from app.dependencies import get_current_user
+from app.services.data_versions import data_versions
+from app.services.live_updates import live_updates
+from app.dependencies import get_current_user, conditional_get
 
 router = APIRouter(prefix="/budgets", tags=["Budgets"])
 budget_service = BudgetService(supabase)
@@ -11,11 +15,20 @@ class UpdateBudgetRequest(BaseModel):
     limit_amount: float
 
 @router.patch("/{budget_id}")
-def update_budget(budget_id: int, body: UpdateBudgetRequest, current_user: dict = Depends(get_current_user)):
+async def update_budget(budget_id: int, body: UpdateBudgetRequest, current_user: dict = Depends(get_current_user)):
+    user_id = current_user["user_id"]
     try:
-        result = supabase.table("budgets").update({"limit_amount": body.limit_amount}).eq("id", budget_id).eq("user_id", current_user["user_id"]).execute()
+        previous_limit = None
+        if live_updates.has_subscribers(user_id):
+            # Only read with a stream open: the old limit tells whether the new one crossed an alert threshold
+            old = await supabase.table("budgets").select("limit_amount").eq("id", budget_id).eq("user_id", user_id).execute()
+            previous_limit = old.data[0]["limit_amount"] if old.data else None
+
+        result = await supabase.table("budgets").update({"limit_amount": body.limit_amount}).eq("id", budget_id).eq("user_id", user_id).execute()
         if not result.data:
             raise HTTPException(status_code=404, detail="Budget not found")
+        data_versions.touch(user_id, "budgets")
+        live_updates.budget_changed(supabase, user_id, result.data[0], previous_limit)
         return result.data[0]
     except HTTPException:
         raise
@@ -27,15 +40,45 @@ class CreateBudgetRequest(BaseModel):
     limit_amount: float
 
 
-@router.get("/")
-def list_budgets(current_user: dict = Depends(get_current_user)):
-    return budget_service.get_budgets_with_spent(current_user["user_id"])
+@router.get("/", dependencies=[Depends(conditional_get("budgets"))])
+async def list_budgets(current_user: dict = Depends(get_current_user)):
+    return await budget_service.get_budgets_with_spent(current_user["user_id"])
+
+
+@router.get("/history", dependencies=[Depends(conditional_get("budgets"))])
+async def budget_history(
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    # Defaults to the last 6 months, current one included
+    now = datetime.utcnow()
+    if not month_to:
+        month_to = f"{now.year:04d}-{now.month:02d}"
+    if not month_from:
+        year, month = divmod(now.year * 12 + now.month - 6, 12)
+        month_from = f"{year:04d}-{month + 1:02d}"
+    try:
+        return await budget_service.get_budget_history(current_user["user_id"], month_from, month_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/reconcile")
+async def reconcile_budgets(current_user: dict = Depends(get_current_user)):
+    # Rebuilds the spending counters from scratch; normally they are kept up to date incrementally
+    try:
+        return await budget_service.reconcile_spent(current_user["user_id"])
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_budget(body: CreateBudgetRequest, current_user: dict = Depends(get_current_user)):
+async def create_budget(body: CreateBudgetRequest, current_user: dict = Depends(get_current_user)):
     try:
-        return budget_service.create_budget(
+        return await budget_service.create_budget(
             user_id=current_user["user_id"],
             category=body.category,
             limit_amount=body.limit_amount
@@ -47,8 +90,8 @@ def create_budget(body: CreateBudgetRequest, current_user: dict = Depends(get_cu
 
 
 @router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_budget(budget_id: int, current_user: dict = Depends(get_current_user)):
+async def delete_budget(budget_id: int, current_user: dict = Depends(get_current_user)):
     try:
-        budget_service.delete_budget(current_user["user_id"], budget_id)
+        await budget_service.delete_budget(current_user["user_id"], budget_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
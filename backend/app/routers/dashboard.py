@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from app.database import supabase
+from app.services.dashboard_service import DashboardService
+from app.services.transaction_service import TransactionService
+from app.dependencies import get_current_user, conditional_get
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+dashboard_service = DashboardService(supabase)
+
+
+# ==========================================================
+# region Endpoints
+# ==========================================================
+
+@router.get("/", dependencies=[Depends(conditional_get("accounts", "transactions", "budgets", "goals"))])
+async def get_dashboard(
+    tx_limit: int = Query(default=TransactionService.MAX_PAGE_SIZE, ge=1, le=TransactionService.MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
+    # Accounts, latest transactions, budgets, goals and this month's summary in one round trip
+    try:
+        return await dashboard_service.get_dashboard(current_user["user_id"], tx_limit=tx_limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# endregion Endpoints
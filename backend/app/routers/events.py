@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import time
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
+from app.services.live_updates import live_updates, TooManyStreams
+from app.dependencies import get_current_user
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT", "25"))
+# Streams are closed after this long so clients reconnect with a fresh token
+MAX_STREAM_SECONDS = float(os.getenv("LIVE_STREAM_MAX_AGE", "3600"))
+RETRY_MS = 3000
+
+
+# ==========================================================
+# region Helpers
+# ==========================================================
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def event_stream(user_id: str):
+    # Subscribing here, not in the endpoint, means the finally below always runs for it
+    try:
+        queue = live_updates.subscribe(user_id)
+    except TooManyStreams:
+        return
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        deadline = time.monotonic() + MAX_STREAM_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=min(HEARTBEAT_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection
+                yield ": ping\n\n"
+                continue
+            yield format_event(event, data)
+    finally:
+        # Also runs when the client disconnects and the response task is cancelled
+        live_updates.unsubscribe(user_id, queue)
+
+# endregion Helpers
+
+
+# ==========================================================
+# region Endpoints
+# ==========================================================
+
+@router.get("/")
+async def events(current_user: dict = Depends(get_current_user)):
+    # Server-sent events: "transaction", "balance" (or the account's deletion), "budget" (spending or a new limit,
+    # and any alert threshold crossed) and "resync"
+    user_id = current_user["user_id"]
+    if not live_updates.can_subscribe(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many open event streams (max {live_updates.max_per_user})."
+        )
+
+    return StreamingResponse(
+        event_stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# endregion Endpoints
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
+from app.database import supabase
+from app.services.export_service import ExportService
+from app.dependencies import get_current_user
+
+router = APIRouter(prefix="/export", tags=["Export"])
+export_service = ExportService(supabase)
+
+
+# ==========================================================
+# region Helpers
+# ==========================================================
+
+def _stream(chunks, filename: str, media_type: str, gzip: bool) -> StreamingResponse:
+    if gzip:
+        chunks = export_service.gzip(chunks)
+        filename, media_type = f"{filename}.gz", "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# endregion Helpers
+
+
+# ==========================================================
+# region Endpoints
+# ==========================================================
+
+@router.get("/transactions.csv")
+async def export_transactions_csv(
+    account_id: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    gzip: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = current_user["user_id"]
+    try:
+        await export_service.validate(user_id, account_id, date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    chunks = export_service.transactions_csv(user_id, account_id, date_from, date_to)
+    return _stream(chunks, "transactions.csv", "text/csv; charset=utf-8", gzip)
+
+
+@router.get("/backup.json")
+async def export_backup_json(
+    account_id: Optional[int] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    gzip: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    user_id = current_user["user_id"]
+    try:
+        await export_service.validate(user_id, account_id, date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    chunks = export_service.backup_json(user_id, account_id, date_from, date_to)
+    filename = f"fincontrol-backup-{datetime.utcnow().date().isoformat()}.json"
+    return _stream(chunks, filename, "application/json", gzip)
+
+# endregion Endpoints
@@ -1,9 +1,9 @@
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends, status
 from pydantic import BaseModel
 from app.database import supabase
 from app.services.goal_service import GoalService
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, conditional_get
 
 router = APIRouter(prefix="/goals", tags=["Goals"])
 goal_service = GoalService(supabase)
@@ -15,19 +15,35 @@ class CreateGoalRequest(BaseModel):
     deadline: Optional[str] = None  # format: YYYY-MM-DD
 
 
+class UpdateGoalRequest(BaseModel):
+    # Only the fields sent are changed; "deadline": null clears it
+    name: Optional[str] = None
+    target_amount: Optional[float] = None
+    deadline: Optional[str] = None  # format: YYYY-MM-DD
+
+
 class AddFundsRequest(BaseModel):
     amount: float
 
 
-@router.get("/")
-def list_goals(current_user: dict = Depends(get_current_user)):
-    return goal_service.list_goals(current_user["user_id"])
+class Deposit(BaseModel):
+    goal_id: int
+    amount: float
+
+
+class AddFundsBatchRequest(BaseModel):
+    deposits: List[Deposit]
+
+
+@router.get("/", dependencies=[Depends(conditional_get("goals"))])
+async def list_goals(current_user: dict = Depends(get_current_user)):
+    return await goal_service.list_goals(current_user["user_id"])
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_goal(body: CreateGoalRequest, current_user: dict = Depends(get_current_user)):
+async def create_goal(body: CreateGoalRequest, current_user: dict = Depends(get_current_user)):
     try:
-        return goal_service.create_goal(
+        return await goal_service.create_goal(
             user_id=current_user["user_id"],
             name=body.name,
             target_amount=body.target_amount,
@@ -39,10 +55,33 @@ def create_goal(body: CreateGoalRequest, current_user: dict = Depends(get_curren
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.patch("/{goal_id}")
+async def update_goal(goal_id: int, body: UpdateGoalRequest, current_user: dict = Depends(get_current_user)):
+    try:
+        return await goal_service.update_goal(current_user["user_id"], goal_id, body.model_dump(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/add-funds")
+async def add_funds_batch(body: AddFundsBatchRequest, current_user: dict = Depends(get_current_user)):
+    # All deposits are applied in one database call, or none of them
+    try:
+        return await goal_service.add_funds_many(
+            current_user["user_id"], [d.model_dump() for d in body.deposits]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.post("/{goal_id}/add-funds")
-def add_funds(goal_id: int, body: AddFundsRequest, current_user: dict = Depends(get_current_user)):
+async def add_funds(goal_id: int, body: AddFundsRequest, current_user: dict = Depends(get_current_user)):
     try:
-        return goal_service.add_funds(current_user["user_id"], goal_id, body.amount)
+        return await goal_service.add_funds(current_user["user_id"], goal_id, body.amount)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -50,8 +89,8 @@ def add_funds(goal_id: int, body: AddFundsRequest, current_user: dict = Depends(
 
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_goal(goal_id: int, current_user: dict = Depends(get_current_user)):
+async def delete_goal(goal_id: int, current_user: dict = Depends(get_current_user)):
     try:
-        goal_service.delete_goal(current_user["user_id"], goal_id)
+        await goal_service.delete_goal(current_user["user_id"], goal_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
\ No newline at end of file
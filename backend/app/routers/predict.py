@@ -1,13 +1,41 @@
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
-import pandas as pd
-import yfinance as yf
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+import asyncio
 import warnings
+from datetime import date
+from typing import Literal
+from app.services.forecast_jobs import forecast_jobs, AdmissionError
+from app.dependencies import get_client_id
+from app.services.forecast_service import MODELS
+from app.services.tickers import normalize_ticker
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 router = APIRouter(prefix="/predict", tags=["predict"])
 
 
+def _market_data():
+    # Imported on first use (numpy, pandas): the API starts without the predict stack,
+    # and the background pre-warm has usually loaded it by the first call
+    from app.services.market_data import market_data
+    return market_data
+
+
+def _ticker(value: str) -> str:
+    # Tickers end up in file paths (market-data store): reject anything that isn't a symbol
+    try:
+        return normalize_ticker(value)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _start(value: str) -> str:
+    # Checked before a job is queued, so a bad date is a 400 rather than a failed job
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid start date. Use YYYY-MM-DD.")
+
+
 class PredictResponse(BaseModel):
     ticker: str
     company_name: str
@@ -22,14 +50,14 @@ class PredictResponse(BaseModel):
 @router.get("/search")
 async def search_ticker(q: str = Query(..., min_length=1)):
     # Search for ticker info
+    ticker = _ticker(q)
     try:
-        ticker = yf.Ticker(q.upper())
-        info = ticker.info
+        info = await asyncio.to_thread(lambda: _market_data().get_info(ticker))
         if not info or "regularMarketPrice" not in info and "currentPrice" not in info:
             raise HTTPException(status_code=404, detail="Ticker not found")
         return {
-            "ticker": q.upper(),
-            "name": info.get("longName") or info.get("shortName") or q.upper(),
+            "ticker": ticker,
+            "name": info.get("longName") or info.get("shortName") or ticker,
             "currency": info.get("currency", "USD"),
             "sector": info.get("sector", ""),
             "current_price": info.get("currentPrice") or info.get("regularMarketPrice") or 0,
@@ -40,99 +68,124 @@ async def search_ticker(q: str = Query(..., min_length=1)):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+ForecastModel = Literal[tuple(MODELS)]
+
+
+class ForecastJobRequest(BaseModel):
+    ticker: str
+    start: str = "2022-01-01"
+    periods: int = Field(default=180, ge=30, le=365)
+    model: ForecastModel = "neuralprophet"
+
+
+def _too_many_requests(e: AdmissionError):
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _submit_job(ticker: str, start: str, periods: int, model: str, client: str):
+    # An identical forecast already in progress is joined, not started again
+    ticker, start = _ticker(ticker), _start(start)
+    try:
+        return forecast_jobs.submit(ticker, start, periods, model, client)
+    except AdmissionError as e:
+        raise _too_many_requests(e)
+
+
+def _job_response(job):
+    if job.status == "failed":
+        raise HTTPException(status_code=job.error_status or 500, detail=job.error)
+    if job.status == "cancelled":
+        raise HTTPException(status_code=409, detail="Forecast job was cancelled")
+    return PredictResponse(**job.result)
+
+
 @router.get("/forecast")
 async def get_forecast(
     ticker: str = Query(...),
     start: str = Query(default="2022-01-01"),
-    periods: int = Query(default=180, ge=30, le=365)
+    periods: int = Query(default=180, ge=30, le=365),
+    model: ForecastModel = Query(default="neuralprophet"),
+    client: str = Depends(get_client_id)
 ):
-    # Download historical data and run NeuralProphet forecast
+    # Download historical data and run the forecast — in a worker process, off the event loop
+    job = _submit_job(ticker, start, periods, model, client)
+    await forecast_jobs.wait(job)
+    return _job_response(job)
+
+
+class BatchForecastRequest(BaseModel):
+    tickers: list[str] = Field(min_length=1, max_length=10)
+    start: str = "2022-01-01"
+    periods: int = Field(default=180, ge=30, le=365)
+    model: ForecastModel = "neuralprophet"
+
+
+@router.post("/forecast/batch")
+async def get_batch_forecast(body: BatchForecastRequest, client: str = Depends(get_client_id)):
+    # One grouped download for every ticker, then one training job per ticker across the worker pool
+    tickers = list(dict.fromkeys(_ticker(t) for t in body.tickers))
+    start = _start(body.start)
     try:
-        from neuralprophet import NeuralProphet
-        import torch
-        import torch.serialization
-        from sklearn.metrics import r2_score, mean_absolute_error, mean_absolute_percentage_error
-
-        # Patch torch load for NeuralProphet compatibility
-        _original_load = torch.load
-        torch.load = lambda *a, **kw: _original_load(*a, **{**kw, "weights_only": False})
-
-        ticker_upper = ticker.upper()
-        end = pd.Timestamp.today().strftime("%Y-%m-%d")
-
-        # Download data
-        data = yf.download(ticker_upper, start=start, end=end, multi_level_index=False)
-        if data.empty:
-            raise HTTPException(status_code=404, detail=f"No data found for ticker '{ticker_upper}'")
-
-        data = data[["Close"]].reset_index()
-        data.columns = ["ds", "y"]
-        data["ds"] = pd.to_datetime(data["ds"]).dt.tz_localize(None)
-        data = data.dropna()
-
-        if len(data) < 30:
-            raise HTTPException(status_code=400, detail="Not enough historical data (minimum 30 days required)")
-
-        # Train model
-        model = NeuralProphet(
-            n_forecasts=1,
-            n_lags=0,
-            yearly_seasonality=True,
-            weekly_seasonality=True,
-            daily_seasonality=False,
-        )
-        model.fit(data, freq="B", progress="none")
-
-        # Future forecast
-        future_data = model.make_future_dataframe(data, periods=periods)
-        forecast_df = model.predict(future_data)
-
-        # Historic fitted values
-        historic_df = model.predict(data)
-
-        # Restore torch
-        torch.load = _original_load
-
-        # Metrics
-        valid = historic_df.dropna(subset=["y", "yhat1"])
-        r2   = round(float(r2_score(valid["y"], valid["yhat1"])), 4)
-        mae  = round(float(mean_absolute_error(valid["y"], valid["yhat1"])), 4)
-        mape = round(float(mean_absolute_percentage_error(valid["y"], valid["yhat1"])) * 100, 2)
-
-        # Current price & change
-        current_price = float(data["y"].iloc[-1])
-        last_forecast  = float(forecast_df["yhat1"].iloc[-1])
-        price_change_pct = round(((last_forecast - current_price) / current_price) * 100, 2)
-
-        # Serialize
-        historic_out = [
-            {"date": str(row.ds.date()), "actual": round(float(row.y), 4), "predicted": round(float(row.yhat1), 4)}
-            for row in valid.itertuples() if pd.notna(row.yhat1)
-        ]
-        forecast_out = [
-            {"date": str(row.ds.date()), "predicted": round(float(row.yhat1), 4)}
-            for row in forecast_df.itertuples()
-            if pd.notna(row.yhat1) and pd.Timestamp(row.ds) > pd.Timestamp(data["ds"].iloc[-1])
-        ]
-
-        # Ticker info
-        ticker_obj = yf.Ticker(ticker_upper)
-        info = ticker_obj.info
-        company_name = info.get("longName") or info.get("shortName") or ticker_upper
-        currency = info.get("currency", "USD")
-
-        return PredictResponse(
-            ticker=ticker_upper,
-            company_name=company_name,
-            currency=currency,
-            historic=historic_out,
-            forecast=forecast_out,
-            metrics={"r2": r2, "mae": mae, "mape": mape},
-            current_price=current_price,
-            price_change_pct=price_change_pct,
-        )
+        await asyncio.to_thread(lambda: _market_data().sync_many(tickers, date.fromisoformat(start)))
+    except Exception:
+        pass  # each job falls back to its own download
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
\ No newline at end of file
+    try:
+        jobs = forecast_jobs.submit_many(tickers, start, body.periods, body.model, client)
+    except AdmissionError as e:
+        raise _too_many_requests(e)
+    await asyncio.gather(*(forecast_jobs.wait(job) for job in jobs))
+
+    results, errors = {}, {}
+    for job in jobs:
+        try:
+            results[job.ticker] = _job_response(job)
+        except HTTPException as e:
+            errors[job.ticker] = {"status_code": e.status_code, "detail": e.detail}
+    return {"results": results, "errors": errors}
+
+
+# ==========================================================
+# region Forecast Jobs
+# ==========================================================
+
+@router.post("/jobs", status_code=202)
+async def submit_forecast_job(body: ForecastJobRequest, client: str = Depends(get_client_id)):
+    job = _submit_job(body.ticker, body.start, body.periods, body.model, client)
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def get_forecast_job(job_id: str, wait: float = Query(default=0, ge=0, le=60)):
+    # wait > 0 long-polls: returns as soon as the job finishes, or after `wait` seconds
+    job = forecast_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if wait and not job.is_finished:
+        await forecast_jobs.wait(job, timeout=wait)
+    return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_forecast_job_result(job_id: str):
+    job = forecast_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job.is_finished:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return _job_response(job)
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_forecast_job(job_id: str, client: str = Depends(get_client_id)):
+    # Only withdraws the caller's own interest: the job stops once nobody else is waiting on it
+    job = forecast_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.is_finished:
+        raise HTTPException(status_code=409, detail=f"Job is already {job.status}")
+    if not forecast_jobs.cancel(job, client):
+        raise HTTPException(status_code=403, detail="Only a caller that submitted this job can cancel it")
+    return {"job_id": job.id, "status": job.status if job.subscribers else "cancelling"}
+
+# endregion Forecast Jobs
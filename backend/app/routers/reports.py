@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from app.database import supabase
+from app.services.report_service import ReportService
+from app.dependencies import get_current_user, conditional_get
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+report_service = ReportService(supabase)
+
+
+# ==========================================================
+# region Endpoints
+# ==========================================================
+
+@router.get("/", dependencies=[Depends(conditional_get("transactions"))])
+async def get_report(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    granularity: str = Query(default="month"),
+    account_id: Optional[int] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    # Defaults to the last 6 months, like the dashboard trend chart
+    today = datetime.utcnow().date()
+    date_to = date_to or today.isoformat()
+    date_from = date_from or (today.replace(day=1) - timedelta(days=150)).replace(day=1).isoformat()
+    try:
+        return await report_service.get_report(
+            current_user["user_id"],
+            date_from=date_from,
+            date_to=date_to,
+            granularity=granularity,
+            account_id=account_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# endregion Endpoints
@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from app.database import supabase
+from app.services.sync_service import SyncService
+from app.dependencies import get_current_user
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+sync_service = SyncService(supabase)
+
+
+# ==========================================================
+# region Endpoints
+# ==========================================================
+
+@router.get("/")
+async def sync(
+    since: Optional[str] = None,
+    limit: int = Query(default=SyncService.DEFAULT_LIMIT, ge=1, le=SyncService.MAX_LIMIT),
+    current_user: dict = Depends(get_current_user)
+):
+    # Rows changed since the cursor (every row when there is none), plus the next cursor
+    try:
+        return await sync_service.changes_since(current_user["user_id"], since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+# endregion Endpoints
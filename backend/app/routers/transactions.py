@@ -1,12 +1,14 @@
-from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, status
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
 from pydantic import BaseModel
 from app.database import supabase
 from app.services.transaction_service import TransactionService
-from app.dependencies import get_current_user
+from app.services.import_service import ImportService
+from app.dependencies import get_current_user, conditional_get
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 transaction_service = TransactionService(supabase)
+import_service = ImportService(supabase)
 
 
 # ==========================================================
@@ -20,6 +22,24 @@ class CreateTransactionRequest(BaseModel):
     category: str
     description: Optional[str] = None
     date: Optional[str] = None
+
+
+class TransferRequest(BaseModel):
+    from_account_id: int
+    to_account_id: int
+    amount: float
+    description: Optional[str] = None  # default: "Transfer to/from <account name>"
+    date: Optional[str] = None
+    replace_transaction_id: Optional[int] = None  # deleted in the same database transaction
+
+
+class UpdateTransactionRequest(BaseModel):
+    account_id: Optional[int] = None
+    amount: Optional[float] = None
+    type: Optional[str] = None
+    category: Optional[str] = None
+    description: Optional[str] = None
+    date: Optional[str] = None
 # endregion
 
 
@@ -27,18 +47,40 @@ class CreateTransactionRequest(BaseModel):
 # region Endpoints
 # ==========================================================
 
-@router.get("/")
-def list_transactions(account_id: Optional[int] = None, current_user: dict = Depends(get_current_user)):
+@router.get("/", dependencies=[Depends(conditional_get("transactions"))])
+async def list_transactions(
+    account_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=TransactionService.DEFAULT_PAGE_SIZE, ge=1, le=TransactionService.MAX_PAGE_SIZE),
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    type: Optional[str] = None,
+    category: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    current_user: dict = Depends(get_current_user)
+):
     try:
-        return transaction_service.list_transactions(current_user["user_id"], account_id)
+        return await transaction_service.list_transactions(
+            current_user["user_id"],
+            account_id,
+            cursor=cursor,
+            limit=limit,
+            date_from=date_from,
+            date_to=date_to,
+            tx_type=type,
+            category=category,
+            min_amount=min_amount,
+            max_amount=max_amount,
+        )
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-def create_transaction(body: CreateTransactionRequest, current_user: dict = Depends(get_current_user)):
+async def create_transaction(body: CreateTransactionRequest, current_user: dict = Depends(get_current_user)):
     try:
-        tx = transaction_service.create_transaction(
+        tx = await transaction_service.create_transaction(
             user_id=current_user["user_id"],
             account_id=body.account_id,
             amount=body.amount,
@@ -54,10 +96,67 @@ def create_transaction(body: CreateTransactionRequest, current_user: dict = Depe
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post("/transfer", status_code=status.HTTP_201_CREATED)
+async def create_transfer(body: TransferRequest, current_user: dict = Depends(get_current_user)):
+    # Both legs (and the replaced transaction, if any) are written in one database transaction
+    try:
+        return await transaction_service.create_transfer(
+            user_id=current_user["user_id"],
+            from_account_id=body.from_account_id,
+            to_account_id=body.to_account_id,
+            amount=body.amount,
+            date=body.date,
+            description=body.description,
+            replace_transaction_id=body.replace_transaction_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/import")
+async def import_transactions(
+    request: Request,
+    format: Literal["csv", "ofx"] = "csv",
+    account_id: Optional[int] = None,
+    default_category: str = "Other",
+    batch_size: int = Query(default=ImportService.DEFAULT_BATCH_SIZE, ge=1, le=ImportService.MAX_BATCH_SIZE),
+    current_user: dict = Depends(get_current_user)
+):
+    # The file is the raw request body, parsed as it streams in
+    try:
+        return await import_service.import_transactions(
+            current_user["user_id"],
+            request.stream(),
+            format,
+            account_id=account_id,
+            default_category=default_category,
+            batch_size=batch_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Import failed: {str(e)}")
+
+
+@router.patch("/{transaction_id}")
+async def update_transaction(transaction_id: int, body: UpdateTransactionRequest, current_user: dict = Depends(get_current_user)):
+    # Only the fields sent are changed
+    try:
+        return await transaction_service.update_transaction(
+            current_user["user_id"], transaction_id, body.model_dump(exclude_unset=True)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transaction(transaction_id: int, current_user: dict = Depends(get_current_user)):
+async def delete_transaction(transaction_id: int, current_user: dict = Depends(get_current_user)):
     try:
-        transaction_service.delete_transaction(current_user["user_id"], transaction_id)
+        await transaction_service.delete_transaction(current_user["user_id"], transaction_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
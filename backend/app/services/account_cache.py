@@ -0,0 +1,44 @@
+import os
+from cachetools import TTLCache
+
+from app.repositories import get_repository
+from app.metrics import ACCOUNT_CACHE_HITS, ACCOUNT_CACHE_MISSES, ACCOUNT_CACHE_INVALIDATIONS
+
+
+class AccountCache:
+    """In-process LRU cache of user_id -> account IDs, used for ownership checks.
+
+    AccountService invalidates a user's entry on create/delete; the TTL covers changes
+    made by other workers.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: int = 60):
+        self._ids = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get_account_ids(self, supabase, user_id: str) -> list:
+        account_ids = self._ids.get(user_id)
+        if account_ids is not None:
+            ACCOUNT_CACHE_HITS.inc()
+            return account_ids
+
+        ACCOUNT_CACHE_MISSES.inc()
+        account_ids = await get_repository(supabase).account_ids(user_id)
+        self._ids[user_id] = account_ids
+        return account_ids
+
+    async def owns_account(self, supabase, user_id: str, account_id: int) -> bool:
+        if account_id in await self.get_account_ids(supabase, user_id):
+            return True
+        # Might be an account created by another worker — reload once before refusing
+        self.invalidate(user_id)
+        return account_id in await self.get_account_ids(supabase, user_id)
+
+    def invalidate(self, user_id: str):
+        if self._ids.pop(user_id, None) is not None:
+            ACCOUNT_CACHE_INVALIDATIONS.inc()
+
+
+account_cache = AccountCache(
+    maxsize=int(os.getenv("ACCOUNT_CACHE_SIZE", "10000")),
+    ttl=int(os.getenv("ACCOUNT_CACHE_TTL", "60")),
+)
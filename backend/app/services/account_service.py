@@ -1,4 +1,7 @@
 from datetime import datetime
+from app.services.account_cache import account_cache
+from app.services.data_versions import data_versions
+from app.services.live_updates import live_updates
 
 
 class AccountService:
@@ -26,7 +29,7 @@ class AccountService:
     # region Account Creation
     # ==========================================================
 
-    def create_account(self, user_id: str, name: str, acc_type: str, balance: float = 0):
+    async def create_account(self, user_id: str, name: str, acc_type: str, balance: float = 0):
         if not name.strip():
             raise ValueError("Account name cannot be empty.")
 
@@ -45,7 +48,11 @@ class AccountService:
         }
 
         try:
-            response = self.supabase.table("accounts").insert(data).execute()
+            response = await self.supabase.table("accounts").insert(data).execute()
+            account_cache.invalidate(user_id)
+            data_versions.touch(user_id, "accounts")
+            for account in response.data or []:
+                live_updates.account_changed(user_id, account)
             return response.data
         except Exception as e:
             raise Exception(f"Error creating account: {str(e)}")
@@ -56,9 +63,9 @@ class AccountService:
     # region Account Retrieval
     # ==========================================================
 
-    def get_account(self, user_id: str, account_id: int):
+    async def get_account(self, user_id: str, account_id: int):
         try:
-            response = (
+            response = await (
                 self.supabase
                 .table("accounts")
                 .select("*")
@@ -72,9 +79,9 @@ class AccountService:
         except Exception:
             return None
 
-    def list_accounts(self, user_id: str):
+    async def list_accounts(self, user_id: str):
         try:
-            response = (
+            response = await (
                 self.supabase
                 .table("accounts")
                 .select("*")
@@ -92,12 +99,12 @@ class AccountService:
     # region Account Update
     # ==========================================================
 
-    def update_account_name(self, user_id: str, account_id: int, new_name: str):
+    async def update_account_name(self, user_id: str, account_id: int, new_name: str):
         if not new_name.strip():
             raise ValueError("Account name cannot be empty.")
 
         try:
-            response = (
+            response = await (
                 self.supabase
                 .table("accounts")
                 .update({"name": new_name.strip()})
@@ -105,6 +112,7 @@ class AccountService:
                 .eq("user_id", user_id)
                 .execute()
             )
+            data_versions.touch(user_id, "accounts")
 
             return response.data
         except Exception as e:
@@ -116,9 +124,9 @@ class AccountService:
     # region Account Deletion
     # ==========================================================
 
-    def delete_account(self, user_id: str, account_id: int):
+    async def delete_account(self, user_id: str, account_id: int):
         try:
-            response = (
+            response = await (
                 self.supabase
                 .table("accounts")
                 .delete()
@@ -127,6 +135,11 @@ class AccountService:
                 .execute()
             )
 
+            account_cache.invalidate(user_id)
+            # Its transactions go with it (and their budget spending)
+            data_versions.touch(user_id, "accounts", "transactions", "budgets")
+            for account in response.data or []:
+                live_updates.account_deleted(user_id, account["id"])
             return response.data
         except Exception as e:
             raise Exception(f"Error deleting account: {str(e)}")
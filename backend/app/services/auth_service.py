@@ -81,7 +81,7 @@ class AuthService:
     # region Registration
     # ==========================================================
 
-    def register_user(self, username: str, email: str, password: str, phone_number: str = None):
+    async def register_user(self, username: str, email: str, password: str, phone_number: str = None):
         if not self.is_valid_username(username):
             raise ValueError("Username must be at least 3 characters and contain only letters, numbers, _ or -")
 
@@ -97,7 +97,7 @@ class AuthService:
                 "1 uppercase, 1 lowercase, 1 number and 1 symbol."
             )
 
-        response = self.supabase.auth.sign_up({
+        response = await self.supabase.auth.sign_up({
             "email": email,
             "password": password
         })
@@ -111,7 +111,7 @@ class AuthService:
             "email": email,
             "phone_number": phone_number
         }
-        self.supabase.table("profiles").insert(profile_data).execute()
+        await self.supabase.table("profiles").insert(profile_data).execute()
 
         return {
             "user_id": response.user.id,
@@ -126,11 +126,11 @@ class AuthService:
     # region Login
     # ==========================================================
 
-    def login_user(self, identifier: str, password: str):
+    async def login_user(self, identifier: str, password: str):
         email = identifier
 
         if not self.is_valid_email(identifier):
-            user = (
+            user = await (
                 self.supabase.table("profiles")
                 .select("email")
                 .eq("username", identifier)
@@ -141,7 +141,7 @@ class AuthService:
                 raise ValueError("Username not found.")
             email = user.data["email"]
 
-        response = self.supabase.auth.sign_in_with_password({
+        response = await self.supabase.auth.sign_in_with_password({
             "email": email,
             "password": password
         })
@@ -1,16 +1,41 @@
 from datetime import datetime
+from app.repositories import get_repository
+from app.services.data_versions import data_versions
 
 
 class BudgetService:
 
+    MAX_HISTORY_MONTHS = 120
+
     def __init__(self, supabase_client):
         self.supabase = supabase_client
+        self.repository = get_repository(supabase_client)
+
+    @staticmethod
+    def normalize_category(category: str) -> str:
+        # Budgets match spending case-insensitively ("Food" == " food ")
+        return (category or "").strip().lower()
+
+    @staticmethod
+    def parse_month(value: str) -> int:
+        """"YYYY-MM" → months since year 0 (year * 12 + month), the key budget_history compares on."""
+        try:
+            year, month = (int(part) for part in value.split("-"))
+        except (AttributeError, ValueError):
+            raise ValueError("Invalid month. Use YYYY-MM.")
+        if not 1 <= month <= 12:
+            raise ValueError("Invalid month. Use YYYY-MM.")
+        return year * 12 + month
+
+    @staticmethod
+    def percentage(spent: float, limit: float) -> float:
+        return round(min((spent / limit) * 100, 100), 1) if limit > 0 else 0
 
     # ==========================================================
     # region Budget CRUD
     # ==========================================================
 
-    def create_budget(self, user_id: str, category: str, limit_amount: float):
+    async def create_budget(self, user_id: str, category: str, limit_amount: float):
         if not category.strip():
             raise ValueError("Category cannot be empty.")
         if limit_amount <= 0:
@@ -18,7 +43,7 @@ class BudgetService:
 
         now = datetime.utcnow()
 
-        existing = (
+        existing = await (
             self.supabase.table("budgets")
             .select("id")
             .eq("user_id", user_id)
@@ -38,12 +63,13 @@ class BudgetService:
             "year": now.year
         }
 
-        response = self.supabase.table("budgets").insert(data).execute()
+        response = await self.supabase.table("budgets").insert(data).execute()
+        data_versions.touch(user_id, "budgets")
         return response.data[0] if response.data else None
 
-    def list_budgets(self, user_id: str):
+    async def list_budgets(self, user_id: str):
         now = datetime.utcnow()
-        response = (
+        response = await (
             self.supabase.table("budgets")
             .select("*")
             .eq("user_id", user_id)
@@ -54,8 +80,8 @@ class BudgetService:
         )
         return response.data
 
-    def delete_budget(self, user_id: str, budget_id: int):
-        budget = (
+    async def delete_budget(self, user_id: str, budget_id: int):
+        budget = await (
             self.supabase.table("budgets")
             .select("id")
             .eq("id", budget_id)
@@ -66,61 +92,76 @@ class BudgetService:
         if not budget.data:
             raise Exception("Budget not found or unauthorized.")
 
-        self.supabase.table("budgets").delete().eq("id", budget_id).execute()
+        await self.supabase.table("budgets").delete().eq("id", budget_id).execute()
+        data_versions.touch(user_id, "budgets")
         return True
 
-    def get_budgets_with_spent(self, user_id: str):
+    async def get_budgets_with_spent(self, user_id: str):
         """Returns budgets enriched with how much was spent in each category this month."""
         now = datetime.utcnow()
-        budgets = self.list_budgets(user_id)
-
-        if not budgets:
-            return []
 
-        accounts = (
-            self.supabase.table("accounts")
-            .select("id")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        account_ids = [a["id"] for a in accounts.data]
-
-        if not account_ids:
-            return [{**b, "spent": 0, "percentage": 0} for b in budgets]
-
-        # Get expenses this month
-        month_start = f"{now.year}-{now.month:02d}-01"
-        if now.month == 12:
-            month_end = f"{now.year + 1}-01-01"
-        else:
-            month_end = f"{now.year}-{now.month + 1:02d}-01"
-
-        transactions = (
-            self.supabase.table("transactions")
-            .select("category, amount")
-            .in_("account_id", account_ids)
-            .eq("type", "expense")
-            .gte("date", month_start)
-            .lt("date", month_end)
-            .execute()
-        )
-
-        # Sum by category (case-insensitive)
-        spent_by_category = {}
-        for tx in transactions.data:
-            cat = tx["category"].strip().lower()
-            spent_by_category[cat] = spent_by_category.get(cat, 0) + float(tx["amount"])
+        # Spending comes from the category_spend counters kept by a trigger on transactions:
+        # one lookup per budget, however many transactions the month has
+        budgets = await self.repository.budgets_with_spent(user_id, now.year, now.month)
 
         result = []
         for b in budgets:
-            spent = spent_by_category.get(b["category"].strip().lower(), 0)
+            spent = float(b["spent"])
             limit = float(b["limit_amount"])
             result.append({
                 **b,
                 "spent": round(spent, 2),
-                "percentage": round(min((spent / limit) * 100, 100), 1) if limit > 0 else 0
+                "percentage": self.percentage(spent, limit)
             })
 
         return result
 
+    async def get_budget_history(self, user_id: str, month_from: str, month_to: str):
+        """Budget vs. actual per category for every month in [month_from, month_to] ("YYYY-MM")."""
+        first = self.parse_month(month_from)
+        last = self.parse_month(month_to)
+        if last < first:
+            raise ValueError("month_to must be on or after month_from.")
+        if last - first + 1 > self.MAX_HISTORY_MONTHS:
+            raise ValueError(f"Range too long (max {self.MAX_HISTORY_MONTHS} months).")
+
+        # One grouped query for the whole range — never one request per month
+        rows = await self.repository.budget_history(user_id, first, last)
+
+        # Every month of the range is present, even those with no budgets or spending
+        months = {}
+        for key in range(first, last + 1):
+            year, month = divmod(key - 1, 12)
+            months[(year, month + 1)] = {
+                "month": f"{year:04d}-{month + 1:02d}",
+                "total_limit": 0.0,
+                "total_spent": 0.0,
+                "categories": [],
+            }
+
+        for row in rows:
+            entry = months[(row["year"], row["month"])]
+            spent = float(row["spent"])
+            limit = float(row["limit_amount"]) if row["limit_amount"] is not None else None
+            entry["categories"].append({
+                "category": row["category"],
+                "limit_amount": limit,
+                "spent": round(spent, 2),
+                "percentage": self.percentage(spent, limit) if limit is not None else None,
+            })
+            entry["total_spent"] += spent
+            entry["total_limit"] += limit or 0
+
+        for entry in months.values():
+            entry["total_spent"] = round(entry["total_spent"], 2)
+            entry["total_limit"] = round(entry["total_limit"], 2)
+
+        return {"month_from": month_from, "month_to": month_to, "months": list(months.values())}
+
+    async def reconcile_spent(self, user_id: str):
+        """Rebuilds the user's category_spend counters from their transactions."""
+        await self.supabase.rpc("rebuild_category_spend", {"p_user_id": user_id}).execute()
+        data_versions.touch(user_id, "budgets")
+        return await self.get_budgets_with_spent(user_id)
+
     # endregion
\ No newline at end of file
@@ -0,0 +1,54 @@
+import asyncio
+from datetime import datetime
+
+from app.services.account_service import AccountService
+from app.services.budget_service import BudgetService
+from app.services.goal_service import GoalService
+from app.services.report_service import ReportService
+from app.services.transaction_service import TransactionService
+
+
+class DashboardService:
+    """Everything the dashboard needs for its first render, in one call."""
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        self.accounts = AccountService(supabase_client)
+        self.transactions = TransactionService(supabase_client)
+        self.budgets = BudgetService(supabase_client)
+        self.goals = GoalService(supabase_client)
+        self.reports = ReportService(supabase_client)
+
+    async def get_dashboard(self, user_id: str, tx_limit: int = TransactionService.MAX_PAGE_SIZE):
+        today = datetime.utcnow().date()
+        month_start = today.replace(day=1)
+
+        # Independent queries: run them concurrently on the shared connection pool
+        accounts, transactions, budgets, goals, month = await asyncio.gather(
+            self.accounts.list_accounts(user_id),
+            self.transactions.list_transactions(user_id, limit=tx_limit),
+            self.budgets.get_budgets_with_spent(user_id),
+            self.goals.list_goals(user_id),
+            self.reports.get_report(user_id, month_start.isoformat(), today.isoformat(), granularity="month"),
+        )
+
+        total_limit = sum(float(b["limit_amount"]) for b in budgets)
+        total_spent = sum(b["spent"] for b in budgets)
+
+        return {
+            "accounts": accounts,
+            "transactions": transactions,
+            "budgets": budgets,
+            "goals": goals,
+            "summary": {
+                "month": month_start.strftime("%Y-%m"),
+                "total_balance": round(sum(float(a["balance"]) for a in accounts), 2),
+                "income": month["totals"]["income"],
+                "expense": month["totals"]["expense"],
+                "net": month["totals"]["net"],
+                "transaction_count": sum(p["count"] for p in month["periods"]),
+                "budget_limit": round(total_limit, 2),
+                "budget_spent": round(total_spent, 2),
+                "budgets_over_limit": sum(1 for b in budgets if b["spent"] > float(b["limit_amount"])),
+            },
+        }
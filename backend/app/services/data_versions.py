@@ -0,0 +1,50 @@
+import hashlib
+import itertools
+import os
+import uuid
+from cachetools import TTLCache
+
+
+class DataVersions:
+    """In-process version tags of each user's collections, used to build ETags.
+
+    Services touch a collection after writing to it, which gives it a new version, so a
+    list endpoint can answer If-None-Match without reading the database. Versions are never
+    reused: they combine a per-process id with a global counter, so a restart invalidates
+    every ETag handed out before it. Entries expire after `ttl`, which bounds how long a
+    change made outside this process (another worker, the SQL editor) can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: int = 60):
+        self._versions = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._process = uuid.uuid4().hex[:8]
+        self._counter = itertools.count(1)
+
+    def _new_version(self) -> str:
+        return f"{self._process}.{next(self._counter)}"
+
+    def get(self, user_id: str, collection: str) -> str:
+        versions = self._versions.get(user_id)
+        if versions is None:
+            versions = self._versions[user_id] = {}
+        if collection not in versions:
+            versions[collection] = self._new_version()
+        return versions[collection]
+
+    def touch(self, user_id: str, *collections: str):
+        versions = self._versions.get(user_id)
+        if versions is None:
+            return  # nothing handed out since the entry expired: the next read starts fresh
+        for collection in collections:
+            versions.pop(collection, None)
+
+    def etag(self, user_id: str, collections, variant: str = "") -> str:
+        # variant: anything else the body depends on (query string, current date)
+        parts = [user_id, variant, *(f"{c}={self.get(user_id, c)}" for c in collections)]
+        return 'W/"' + hashlib.sha256("|".join(parts).encode()).hexdigest()[:32] + '"'
+
+
+data_versions = DataVersions(
+    maxsize=int(os.getenv("DATA_VERSION_CACHE_SIZE", "10000")),
+    ttl=int(os.getenv("DATA_VERSION_TTL", "60")),
+)
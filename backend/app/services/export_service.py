@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from app.services.account_cache import account_cache
+from app.services.transaction_service import TransactionService
+
+
+class ExportService:
+    """Exports built as async generators over keyset-paged reads.
+
+    Only one page of rows (plus the user's accounts) is held at a time, so memory on the
+    API stays flat however long the history is.
+    """
+
+    FORMATS = ["csv", "json"]
+    CSV_HEADERS = ["Date", "Type", "Category", "Amount", "Description", "Account"]
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        self.transactions = TransactionService(supabase_client)
+
+    # ==========================================================
+    # region Validations
+    # ==========================================================
+
+    async def validate(self, user_id: str, account_id: int = None, date_from: str = None, date_to: str = None):
+        """Raises before the response starts: once streaming, the status code is already sent."""
+        for value in (date_from, date_to):
+            if value:
+                try:
+                    datetime.fromisoformat(value)
+                except ValueError:
+                    raise ValueError("Invalid date. Use YYYY-MM-DD.")
+        if account_id and not await account_cache.owns_account(self.supabase, user_id, account_id):
+            raise ValueError("Account not found or unauthorized.")
+
+    # endregion Validations
+
+
+    # ==========================================================
+    # region Readers
+    # ==========================================================
+
+    async def iter_transactions(self, user_id: str, account_id: int = None, date_from: str = None, date_to: str = None):
+        cursor = None
+        while True:
+            page = await self.transactions.list_transactions(
+                user_id,
+                account_id,
+                cursor=cursor,
+                limit=TransactionService.MAX_PAGE_SIZE,
+                date_from=date_from,
+                date_to=date_to,
+            )
+            for tx in page["items"]:
+                yield tx
+            cursor = page["next_cursor"]
+            if not cursor:
+                return
+
+    async def _rows(self, table: str, user_id: str, order: str):
+        response = await self.supabase.table(table).select("*").eq("user_id", user_id).order(order).execute()
+        return response.data or []
+
+    # endregion Readers
+
+
+    # ==========================================================
+    # region Formats
+    # ==========================================================
+
+    async def transactions_csv(self, user_id: str, account_id: int = None, date_from: str = None, date_to: str = None):
+        accounts = {a["id"]: a["name"] for a in await self._rows("accounts", user_id, "id")}
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.CSV_HEADERS)
+
+        async for tx in self.iter_transactions(user_id, account_id, date_from, date_to):
+            writer.writerow([
+                tx["date"], tx["type"], tx["category"], tx["amount"],
+                tx.get("description") or "", accounts.get(tx["account_id"], ""),
+            ])
+            # Flush every ~64 KB rather than per row: fewer, larger chunks on the wire
+            if buffer.tell() >= 65536:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    async def backup_json(self, user_id: str, account_id: int = None, date_from: str = None, date_to: str = None):
+        """Same shape as the dashboard's backup file: {accounts, transactions, budgets, goals, exportedAt}."""
+        yield '{"accounts": ' + json.dumps(await self._rows("accounts", user_id, "id"))
+        yield ', "budgets": ' + json.dumps(await self._rows("budgets", user_id, "id"))
+        yield ', "goals": ' + json.dumps(await self._rows("goals", user_id, "id"))
+
+        # The transaction array is written element by element
+        yield ', "transactions": ['
+        separator = ""
+        async for tx in self.iter_transactions(user_id, account_id, date_from, date_to):
+            yield separator + json.dumps(tx)
+            separator = ", "
+        yield '], "exportedAt": ' + json.dumps(datetime.utcnow().isoformat() + "Z") + "}"
+
+    @staticmethod
+    async def gzip(chunks, level: int = 6):
+        # wbits 16+: gzip container, so the download opens with any gunzip
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        async for chunk in chunks:
+            data = compressor.compress(chunk.encode())
+            if data:
+                yield data
+        yield compressor.flush()
+
+    # endregion Formats
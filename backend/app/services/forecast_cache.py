@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+
+class ForecastCache:
+    """On-disk cache of forecast outputs.
+
+    Layout: <directory>/<hash(ticker, start, periods, ...)>/<last data date>/result.json
+    A new trading day's bar changes the last data date, so the entry misses and the
+    older day is dropped when the new one is stored. Least recently used entries are
+    evicted once the cache grows past max_bytes.
+    """
+
+    RESULT_FILE = "result.json"
+
+    def __init__(self, directory: str, max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # ==========================================================
+    # region Keys
+    # ==========================================================
+
+    @staticmethod
+    def request_key(ticker: str, start: str, periods: int, *extra) -> str:
+        raw = "|".join(str(part) for part in (ticker.upper(), start, periods, *extra))
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def _entry_dir(self, key: str, last_date: str) -> str:
+        return os.path.join(self.directory, key, last_date)
+
+    # endregion Keys
+
+
+    # ==========================================================
+    # region Read / Write
+    # ==========================================================
+
+    def get(self, key: str, last_date: str):
+        path = os.path.join(self._entry_dir(key, last_date), self.RESULT_FILE)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # mtime doubles as the LRU timestamp
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, last_date: str, result: dict):
+        entry_dir = self._entry_dir(key, last_date)
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}-{threading.get_ident()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        try:
+            with open(os.path.join(tmp_dir, self.RESULT_FILE), "w") as f:
+                json.dump(result, f)
+            # Worker processes write concurrently: publish with a rename and tolerate losing the race
+            with self._lock:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                try:
+                    os.replace(tmp_dir, entry_dir)
+                except OSError:
+                    return
+                self._drop_older_days(key, last_date)
+                self._evict()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # endregion Read / Write
+
+
+    # ==========================================================
+    # region Eviction
+    # ==========================================================
+
+    def _drop_older_days(self, key: str, last_date: str):
+        key_dir = os.path.join(self.directory, key)
+        for name in os.listdir(key_dir):
+            if name != last_date and ".tmp-" not in name:
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for key in os.listdir(self.directory):
+            key_dir = os.path.join(self.directory, key)
+            if not os.path.isdir(key_dir):
+                continue
+            for day in os.listdir(key_dir):
+                entry_dir = os.path.join(key_dir, day)
+                if ".tmp-" in day:
+                    continue
+                try:
+                    size = sum(e.stat().st_size for e in os.scandir(entry_dir) if e.is_file())
+                    used = os.path.getmtime(os.path.join(entry_dir, self.RESULT_FILE))
+                except OSError:
+                    continue  # removed by another process meanwhile
+                entries.append((used, size, entry_dir))
+                total += size
+
+        for used, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            try:
+                os.rmdir(os.path.dirname(entry_dir))
+            except OSError:
+                pass  # still holds another day (or is being written to)
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    # endregion Eviction
+
+
+forecast_cache = ForecastCache(
+    directory=os.getenv("FORECAST_CACHE_DIR", os.path.join(".cache", "forecasts")),
+    max_bytes=int(os.getenv("FORECAST_CACHE_MAX_MB", "500")) * 1024 * 1024,
+)
@@ -0,0 +1,353 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from app.metrics import IMPORT_DURATION, FORECASTS_COALESCED, FORECASTS_REJECTED
+from app.services.forecast_service import ForecastError, INLINE_MODELS, SERVER_MODULES, WORKER_MODULES, run_forecast, warm_up
+from app.timing import collecting, replay
+
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class AdmissionError(Exception):
+    """A forecast was refused to protect the workers; retry_after is a rough wait in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFullError(AdmissionError):
+    pass
+
+
+class ClientLimitError(AdmissionError):
+    pass
+
+
+def run_forecast_timed(*args):
+    """run_forecast in a worker process → (result, error, timings).
+
+    The worker's metrics registry is not the one /metrics serves, so its dependency timings
+    travel back with the result (or the error) and are recorded by the server.
+    """
+    with collecting() as timings:
+        try:
+            return run_forecast(*args), None, timings
+        except Exception as e:
+            return None, e, timings
+
+
+# A worker holds torch and one NeuralProphet fit: budget this much memory for each
+WORKER_MEMORY_BYTES = 1 << 30
+
+
+def available_memory() -> int:
+    """The container's memory limit (cgroup v2) if it has one, else the machine's; None if unknown."""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            return int(limit)
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def default_workers() -> int:
+    """One worker per CPU, as many as fit in memory (at least one)."""
+    workers = os.cpu_count() or 1
+    memory = available_memory()
+    if memory:
+        workers = min(workers, memory // WORKER_MEMORY_BYTES)
+    return max(1, workers)
+
+
+class ForecastJob:
+
+    def __init__(self, ticker: str, start: str, periods: int, model: str = "neuralprophet",
+                 client: str = None, request_id: str = None):
+        self.id = uuid.uuid4().hex
+        self.ticker = ticker.upper()
+        self.start = start
+        self.periods = periods
+        self.model = model
+        # Who started it and in which request (a batch is one): counted against their limit
+        self.client = client
+        self.request_id = request_id
+        self.subscribers = set() # callers waiting on it — identical requests share one job
+        self.status = "queued"   # queued → running → done | failed | cancelled
+        self.result = None
+        self.error = None
+        self.error_status = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+        self.finished = asyncio.Event()
+
+    @property
+    def key(self) -> tuple:
+        return (self.ticker, self.start, self.periods, self.model)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "ticker": self.ticker,
+            "start": self.start,
+            "periods": self.periods,
+            "model": self.model,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ForecastJobManager:
+    """Runs forecasts in a bounded process pool so training never blocks the event loop.
+
+    At most max_queue jobs are pending at once, and only max_workers of them (by default one
+    per CPU, as many as fit in memory, so a batch's jobs train in parallel) are handed
+    to the pool at a time — the rest wait on a semaphore, where they stay cancellable. A job that times out
+    or is cancelled while running is marked as such and its result is discarded; the
+    worker process finishes that fit before taking the next job.
+
+    Identical requests (ticker, start, periods, model) made while a job for them is unfinished
+    join that job instead of starting another download and fit. Only new jobs are admitted
+    against the limits — max_queue jobs overall, max_per_client requests (a batch counts once)
+    per caller — and a refusal says roughly when to retry, estimated from recent run times.
+    """
+
+    # Retry-After guesses before a model has finished any job here
+    DEFAULT_RUN_SECONDS = {"fast": 1.0}
+    FALLBACK_RUN_SECONDS = 30.0
+
+    def __init__(self, max_workers: int = 1, max_queue: int = 16, timeout: float = 300, result_ttl: float = 900,
+                 prewarm: bool = True, max_per_client: int = 2):
+        self.max_workers = max_workers
+        self.max_per_client = max_per_client
+        self.prewarm = prewarm
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self._jobs = {}
+        self._inflight = {}       # job key -> unfinished job
+        self._run_seconds = {}    # model -> moving average of recent run times
+        self._executor = None
+        self._slots = None
+        self._warming = None
+
+    # ==========================================================
+    # region Lifecycle
+    # ==========================================================
+
+    def start(self):
+        # spawn: workers must not inherit the server's event loop, sockets or threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._slots = asyncio.Semaphore(self.max_workers)
+        if self.prewarm:
+            self._warming = asyncio.create_task(self.warm_up())
+
+    async def warm_up(self):
+        """Imports the predict stack in the background — in this process for the inline models and
+        in each worker process for NeuralProphet — so no forecast waits on pandas or torch."""
+        loop = asyncio.get_running_loop()
+        reports = {"server": await asyncio.to_thread(warm_up, SERVER_MODULES)}
+        # One task per worker: the pool spawns a new process while none is idle
+        workers = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, warm_up, WORKER_MODULES) for _ in range(self.max_workers)
+        ), return_exceptions=True)
+        # One report per worker process (worker-1 … worker-N): a slow or failing one stays visible
+        for n, timings in enumerate(workers, 1):
+            if isinstance(timings, dict):
+                reports[f"worker-{n}"] = timings
+            else:
+                logger.warning("Predict stack warm-up failed in worker-%d: %r", n, timings)
+
+        for process, timings in reports.items():
+            for module, seconds in timings.items():
+                if seconds is not None:
+                    IMPORT_DURATION.labels(process, module).set(seconds)
+            loaded = {m: f"{s * 1000:.0f}ms" for m, s in timings.items() if s is not None}
+            missing = [m for m, s in timings.items() if s is None]
+            logger.info("Predict stack warmed up (%s): %s%s", process, loaded,
+                        f"; not installed or failed: {missing}" if missing else "")
+
+    def shutdown(self):
+        if self._warming is not None and not self._warming.done():
+            self._warming.cancel()
+        for job in self._jobs.values():
+            if job.task and not job.task.done():
+                job.task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    # endregion Lifecycle
+
+
+    # ==========================================================
+    # region Jobs
+    # ==========================================================
+
+    def pending_count(self) -> int:
+        return len(self._inflight)
+
+    def client_count(self, client: str) -> int:
+        # Requests of this caller that still have a job running
+        return len({job.request_id for job in self._inflight.values() if job.client == client})
+
+    def retry_after(self, model: str, jobs_ahead: int = 1) -> int:
+        # Time for `jobs_ahead` runs of this model to clear the workers, capped by the job timeout
+        per_job = self._run_seconds.get(model, self.DEFAULT_RUN_SECONDS.get(model, self.FALLBACK_RUN_SECONDS))
+        workers = 1 if model in INLINE_MODELS else self.max_workers
+        return max(1, min(math.ceil(per_job * max(jobs_ahead, 1) / workers), math.ceil(self.timeout)))
+
+    def submit(self, ticker: str, start: str, periods: int, model: str = "neuralprophet",
+               client: str = None) -> ForecastJob:
+        return self.submit_many([ticker], start, periods, model, client)[0]
+
+    def submit_many(self, tickers: list, start: str, periods: int, model: str = "neuralprophet",
+                    client: str = None) -> list:
+        # All or nothing: a batch never gets half-queued
+        if self._executor is None:
+            raise RuntimeError("Forecast workers are not running.")
+        self._prune()
+
+        keys = [(ticker.upper(), start, periods, model) for ticker in tickers]
+        new = [key for key in dict.fromkeys(keys) if key not in self._inflight]
+        if self.pending_count() + len(new) > self.max_queue:
+            FORECASTS_REJECTED.labels(reason="global").inc()
+            raise QueueFullError("Too many forecasts in progress. Try again shortly.",
+                                 self.retry_after(model, self.pending_count() + len(new) - self.max_queue))
+        if client and new and self.client_count(client) >= self.max_per_client:
+            FORECASTS_REJECTED.labels(reason="client").inc()
+            raise ClientLimitError(f"At most {self.max_per_client} forecast requests at a time. Try again shortly.",
+                                   self.retry_after(model))
+
+        request_id = uuid.uuid4().hex
+        jobs = []
+        for key in keys:
+            job = self._inflight.get(key)
+            if job is None:
+                job = ForecastJob(*key, client=client, request_id=request_id)
+                self._jobs[job.id] = job
+                self._inflight[key] = job
+                job.task = asyncio.create_task(self._run(job))
+                job.task.add_done_callback(lambda _, job=job: self._finish_cancelled(job))
+            else:
+                FORECASTS_COALESCED.inc()
+            job.subscribers.add(client or request_id)
+            jobs.append(job)
+        return jobs
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: ForecastJob, timeout: float = None) -> ForecastJob:
+        try:
+            await asyncio.wait_for(job.finished.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def cancel(self, job: ForecastJob, client: str) -> bool:
+        """Withdraws `client` from the job; False when it is finished or `client` isn't waiting on it."""
+        if job.is_finished or client not in job.subscribers:
+            return False
+        # A shared job keeps running until every caller waiting on it has let go
+        job.subscribers.discard(client)
+        if not job.subscribers:
+            job.task.cancel()
+        return True
+
+    async def _run(self, job: ForecastJob):
+        loop = asyncio.get_running_loop()
+        args = (job.ticker, job.start, job.periods, job.model)
+        try:
+            if job.model in INLINE_MODELS:
+                # Milliseconds of NumPy: a thread is enough, and it must not queue behind slow fits
+                job.status = "running"
+                job.started_at = time.time()
+                job.result = await asyncio.wait_for(asyncio.to_thread(run_forecast, *args), self.timeout)
+            else:
+                async with self._slots:
+                    job.status = "running"
+                    job.started_at = time.time()
+                    future = loop.run_in_executor(self._executor, run_forecast_timed, *args)
+                    result, error, timings = await asyncio.wait_for(future, self.timeout)
+                    replay(timings)
+                    if error is not None:
+                        raise error
+                    job.result = result
+            job.status = "done"
+            self._record_run(job.model, time.time() - job.started_at)
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except asyncio.TimeoutError:
+            job.status = "failed"
+            job.error = f"Forecast timed out after {self.timeout:.0f}s"
+            job.error_status = 504
+        except ForecastError as e:
+            job.status = "failed"
+            job.error = str(e)
+            job.error_status = e.status_code
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"Prediction error: {str(e)}"
+            job.error_status = 500
+        finally:
+            job.finished_at = time.time()
+            self._release(job)
+            job.finished.set()
+
+    def _finish_cancelled(self, job: ForecastJob):
+        # A task cancelled before it ever ran never reaches _run's finally block
+        if not job.is_finished:
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            self._release(job)
+            job.finished.set()
+
+    def _release(self, job: ForecastJob):
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    def _record_run(self, model: str, seconds: float):
+        previous = self._run_seconds.get(model)
+        self._run_seconds[model] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def _prune(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.is_finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    # endregion Jobs
+
+
+forecast_jobs = ForecastJobManager(
+    max_workers=int(os.getenv("FORECAST_WORKERS") or default_workers()),
+    max_queue=int(os.getenv("FORECAST_QUEUE_DEPTH", "16")),
+    timeout=float(os.getenv("FORECAST_TIMEOUT", "300")),
+    result_ttl=float(os.getenv("FORECAST_JOB_TTL", "900")),
+    prewarm=os.getenv("FORECAST_PREWARM", "1") == "1",
+    max_per_client=int(os.getenv("FORECAST_PER_CLIENT", "2")),
+)
@@ -0,0 +1,257 @@
+# numpy and pandas are imported where they are used: this module is loaded with the API,
+# and the predict stack should cost nothing until a forecast runs (or the pre-warm loads it)
+from __future__ import annotations
+
+import importlib
+import time
+import warnings
+from typing import TYPE_CHECKING
+from app.timing import track
+warnings.simplefilter(action='ignore', category=FutureWarning)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class ForecastError(Exception):
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+    def __reduce__(self):
+        # Keeps status_code when the error crosses the worker-process boundary
+        return (ForecastError, (str(self), self.status_code))
+
+
+# ==========================================================
+# region Data Preparation
+# ==========================================================
+
+def prepare_history(raw: pd.DataFrame) -> pd.DataFrame:
+    """Turns a yfinance download into NeuralProphet's (ds, y) frame."""
+    import pandas as pd
+    data = raw[["Close"]].reset_index()
+    data.columns = ["ds", "y"]
+    data["ds"] = pd.to_datetime(data["ds"]).dt.tz_localize(None)
+    data = data.dropna()
+
+    if len(data) < 30:
+        raise ForecastError("Not enough historical data (minimum 30 days required)")
+    return data
+
+
+def last_data_date(data: pd.DataFrame) -> str:
+    import pandas as pd
+    return str(pd.Timestamp(data["ds"].iloc[-1]).date())
+
+# endregion Data Preparation
+
+
+# ==========================================================
+# region Training
+# ==========================================================
+
+def fit_neuralprophet(data: pd.DataFrame, periods: int):
+    """Trains on (ds, y) and returns (model, result) — result is everything PredictResponse needs but the ticker info."""
+    import pandas as pd
+    from neuralprophet import NeuralProphet
+    import torch
+    import torch.serialization
+    from sklearn.metrics import r2_score, mean_absolute_error, mean_absolute_percentage_error
+
+    # Patch torch load for NeuralProphet compatibility
+    _original_load = torch.load
+    torch.load = lambda *a, **kw: _original_load(*a, **{**kw, "weights_only": False})
+
+    try:
+        # Train model
+        model = NeuralProphet(
+            n_forecasts=1,
+            n_lags=0,
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=False,
+        )
+        with track("model", "neuralprophet.fit"):
+            model.fit(data, freq="B", progress="none")
+
+        with track("model", "neuralprophet.predict"):
+            # Future forecast
+            future_data = model.make_future_dataframe(data, periods=periods)
+            forecast_df = model.predict(future_data)
+
+            # Historic fitted values
+            historic_df = model.predict(data)
+    finally:
+        # Restore torch
+        torch.load = _original_load
+
+    # Metrics
+    valid = historic_df.dropna(subset=["y", "yhat1"])
+    r2   = round(float(r2_score(valid["y"], valid["yhat1"])), 4)
+    mae  = round(float(mean_absolute_error(valid["y"], valid["yhat1"])), 4)
+    mape = round(float(mean_absolute_percentage_error(valid["y"], valid["yhat1"])) * 100, 2)
+
+    # Current price & change
+    current_price = float(data["y"].iloc[-1])
+    last_forecast  = float(forecast_df["yhat1"].iloc[-1])
+    price_change_pct = round(((last_forecast - current_price) / current_price) * 100, 2)
+
+    # Serialize
+    historic_out = [
+        {"date": str(row.ds.date()), "actual": round(float(row.y), 4), "predicted": round(float(row.yhat1), 4)}
+        for row in valid.itertuples() if pd.notna(row.yhat1)
+    ]
+    forecast_out = [
+        {"date": str(row.ds.date()), "predicted": round(float(row.yhat1), 4)}
+        for row in forecast_df.itertuples()
+        if pd.notna(row.yhat1) and pd.Timestamp(row.ds) > pd.Timestamp(data["ds"].iloc[-1])
+    ]
+
+    result = {
+        "historic": historic_out,
+        "forecast": forecast_out,
+        "metrics": {"r2": r2, "mae": mae, "mape": mape},
+        "current_price": current_price,
+        "price_change_pct": price_change_pct,
+    }
+    return model, result
+
+
+def fit_fast(data: pd.DataFrame, periods: int, n_changepoints: int = 10, ridge: float = 1.0):
+    """Pure-NumPy alternative to NeuralProphet: piecewise-linear trend plus yearly and weekly
+    Fourier seasonality, fitted by ridge-regularised least squares. Same output as fit_neuralprophet."""
+    import numpy as np
+    y = data["y"].to_numpy(dtype="f8")
+    days = data["ds"].to_numpy().astype("datetime64[D]")
+    future_days = np.busday_offset(days[-1], np.arange(1, periods + 1), roll="forward")
+
+    origin, span = days[0], max(float((days[-1] - days[0]).astype("f8")), 1.0)
+    # Changepoints spread over the first 80% of the history, like Prophet
+    changepoints = np.linspace(0, 0.8, n_changepoints + 1)[1:]
+
+    def design(d):
+        t = (d - origin).astype("f8") / span
+        absolute = d.astype("f8")
+        columns = [np.ones_like(t), t, *(np.maximum(0.0, t - c) for c in changepoints)]
+        for period, order in ((365.25, 6), (7.0, 3)):
+            for k in range(1, order + 1):
+                angle = 2 * np.pi * k * absolute / period
+                columns += [np.sin(angle), np.cos(angle)]
+        return np.column_stack(columns)
+
+    with track("model", "fast.fit"):
+        X = design(days)
+        y_scale = np.abs(y).max() or 1.0
+        # Only the changepoint slopes are penalised, so the trend stays smooth unless the data insists
+        penalty = np.zeros(X.shape[1])
+        penalty[2:2 + n_changepoints] = ridge
+        beta = np.linalg.solve(X.T @ X + np.diag(penalty), X.T @ (y / y_scale)) * y_scale
+
+    with track("model", "fast.predict"):
+        fitted = X @ beta
+        predicted = design(future_days) @ beta
+
+    # Metrics
+    residual = y - fitted
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    r2   = round(1 - float((residual ** 2).sum()) / ss_tot, 4) if ss_tot > 0 else 0.0
+    mae  = round(float(np.abs(residual).mean()), 4)
+    mape = round(float(np.mean(np.abs(residual) / np.maximum(np.abs(y), np.finfo("f8").eps))) * 100, 2)
+
+    # Current price & change
+    current_price = float(y[-1])
+    price_change_pct = round(((float(predicted[-1]) - current_price) / current_price) * 100, 2)
+
+    result = {
+        "historic": [
+            {"date": str(d), "actual": round(float(a), 4), "predicted": round(float(p), 4)}
+            for d, a, p in zip(days, y, fitted)
+        ],
+        "forecast": [
+            {"date": str(d), "predicted": round(float(p), 4)}
+            for d, p in zip(future_days, predicted)
+        ],
+        "metrics": {"r2": r2, "mae": mae, "mape": mape},
+        "current_price": current_price,
+        "price_change_pct": price_change_pct,
+    }
+    return None, result
+
+
+# Forecast engines selectable with `model=`. "fast" is cheap enough to skip the process pool.
+MODELS = {
+    "neuralprophet": fit_neuralprophet,
+    "fast": fit_fast,
+}
+INLINE_MODELS = {"fast"}
+
+# endregion Training
+
+
+# ==========================================================
+# region Warm-up
+# ==========================================================
+
+# What each process needs before its first forecast, in dependency order so that each
+# measurement is that module's own import cost
+SERVER_MODULES = ["numpy", "pandas", "app.services.market_data", "yfinance"]
+WORKER_MODULES = SERVER_MODULES + ["sklearn.metrics", "torch", "neuralprophet", "app.services.forecast_cache"]
+
+
+def warm_up(modules: list) -> dict:
+    """Imports `modules` → {module: seconds}, None for a module that failed to import."""
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception:
+            timings[name] = None
+        else:
+            timings[name] = time.perf_counter() - started
+    return timings
+
+# endregion Warm-up
+
+
+# ==========================================================
+# region Forecast Job
+# ==========================================================
+
+def run_forecast(ticker: str, start: str, periods: int, model: str = "neuralprophet") -> dict:
+    """History → cache lookup → train → ticker info. Runs inside a forecast worker process."""
+    import pandas as pd
+    from app.services.forecast_cache import forecast_cache
+    from app.services.market_data import market_data
+
+    ticker_upper = ticker.upper()
+    end = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    # Local store: only bars newer than what it holds are downloaded
+    raw = market_data.get_history(ticker_upper, start, end)
+    if raw.empty:
+        raise ForecastError(f"No data found for ticker '{ticker_upper}'", status_code=404)
+    data = prepare_history(raw)
+
+    # Same request on the same data → same forecast; only retrain when a new bar arrived
+    cache_key = forecast_cache.request_key(ticker_upper, start, periods, model)
+    last_date = last_data_date(data)
+    cached = forecast_cache.get(cache_key, last_date)
+    if cached:
+        return cached
+
+    _, result = MODELS[model](data, periods)
+
+    # Ticker info
+    info = market_data.get_info(ticker_upper)
+    response = {
+        "ticker": ticker_upper,
+        "company_name": info.get("longName") or info.get("shortName") or ticker_upper,
+        "currency": info.get("currency", "USD"),
+        **result,
+    }
+    forecast_cache.put(cache_key, last_date, response)
+    return response
+
+# endregion Forecast Job
@@ -1,16 +1,30 @@
 from datetime import datetime
+from app.services.data_versions import data_versions
 
 
 class GoalService:
 
+    MAX_DEPOSITS = 100
+
     def __init__(self, supabase_client):
         self.supabase = supabase_client
 
+    @staticmethod
+    def _with_progress(goal: dict) -> dict:
+        # Add percentage and remaining amount to a goal row
+        target = float(goal["target_amount"])
+        current = float(goal["current_amount"] or 0)
+        return {
+            **goal,
+            "percentage": round(min((current / target) * 100, 100), 1) if target > 0 else 0,
+            "remaining": round(max(target - current, 0), 2)
+        }
+
     # ==========================================================
     # region Goal CRUD
     # ==========================================================
 
-    def create_goal(self, user_id: str, name: str, target_amount: float, deadline: str = None):
+    async def create_goal(self, user_id: str, name: str, target_amount: float, deadline: str = None):
         if not name.strip():
             raise ValueError("Goal name cannot be empty.")
         if target_amount <= 0:
@@ -24,60 +38,85 @@ class GoalService:
             "deadline": deadline
         }
 
-        response = self.supabase.table("goals").insert(data).execute()
+        response = await self.supabase.table("goals").insert(data).execute()
+        data_versions.touch(user_id, "goals")
         return response.data[0] if response.data else None
 
-    def list_goals(self, user_id: str):
-        response = (
+    async def list_goals(self, user_id: str):
+        response = await (
             self.supabase.table("goals")
             .select("*")
             .eq("user_id", user_id)
             .order("deadline", desc=False, nullsfirst=False)
             .execute()
         )
-        # Add percentage to each goal
-        result = []
-        for g in response.data:
-            target = float(g["target_amount"])
-            current = float(g["current_amount"] or 0)
-            result.append({
-                **g,
-                "percentage": round(min((current / target) * 100, 100), 1) if target > 0 else 0,
-                "remaining": round(max(target - current, 0), 2)
-            })
-        return result
-
-    def add_funds(self, user_id: str, goal_id: int, amount: float):
-        if amount <= 0:
-            raise ValueError("Amount must be greater than zero.")
-
-        goal = (
-            self.supabase.table("goals")
-            .select("*")
-            .eq("id", goal_id)
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
-        if not goal.data:
+        return [self._with_progress(g) for g in response.data]
+
+    async def update_goal(self, user_id: str, goal_id: int, changes: dict):
+        """Changes a goal's name, target_amount and/or deadline (None clears it); funds only go in through add_funds."""
+        changes = {k: v for k, v in changes.items() if k in ("name", "target_amount", "deadline")}
+        if not changes:
+            raise ValueError("Nothing to update.")
+        if "name" in changes:
+            if not (changes["name"] or "").strip():
+                raise ValueError("Goal name cannot be empty.")
+            changes["name"] = changes["name"].strip()
+
+        query = self.supabase.table("goals").update(changes).eq("id", goal_id).eq("user_id", user_id)
+        if "target_amount" in changes:
+            if changes["target_amount"] is None or changes["target_amount"] <= 0:
+                raise ValueError("Target amount must be greater than zero.")
+            # Checked in the same UPDATE, so a deposit landing meanwhile can't leave the goal overfunded
+            query = query.lte("current_amount", changes["target_amount"])
+        response = await query.execute()
+
+        if not response.data:
+            goal = await (
+                self.supabase.table("goals")
+                .select("id")
+                .eq("id", goal_id)
+                .eq("user_id", user_id)
+                .execute()
+            )
+            if goal.data:
+                raise ValueError("Target amount cannot be less than the amount already saved.")
             raise Exception("Goal not found or unauthorized.")
 
-        new_amount = float(goal.data["current_amount"] or 0) + amount
-        target = float(goal.data["target_amount"])
+        data_versions.touch(user_id, "goals")
+        return self._with_progress(response.data[0])
 
-        if new_amount > target:
-            raise ValueError(f"Amount exceeds target. Max you can add: €{target - float(goal.data['current_amount']):.2f}")
+    async def add_funds(self, user_id: str, goal_id: int, amount: float):
+        goals = await self.add_funds_many(user_id, [{"goal_id": goal_id, "amount": amount}])
+        return goals[0] if goals else None
 
-        response = (
-            self.supabase.table("goals")
-            .update({"current_amount": new_amount})
-            .eq("id", goal_id)
-            .execute()
-        )
-        return response.data[0] if response.data else None
+    async def add_funds_many(self, user_id: str, deposits: list):
+        """Funds several goals at once ([{"goal_id", "amount"}]); either every deposit is applied or none."""
+        if not deposits:
+            raise ValueError("No deposits given.")
+        if len(deposits) > self.MAX_DEPOSITS:
+            raise ValueError(f"At most {self.MAX_DEPOSITS} deposits per call.")
+        if any(d["amount"] <= 0 for d in deposits):
+            raise ValueError("Amount must be greater than zero.")
 
-    def delete_goal(self, user_id: str, goal_id: int):
-        goal = (
+        # One conditional UPDATE per goal inside fund_goals: no read-modify-write race
+        try:
+            response = await self.supabase.rpc("fund_goals", {
+                "p_user_id": user_id,
+                "p_deposits": [{"goal_id": d["goal_id"], "amount": d["amount"]} for d in deposits],
+            }).execute()
+        except Exception as e:
+            error_msg = getattr(e, "message", None) or str(e)
+            if "exceeds target" in error_msg or "greater than zero" in error_msg:
+                raise ValueError(error_msg)
+            if "not found" in error_msg:
+                raise Exception(error_msg)
+            raise Exception(f"Error adding funds: {error_msg}")
+
+        data_versions.touch(user_id, "goals")
+        return [self._with_progress(g) for g in response.data or []]
+
+    async def delete_goal(self, user_id: str, goal_id: int):
+        goal = await (
             self.supabase.table("goals")
             .select("id")
             .eq("id", goal_id)
@@ -88,7 +127,8 @@ class GoalService:
         if not goal.data:
             raise Exception("Goal not found or unauthorized.")
 
-        self.supabase.table("goals").delete().eq("id", goal_id).execute()
+        await self.supabase.table("goals").delete().eq("id", goal_id).execute()
+        data_versions.touch(user_id, "goals")
         return True
 
     # endregion
\ No newline at end of file
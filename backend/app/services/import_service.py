@@ -0,0 +1,330 @@
+import codecs
+import csv
+import re
+from datetime import datetime
+
+from postgrest.exceptions import APIError
+
+from app.services.account_cache import account_cache
+from app.services.data_versions import data_versions
+from app.services.live_updates import live_updates
+from app.services.transaction_service import TransactionService
+
+
+class ImportService:
+
+    FORMATS = ["csv", "ofx"]
+    DEFAULT_BATCH_SIZE = 500
+    MAX_BATCH_SIZE = 1000
+    MAX_REPORTED_ERRORS = 1000
+    MAX_RECORD_SIZE = 64 * 1024   # characters in one CSV record (a quoted field may span lines)
+    # SQLSTATE classes of a statement the database refused and rolled back: bad data (22),
+    # a constraint (23) or a trigger's raise exception (P0, e.g. insufficient funds)
+    REJECTED_STATES = ("22", "23", "P0")
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        self.transactions = TransactionService(supabase_client)
+
+    # ==========================================================
+    # region Streaming Parsers
+    # ==========================================================
+
+    @staticmethod
+    async def _iter_text(chunks):
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        async for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    async def _iter_lines(self, chunks):
+        """Yields lines without their line break; a line longer than MAX_RECORD_SIZE is yielded as None."""
+        buffer = ""
+        skipping = False   # inside a line already reported as too long
+        async for text in self._iter_text(chunks):
+            buffer += text
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if skipping:
+                    skipping = False
+                    continue
+                yield line.rstrip("\r") if len(line) <= self.MAX_RECORD_SIZE else None
+            if len(buffer) > self.MAX_RECORD_SIZE:
+                if not skipping:
+                    yield None
+                skipping, buffer = True, ""
+        if buffer and not skipping:
+            yield buffer.rstrip("\r")
+
+    async def parse_csv(self, chunks):
+        """Yields (row_number, fields) from a CSV body with a header row; only one record is held at a time.
+
+        A record that can't be read (bad quoting, an unterminated quoted field, more than
+        MAX_RECORD_SIZE characters) is yielded as (row_number, ValueError) and skipped.
+        """
+        header = None
+        lines = []   # physical lines of the record being read
+        size = 0
+        row_number = 0
+
+        def unreadable(message: str):
+            if header is None:
+                raise ValueError(f"Invalid CSV header: {message}")
+            return ValueError(message)
+
+        async for line in self._iter_lines(chunks):
+            if line is None:
+                row_number += 1
+                yield row_number, unreadable(f"Record longer than {self.MAX_RECORD_SIZE} characters.")
+                lines, size = [], 0
+                continue
+
+            lines.append(line + "\n")
+            size += len(line) + 1
+            try:
+                values = next(csv.reader(lines, strict=True), [])
+            except csv.Error as e:
+                # Only a quoted field still open at the end of the input: it continues on the next line
+                if "unexpected end of data" in str(e) and size <= self.MAX_RECORD_SIZE:
+                    continue
+                row_number += 1
+                if size > self.MAX_RECORD_SIZE:
+                    yield row_number, unreadable(f"Unterminated quoted field (record longer than {self.MAX_RECORD_SIZE} characters).")
+                else:
+                    yield row_number, unreadable(f"Malformed CSV: {e}.")
+                lines, size = [], 0
+                continue
+
+            lines, size = [], 0
+            if len(values) <= 1 and not "".join(values).strip():
+                continue  # blank line
+            if header is None:
+                header = [h.strip().lower() for h in values]
+                continue
+            row_number += 1
+            yield row_number, dict(zip(header, (v.strip() for v in values)))
+
+        if lines:
+            row_number += 1
+            yield row_number, unreadable("Unterminated quoted field at the end of the file.")
+
+    async def parse_ofx(self, chunks):
+        """Yields (row_number, fields) for each <STMTTRN> of an OFX 1.x (SGML) or 2.x (XML) statement."""
+        token = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+        buffer = ""
+        current = None
+        row_number = 0
+        async for text in self._iter_text(chunks):
+            buffer += text
+            # Only consume tokens whose value is complete, i.e. followed by the next "<"
+            end = buffer.rfind("<")
+            complete, buffer = buffer[:end], buffer[end:]
+            for closing, tag, value in token.findall(complete):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and current is not None:
+                        row_number += 1
+                        yield row_number, current
+                        current = None
+                    elif not closing:
+                        current = {}
+                elif current is not None and not closing and value.strip():
+                    current[tag] = value.strip()
+        if current:
+            row_number += 1
+            yield row_number, current
+
+    # endregion Streaming Parsers
+
+
+    # ==========================================================
+    # region Row Mapping
+    # ==========================================================
+
+    @staticmethod
+    def _grouped(digits: str, separator: str) -> bool:
+        # "1.234.567" with separator "." — thousands groups of exactly three digits
+        head, *groups = digits.split(separator)
+        return bool(re.fullmatch(r"[1-9]\d{0,2}", head)) and all(re.fullmatch(r"\d{3}", g) for g in groups)
+
+    @classmethod
+    def _parse_amount(cls, raw: str) -> float:
+        """Reads 1234.56, 1,234.56, 1234,56 and 1.234,56 alike.
+
+        "1,234" and "1.234" are refused rather than guessed: one separator followed by exactly
+        three digits may be thousands (1234) or decimals (1.234), depending on the bank.
+        """
+        value = re.sub(r"[\s\u00a0\u202f€]", "", raw)
+        match = re.fullmatch(r"([+-]?)(\d[\d.,]*)", value)
+        if not match:
+            raise ValueError(f"Invalid amount '{raw}'.")
+        sign, digits = match.groups()
+
+        separators = [c for c in ".," if c in digits]
+        if len(separators) == 2:
+            # Both used: the last one is the decimal separator, the other groups thousands
+            decimal = "." if digits.rfind(".") > digits.rfind(",") else ","
+            whole, _, fraction = digits.rpartition(decimal)
+            thousands = "," if decimal == "." else "."
+            if not fraction or not cls._grouped(whole, thousands):
+                raise ValueError(f"Invalid amount '{raw}'.")
+        elif separators:
+            separator = separators[0]
+            if digits.count(separator) > 1:
+                if not cls._grouped(digits, separator):
+                    raise ValueError(f"Invalid amount '{raw}'.")
+                whole, fraction = digits, ""   # 1.234.567 / 1,234,567
+            else:
+                whole, fraction = digits.split(separator)
+                if not fraction:
+                    raise ValueError(f"Invalid amount '{raw}'.")
+                if len(fraction) == 3 and cls._grouped(digits, separator):
+                    raise ValueError(f"Ambiguous amount '{raw}': can't tell a thousands separator from a decimal one.")
+        else:
+            whole, fraction = digits, ""
+
+        whole = whole.replace(".", "").replace(",", "")
+        return float(f"{sign}{whole}.{fraction or 0}")
+
+    @staticmethod
+    def _parse_date(raw: str) -> str:
+        raw = raw.strip()
+        for fmt, length in (("%Y%m%d", 8), ("%Y-%m-%d", 10), ("%d/%m/%Y", 10)):
+            try:
+                return datetime.strptime(raw[:length], fmt).date().isoformat()
+            except ValueError:
+                continue
+        try:
+            return datetime.fromisoformat(raw).isoformat()
+        except ValueError:
+            raise ValueError(f"Invalid date '{raw}'.")
+
+    def csv_row(self, fields: dict, account_id: int, default_category: str) -> dict:
+        if not fields.get("date") or not fields.get("amount"):
+            raise ValueError("Missing date or amount.")
+        amount = self._parse_amount(fields["amount"])
+        # Without a type column the sign decides: negative amounts are expenses
+        tx_type = fields.get("type") or ("expense" if amount < 0 else "income")
+        return self.transactions.build_transaction(
+            account_id=int(fields["account_id"]) if fields.get("account_id") else account_id,
+            amount=abs(amount),
+            tx_type=tx_type,
+            category=fields.get("category") or default_category,
+            description=fields.get("description") or None,
+            date=self._parse_date(fields["date"]),
+        )
+
+    def ofx_row(self, fields: dict, account_id: int, default_category: str) -> dict:
+        if not fields.get("DTPOSTED") or not fields.get("TRNAMT"):
+            raise ValueError("Missing DTPOSTED or TRNAMT.")
+        amount = self._parse_amount(fields["TRNAMT"])
+        return self.transactions.build_transaction(
+            account_id=account_id,
+            amount=abs(amount),
+            tx_type="expense" if amount < 0 else "income",
+            category=default_category,
+            description=fields.get("NAME") or fields.get("MEMO"),
+            date=self._parse_date(fields["DTPOSTED"]),
+        )
+
+    # endregion Row Mapping
+
+
+    # ==========================================================
+    # region Import
+    # ==========================================================
+
+    async def import_transactions(self, user_id: str, chunks, fmt: str, account_id: int = None,
+                                  default_category: str = "Other", batch_size: int = None):
+        """Streams the body, validates each row and inserts valid rows in batches.
+
+        Memory stays bounded by one batch plus the (capped) error report, whatever the file size.
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Invalid format. Must be: {self.FORMATS}")
+        if fmt == "ofx" and not account_id:
+            raise ValueError("account_id is required for OFX imports.")
+        batch_size = max(1, min(batch_size or self.DEFAULT_BATCH_SIZE, self.MAX_BATCH_SIZE))
+
+        parse, to_row = (self.parse_csv, self.csv_row) if fmt == "csv" else (self.parse_ofx, self.ofx_row)
+        report = {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+        owned = {}
+        batch = []
+
+        def fail(row_number: int, message: str):
+            report["failed"] += 1
+            if len(report["errors"]) < self.MAX_REPORTED_ERRORS:
+                report["errors"].append({"row": row_number, "error": message})
+            else:
+                report["errors_truncated"] = True
+
+        try:
+            async for row_number, fields in parse(chunks):
+                if isinstance(fields, ValueError):
+                    fail(row_number, str(fields))
+                    continue
+                try:
+                    row = to_row(fields, account_id, default_category)
+                except (ValueError, TypeError) as e:
+                    fail(row_number, str(e))
+                    continue
+
+                # Ownership once per account, not once per row
+                if row["account_id"] not in owned:
+                    owned[row["account_id"]] = await account_cache.owns_account(self.supabase, user_id, row["account_id"])
+                if not owned[row["account_id"]]:
+                    fail(row_number, "Account not found or unauthorized.")
+                    continue
+
+                batch.append((row_number, row))
+                if len(batch) >= batch_size:
+                    await self._flush(user_id, batch, report, fail)
+                    batch = []
+
+            if batch:
+                await self._flush(user_id, batch, report, fail)
+        finally:
+            # Also when the import stops half-way: the rows saved so far are there
+            if report["imported"]:
+                data_versions.touch(user_id, "transactions", "accounts", "budgets")
+        return report
+
+    def _rejected(self, error: Exception) -> bool:
+        return isinstance(error, APIError) and (error.code or "")[:2] in self.REJECTED_STATES
+
+    async def _flush(self, user_id: str, batch: list, report: dict, fail):
+        # One multi-row INSERT; the balance trigger still runs per row, in file order
+        try:
+            response = await self.supabase.table("transactions").insert([row for _, row in batch]).execute()
+        except Exception as e:
+            # A timeout or dropped connection may come after the batch was committed: retrying
+            # it row by row could import it twice, so only a refused batch is retried
+            if not self._rejected(e):
+                raise Exception(f"Import stopped after {report['imported']} rows; the last batch "
+                                f"({len(batch)} rows from row {batch[0][0]}) may not have been saved: {e}")
+        else:
+            report["imported"] += len(batch)
+            live_updates.transactions_changed(self.supabase, user_id, inserted=response.data or [])
+            return
+
+        # The batch is one statement, so one bad row (e.g. insufficient funds) rolls all of it back.
+        # Retry row by row to import the good ones and report the bad ones.
+        for row_number, row in batch:
+            try:
+                response = await self.supabase.table("transactions").insert(row).execute()
+            except Exception as e:
+                if not self._rejected(e):
+                    raise Exception(f"Import stopped after {report['imported']} rows; row {row_number} "
+                                    f"may not have been saved: {e}")
+                error_msg = getattr(e, "message", None) or str(e)
+                message = "Insufficient funds for this transaction." if "Insufficient funds" in error_msg else error_msg
+                fail(row_number, message)
+            else:
+                report["imported"] += 1
+                live_updates.transactions_changed(self.supabase, user_id, inserted=response.data or [])
+
+    # endregion Import
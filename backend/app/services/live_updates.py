@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+from app.repositories import get_repository
+from app.metrics import LIVE_CONNECTIONS, LIVE_EVENTS, LIVE_OVERFLOWS
+
+logger = logging.getLogger(__name__)
+
+
+class TooManyStreams(Exception):
+    pass
+
+
+class LiveUpdates:
+    """In-process fan-out of each user's changes to their open event streams (GET /events).
+
+    Services report what they wrote; subscribers get "transaction", "balance" and "budget"
+    events, the last flagging when spending (or a new limit) crosses one of the alert
+    thresholds. A stream is one bounded queue, so an idle connection costs a queue and a
+    coroutine, and nothing is read from the database for users with no stream open. A stream
+    that falls behind is emptied and sent "resync" (refetch /sync) rather than growing.
+    Like DataVersions, this only sees writes made by this process.
+    """
+
+    def __init__(self, queue_size: int = 100, max_per_user: int = 10, thresholds=(80, 100)):
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self.thresholds = sorted(thresholds)
+        self._queues = {}   # user_id -> set of asyncio.Queue
+        self._levels = {}   # user_id -> {budget_id: thresholds reached}, while the user has streams
+        self._tasks = set()
+
+    # ==========================================================
+    # region Subscriptions
+    # ==========================================================
+
+    def can_subscribe(self, user_id: str) -> bool:
+        return len(self._queues.get(user_id, ())) < self.max_per_user
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        if not self.can_subscribe(user_id):
+            raise TooManyStreams(f"Too many open event streams (max {self.max_per_user}).")
+        queues = self._queues.setdefault(user_id, set())
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        queues.add(queue)
+        LIVE_CONNECTIONS.inc()
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        queues = self._queues.get(user_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        LIVE_CONNECTIONS.dec()
+        if not queues:
+            del self._queues[user_id]
+            self._levels.pop(user_id, None)
+
+    def has_subscribers(self, user_id: str) -> bool:
+        return user_id in self._queues
+
+    def publish(self, user_id: str, event: str, data: dict):
+        for queue in self._queues.get(user_id, ()):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # The client isn't reading: drop its backlog, it will refetch everything anyway
+                LIVE_OVERFLOWS.inc()
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {}))
+            LIVE_EVENTS.labels(event=event).inc()
+
+    # endregion Subscriptions
+
+
+    # ==========================================================
+    # region Change Reports
+    # ==========================================================
+
+    def transactions_changed(self, supabase, user_id: str, inserted=(), deleted=(), updated=()):
+        """Called after a write: inserted/deleted are rows, updated is [(old row, new row)].
+
+        Transaction events go out right away; balances and budget crossings need a read, which
+        runs in the background and only for users with a stream open.
+        """
+        if not self.has_subscribers(user_id):
+            return
+        for row in inserted:
+            self.publish(user_id, "transaction", {"op": "insert", "transaction": self._plain(row)})
+        for _, row in updated:
+            self.publish(user_id, "transaction", {"op": "update", "transaction": self._plain(row)})
+        for row in deleted:
+            self.publish(user_id, "transaction", {"op": "delete", "transaction": self._plain(row)})
+
+        # What each budget's spending moved by: (year, month, category) -> delta
+        spend = {}
+        account_ids = set()
+        changes = [(row, 1) for row in inserted] + [(row, -1) for row in deleted]
+        for old, new in updated:
+            changes += [(old, -1), (new, 1)]
+        for row, sign in changes:
+            account_ids.add(row["account_id"])
+            if row["type"] == "expense":
+                day = str(row["date"])
+                key = (int(day[:4]), int(day[5:7]), (row["category"] or "").strip().lower())
+                spend[key] = spend.get(key, 0.0) + sign * float(row["amount"])
+
+        self._run(self._follow_up(supabase, user_id, account_ids, spend))
+
+    def account_changed(self, user_id: str, account: dict):
+        self.publish(user_id, "balance", {"account_id": account["id"], "balance": account["balance"]})
+
+    def account_deleted(self, user_id: str, account_id: int):
+        """Its transactions went with it: clients drop them and refetch budgets."""
+        if not self.has_subscribers(user_id):
+            return
+        self.publish(user_id, "balance", {"account_id": account_id, "balance": None, "deleted": True})
+        # Spending fell by an unknown amount; crossings are measured afresh from the next write
+        self._levels.pop(user_id, None)
+
+    def budget_changed(self, supabase, user_id: str, budget: dict, previous_limit: float = None):
+        """Called after a budget's limit changed; previous_limit tells whether that crossed a threshold."""
+        if not self.has_subscribers(user_id):
+            return
+        self._run(self._follow_up_budget(supabase, user_id, budget, previous_limit))
+
+    def _run(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _follow_up(self, supabase, user_id: str, account_ids: set, spend: dict):
+        try:
+            await self._publish_balances(supabase, user_id, account_ids)
+            await self._publish_budget_crossings(supabase, user_id, spend)
+        except Exception:
+            logger.exception("Live update for user %s failed", user_id)
+
+    async def _follow_up_budget(self, supabase, user_id: str, budget: dict, previous_limit: float):
+        try:
+            year, month = int(budget["year"]), int(budget["month"])
+            for row in await get_repository(supabase).budgets_with_spent(user_id, year, month):
+                if row["id"] == budget["id"]:
+                    spent = float(row["spent"])
+                    previous = None if previous_limit is None else self._level(spent, float(previous_limit))
+                    self._publish_budget(user_id, row, year, month, previous)
+        except Exception:
+            logger.exception("Live update for user %s failed", user_id)
+
+    async def _publish_balances(self, supabase, user_id: str, account_ids: set):
+        if not account_ids:
+            return
+        response = await (
+            supabase.table("accounts")
+            .select("id, balance")
+            .in_("id", sorted(account_ids))
+            .eq("user_id", user_id)
+            .execute()
+        )
+        for account in response.data or []:
+            self.account_changed(user_id, account)
+
+    async def _publish_budget_crossings(self, supabase, user_id: str, spend: dict):
+        repository = get_repository(supabase)
+        for year, month in sorted({(year, month) for year, month, _ in spend}):
+            for budget in await repository.budgets_with_spent(user_id, year, month):
+                category = budget["category"].strip().lower()
+                delta = spend.get((year, month, category))
+                if not delta:
+                    continue
+                # What it was before this write
+                before = self._level(float(budget["spent"]) - delta, float(budget["limit_amount"]))
+                self._publish_budget(user_id, budget, year, month, before)
+
+    def _publish_budget(self, user_id: str, budget: dict, year: int, month: int, previous: int = None):
+        """Sends a budget's state; `previous` is its threshold level before the write, when the caller knows it."""
+        spent = float(budget["spent"])
+        limit = float(budget["limit_amount"])
+        level = self._level(spent, limit)
+
+        levels = self._levels.setdefault(user_id, {})
+        # A level published earlier wins over the caller's reconstruction
+        previous = levels.get(budget["id"], level if previous is None else previous)
+        levels[budget["id"]] = level
+
+        self.publish(user_id, "budget", {
+            "budget_id": budget["id"],
+            "category": budget["category"],
+            "year": year,
+            "month": month,
+            "limit_amount": limit,
+            "spent": round(spent, 2),
+            "percentage": round(min(spent / limit * 100, 100), 1) if limit > 0 else 0,
+            # The highest threshold reached (0: below all of them), and whether this write crossed one
+            "threshold": self.thresholds[level - 1] if level else 0,
+            "crossed": None if level == previous else ("over" if level > previous else "under"),
+        })
+
+    def _level(self, spent: float, limit: float) -> int:
+        """How many thresholds (in % of the limit) spending has reached."""
+        if limit <= 0:
+            return 0
+        percentage = spent / limit * 100
+        return sum(1 for threshold in self.thresholds if percentage >= threshold)
+
+    @staticmethod
+    def _plain(row: dict) -> dict:
+        # Rows read with an embedded join (accounts!inner) carry it along
+        return {k: v for k, v in row.items() if k != "accounts"}
+
+    # endregion Change Reports
+
+
+live_updates = LiveUpdates(
+    queue_size=int(os.getenv("LIVE_QUEUE_SIZE", "100")),
+    max_per_user=int(os.getenv("LIVE_MAX_STREAMS_PER_USER", "10")),
+    thresholds=[float(t) for t in os.getenv("BUDGET_ALERT_THRESHOLDS", "80,100").split(",")],
+)
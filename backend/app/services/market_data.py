@@ -0,0 +1,314 @@
+import json
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.services.tickers import normalize_ticker
+from app.timing import call_with_retries
+
+
+BAR_DTYPE = np.dtype([("date", "datetime64[D]"), ("close", "f8")])
+
+
+# ==========================================================
+# region Providers
+# ==========================================================
+
+class YFinanceProvider:
+    """Daily closes and ticker metadata from Yahoo Finance."""
+
+    def history(self, ticker: str, start: date, end: date) -> pd.Series:
+        import yfinance as yf
+        raw = yf.download(ticker, start=start.isoformat(), end=end.isoformat(),
+                          multi_level_index=False, progress=False)
+        if raw.empty:
+            return pd.Series(dtype="f8")
+        closes = raw["Close"].dropna()
+        index = pd.to_datetime(closes.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return pd.Series(closes.to_numpy(dtype="f8"), index=index.normalize())
+
+    def history_many(self, tickers: list, start: date, end: date) -> dict:
+        # One grouped request for every ticker instead of one download each
+        import yfinance as yf
+        raw = yf.download(tickers, start=start.isoformat(), end=end.isoformat(),
+                          group_by="column", progress=False)
+        if raw.empty:
+            return {}
+        closes = raw["Close"]
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(tickers[0])
+        index = pd.to_datetime(closes.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        result = {}
+        for ticker in closes.columns:
+            series = pd.Series(closes[ticker].to_numpy(dtype="f8"), index=index.normalize()).dropna()
+            result[str(ticker).upper()] = series
+        return result
+
+    def info(self, ticker: str) -> dict:
+        import yfinance as yf
+        return yf.Ticker(ticker).info or {}
+
+
+class FixtureProvider:
+    """Offline provider: <directory>/<TICKER>.csv (date,close) and optional <TICKER>.json (info)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def history(self, ticker: str, start: date, end: date) -> pd.Series:
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return pd.Series(dtype="f8")
+        frame = pd.read_csv(path, parse_dates=["date"])
+        mask = (frame["date"] >= pd.Timestamp(start)) & (frame["date"] < pd.Timestamp(end))
+        frame = frame[mask]
+        return pd.Series(frame["close"].to_numpy(dtype="f8"), index=pd.DatetimeIndex(frame["date"]))
+
+    def history_many(self, tickers: list, start: date, end: date) -> dict:
+        return {ticker: self.history(ticker, start, end) for ticker in tickers}
+
+    def info(self, ticker: str) -> dict:
+        path = os.path.join(self.directory, f"{ticker}.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+# endregion Providers
+
+
+class MarketDataStore:
+    """Local per-ticker store of daily closes.
+
+    Each ticker is one memory-mapped numpy file of (date, close) bars. Only bars newer than
+    the stored ones are fetched (at most once per refresh_interval), or older ones when a
+    request starts before the stored range; any `start` is then served by slicing locally.
+    Ticker metadata is cached with a TTL. Provider calls are timed and retried with backoff.
+    """
+
+    BARS_FILE = "bars.npy"
+    META_FILE = "meta.json"
+    INFO_FILE = "info.json"
+
+    def __init__(self, directory: str, provider, refresh_interval: float = 3600,
+                 info_ttl: float = 86400, missing_info_ttl: float = 600,
+                 fetch_attempts: int = 3, retry_backoff: float = 0.5):
+        self.directory = directory
+        self.provider = provider
+        self.fetch_attempts = fetch_attempts
+        self.retry_backoff = retry_backoff
+        self.refresh_interval = refresh_interval
+        self.info_ttl = info_ttl
+        self.missing_info_ttl = missing_info_ttl
+        self._info = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _fetch(self, operation: str, *args):
+        fetch = getattr(self.provider, operation)
+        return call_with_retries("market-data", operation, fetch, *args,
+                                 attempts=self.fetch_attempts, backoff=self.retry_backoff)
+
+    # ==========================================================
+    # region Storage
+    # ==========================================================
+
+    def _ticker_dir(self, ticker: str) -> str:
+        # The ticker comes from the request: checked here too, so it can only name a subdirectory
+        return os.path.join(self.directory, normalize_ticker(ticker))
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _read_json(self, path: str) -> dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_atomic(self, path: str, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _write_json(self, path: str, data: dict):
+        def write(tmp):
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+        self._write_atomic(path, write)
+
+    def load_bars(self, ticker: str) -> np.ndarray:
+        path = os.path.join(self._ticker_dir(ticker), self.BARS_FILE)
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return np.empty(0, dtype=BAR_DTYPE)
+
+    def _save_bars(self, ticker: str, bars: np.ndarray, meta: dict):
+        ticker_dir = self._ticker_dir(ticker)
+        # np.save appends ".npy" to names without it, so write through a file object
+        def write_bars(tmp):
+            with open(tmp, "wb") as f:
+                np.save(f, bars)
+        self._write_atomic(os.path.join(ticker_dir, self.BARS_FILE), write_bars)
+        self._write_json(os.path.join(ticker_dir, self.META_FILE), meta)
+
+    @staticmethod
+    def _to_bars(series: pd.Series) -> np.ndarray:
+        bars = np.empty(len(series), dtype=BAR_DTYPE)
+        bars["date"] = series.index.values.astype("datetime64[D]")
+        bars["close"] = series.to_numpy(dtype="f8")
+        return bars
+
+    @staticmethod
+    def _merge(*parts: np.ndarray) -> np.ndarray:
+        bars = np.concatenate([p for p in parts if len(p)]) if any(len(p) for p in parts) else np.empty(0, dtype=BAR_DTYPE)
+        # Later parts win on duplicate dates (a re-fetched bar replaces a provisional one)
+        _, last = np.unique(bars["date"][::-1], return_index=True)
+        return bars[::-1][last]
+
+    # endregion Storage
+
+
+    # ==========================================================
+    # region History
+    # ==========================================================
+
+    def sync(self, ticker: str, start: date, today: date = None) -> np.ndarray:
+        """Brings the local store up to date for [start, today] and returns all stored bars."""
+        ticker = normalize_ticker(ticker)
+        today = today or date.today()
+        with self._lock(ticker):
+            bars = np.array(self.load_bars(ticker))
+            meta = self._read_json(os.path.join(self._ticker_dir(ticker), self.META_FILE))
+            first_requested = date.fromisoformat(meta["first_requested"]) if meta.get("first_requested") else None
+            changed = False
+
+            if first_requested is None or start < first_requested:
+                # Nothing stored yet, or the request reaches further back than we have
+                initial = first_requested is None
+                older_end = today + timedelta(days=1) if initial else first_requested
+                older = self._to_bars(self._fetch("history", ticker, start, older_end))
+                bars = self._merge(older, bars)
+                if initial:
+                    meta["checked_at"] = time.time()
+                first_requested = start
+                changed = True
+
+            if time.time() - meta.get("checked_at", 0) >= self.refresh_interval:
+                # Re-fetch from the last stored day: it may have been an intraday (provisional) close
+                since = bars["date"][-1].item() if len(bars) else first_requested
+                newer = self._to_bars(self._fetch("history", ticker, since, today + timedelta(days=1)))
+                bars = self._merge(bars, newer)
+                meta["checked_at"] = time.time()
+                changed = True
+
+            # Nothing known about this ticker: don't leave an empty store behind for it
+            if changed and len(bars):
+                meta["first_requested"] = first_requested.isoformat()
+                self._save_bars(ticker, bars, meta)
+                bars = self.load_bars(ticker)
+            return bars
+
+    def _fetch_from(self, ticker: str, start: date):
+        """First day sync() would download for this ticker, or None if the store is fresh enough."""
+        meta = self._read_json(os.path.join(self._ticker_dir(ticker), self.META_FILE))
+        first_requested = date.fromisoformat(meta["first_requested"]) if meta.get("first_requested") else None
+        if first_requested is None or start < first_requested:
+            return start
+        if time.time() - meta.get("checked_at", 0) >= self.refresh_interval:
+            bars = self.load_bars(ticker)
+            return bars["date"][-1].item() if len(bars) else first_requested
+        return None
+
+    def sync_many(self, tickers: list, start: date, today: date = None):
+        """Brings several tickers up to date with one grouped provider request."""
+        today = today or date.today()
+        stale = {}
+        for ticker in dict.fromkeys(normalize_ticker(t) for t in tickers):
+            since = self._fetch_from(ticker, start)
+            if since is not None:
+                stale[ticker] = since
+        if not stale:
+            return
+
+        fetched = self._fetch("history_many", list(stale), min(stale.values()), today + timedelta(days=1))
+        for ticker in stale:
+            with self._lock(ticker):
+                bars = np.array(self.load_bars(ticker))
+                meta = self._read_json(os.path.join(self._ticker_dir(ticker), self.META_FILE))
+                first_requested = date.fromisoformat(meta["first_requested"]) if meta.get("first_requested") else start
+                bars = self._merge(bars, self._to_bars(fetched.get(ticker, pd.Series(dtype="f8"))))
+                if not len(bars):
+                    continue
+                meta["first_requested"] = min(start, first_requested).isoformat()
+                meta["checked_at"] = time.time()
+                self._save_bars(ticker, bars, meta)
+
+    def get_history(self, ticker: str, start: str, end: str = None) -> pd.DataFrame:
+        """Daily closes from `start` (inclusive) to `end` (exclusive), shaped like a yfinance download."""
+        start_day = date.fromisoformat(start)
+        bars = self.sync(ticker, start_day)
+        lo = np.searchsorted(bars["date"], np.datetime64(start_day, "D"), side="left")
+        hi = np.searchsorted(bars["date"], np.datetime64(end, "D"), side="left") if end else len(bars)
+        window = bars[lo:hi]
+        return pd.DataFrame(
+            {"Close": np.asarray(window["close"])},
+            index=pd.DatetimeIndex(np.asarray(window["date"]).astype("datetime64[ns]"), name="Date"),
+        )
+
+    # endregion History
+
+
+    # ==========================================================
+    # region Ticker Info
+    # ==========================================================
+
+    def get_info(self, ticker: str) -> dict:
+        ticker = normalize_ticker(ticker)
+        cached = self._info.get(ticker)
+        if cached is None:
+            cached = self._read_json(os.path.join(self._ticker_dir(ticker), self.INFO_FILE)) or None
+        if cached is not None:
+            ttl = self.info_ttl if cached.get("info") else self.missing_info_ttl
+            if time.time() - cached.get("fetched_at", 0) < ttl:
+                self._info[ticker] = cached
+                return cached["info"]
+
+        info = self._fetch("info", ticker)
+        cached = {"info": info, "fetched_at": time.time()}
+        self._info[ticker] = cached
+        if info:
+            self._write_json(os.path.join(self._ticker_dir(ticker), self.INFO_FILE), cached)
+        return info
+
+    # endregion Ticker Info
+
+
+def _default_provider():
+    fixtures = os.getenv("MARKET_DATA_FIXTURES")
+    return FixtureProvider(fixtures) if fixtures else YFinanceProvider()
+
+
+market_data = MarketDataStore(
+    directory=os.getenv("MARKET_DATA_DIR", os.path.join(".cache", "market-data")),
+    provider=_default_provider(),
+    refresh_interval=float(os.getenv("MARKET_DATA_REFRESH", "3600")),
+    info_ttl=float(os.getenv("MARKET_INFO_TTL", "900")),  # search shows the current price from info
+    fetch_attempts=int(os.getenv("MARKET_DATA_ATTEMPTS", "3")),
+)
@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta
+from app.repositories import get_repository
+from app.services.budget_service import BudgetService
+
+
+class ReportService:
+
+    GRANULARITIES = ["day", "week", "month", "year"]
+    MAX_PERIODS = 1000
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        self.repository = get_repository(supabase_client)
+
+    # ==========================================================
+    # region Periods
+    # ==========================================================
+
+    @staticmethod
+    def period_start(day: date, granularity: str) -> date:
+        # Same buckets as Postgres date_trunc (weeks start on Monday)
+        if granularity == "day":
+            return day
+        if granularity == "week":
+            return day - timedelta(days=day.weekday())
+        if granularity == "month":
+            return day.replace(day=1)
+        return day.replace(month=1, day=1)
+
+    @staticmethod
+    def next_period(start: date, granularity: str) -> date:
+        if granularity == "day":
+            return start + timedelta(days=1)
+        if granularity == "week":
+            return start + timedelta(weeks=1)
+        if granularity == "month":
+            return date(start.year + 1, 1, 1) if start.month == 12 else date(start.year, start.month + 1, 1)
+        return date(start.year + 1, 1, 1)
+
+    def list_periods(self, date_from: date, date_to: date, granularity: str):
+        periods = []
+        current = self.period_start(date_from, granularity)
+        while current <= date_to:
+            periods.append(current)
+            if len(periods) > self.MAX_PERIODS:
+                raise ValueError(f"Range too large for '{granularity}' granularity (max {self.MAX_PERIODS} periods).")
+            current = self.next_period(current, granularity)
+        return periods
+
+    # endregion Periods
+
+
+    # ==========================================================
+    # region Reports
+    # ==========================================================
+
+    async def get_report(self, user_id: str, date_from: str, date_to: str,
+                         granularity: str = "month", account_id: int = None):
+        """Income/expense per period, running net balance and per-category totals for [date_from, date_to]."""
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"Invalid granularity. Must be: {self.GRANULARITIES}")
+        try:
+            start = date.fromisoformat(date_from)
+            end = date.fromisoformat(date_to)
+        except ValueError:
+            raise ValueError("Invalid date. Use YYYY-MM-DD.")
+        if end < start:
+            raise ValueError("date_to must be on or after date_from.")
+
+        periods = self.list_periods(start, end, granularity)
+
+        # Grouped in Postgres — one row per (period, type, category), never one per transaction
+        rows = await self.repository.report_aggregates(
+            user_id, start.isoformat(), (end + timedelta(days=1)).isoformat(), granularity, account_id
+        )
+
+        buckets = {p: {"income": 0.0, "expense": 0.0, "count": 0} for p in periods}
+        categories = {}
+        for row in rows:
+            period = self.period_start(datetime.fromisoformat(str(row["period"])).date(), granularity)
+            total = float(row["total"])
+            bucket = buckets.setdefault(period, {"income": 0.0, "expense": 0.0, "count": 0})
+            bucket[row["type"]] = bucket.get(row["type"], 0.0) + total
+            bucket["count"] += int(row.get("tx_count") or 0)
+
+            key = (row["type"], BudgetService.normalize_category(row["category"]))
+            categories[key] = categories.get(key, 0.0) + total
+
+        series = []
+        balance = 0.0
+        for period in sorted(buckets):
+            income = buckets[period]["income"]
+            expense = buckets[period]["expense"]
+            balance += income - expense
+            series.append({
+                "period": period.isoformat(),
+                "income": round(income, 2),
+                "expense": round(expense, 2),
+                "net": round(income - expense, 2),
+                "balance": round(balance, 2),
+                "count": buckets[period]["count"],
+            })
+
+        total_income = sum(b["income"] for b in buckets.values())
+        total_expense = sum(b["expense"] for b in buckets.values())
+
+        return {
+            "date_from": start.isoformat(),
+            "date_to": end.isoformat(),
+            "granularity": granularity,
+            "totals": {
+                "income": round(total_income, 2),
+                "expense": round(total_expense, 2),
+                "net": round(total_income - total_expense, 2),
+            },
+            "periods": series,
+            "categories": [
+                {"type": tx_type, "category": category, "total": round(total, 2)}
+                for (tx_type, category), total in sorted(categories.items(), key=lambda item: -item[1])
+            ],
+        }
+
+    # endregion Reports
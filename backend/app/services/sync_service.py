@@ -0,0 +1,63 @@
+import base64
+import json
+from app.repositories import get_repository
+
+
+class SyncService:
+    """Changes to a user's accounts, transactions, budgets and goals since a cursor, read from
+    the change log (supabase/migrations/*_change_log.sql).
+
+    A client keeps a local copy: the first sync (no cursor) returns every row, and each later
+    call only the rows changed since the cursor it was given, so refreshing costs O(changes).
+    """
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+
+    def __init__(self, supabase_client):
+        self.supabase = supabase_client
+        self.repository = get_repository(supabase_client)
+
+    # ==========================================================
+    # region Cursors
+    # ==========================================================
+
+    @staticmethod
+    def encode_cursor(xact: int, entry_id: int) -> str:
+        raw = json.dumps([xact, entry_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            xact, entry_id = json.loads(base64.urlsafe_b64decode(padded))
+            return int(xact), int(entry_id)
+        except Exception:
+            raise ValueError("Invalid cursor.")
+
+    # endregion
+
+
+    # ==========================================================
+    # region Sync
+    # ==========================================================
+
+    async def changes_since(self, user_id: str, since: str = None, limit: int = None):
+        """Returns {"changes": [...], "cursor": ..., "has_more": ...}.
+
+        Each change is {"collection", "id", "op": "upsert" | "delete", "row"}, with the row's
+        current state (null for deletes). Pass `cursor` back as `since`; while `has_more` is
+        true there are more changes to fetch right away.
+        """
+        limit = max(1, min(limit or self.DEFAULT_LIMIT, self.MAX_LIMIT))
+        after_xact, after_id = self.decode_cursor(since) if since else (0, 0)
+
+        page = await self.repository.sync_changes(user_id, after_xact, after_id, limit)
+        return {
+            "changes": page["changes"],
+            "cursor": self.encode_cursor(page["next_xact"], page["next_id"]),
+            "has_more": page["has_more"],
+        }
+
+    # endregion
@@ -0,0 +1,13 @@
+import re
+
+# Exchange symbols as Yahoo spells them: AAPL, BRK-B, BTC-USD, ^GSPC, EURUSD=X, VOD.L.
+# Tickers name directories in the market-data store, so nothing else gets through.
+TICKER_PATTERN = re.compile(r"^[A-Z0-9^][A-Z0-9.^=-]{0,14}$")
+
+
+def normalize_ticker(ticker: str) -> str:
+    """Upper-cased, stripped ticker; ValueError if it isn't a plausible symbol."""
+    ticker = (ticker or "").strip().upper()
+    if not TICKER_PATTERN.match(ticker):
+        raise ValueError("Invalid ticker.")
+    return ticker
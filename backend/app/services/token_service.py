@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import jwt
+from cachetools import TTLCache
+
+from app.metrics import AUTH_TOKEN_CACHE_HITS, AUTH_TOKEN_CACHE_MISSES, AUTH_TOKEN_VERIFICATIONS
+from app.timing import track
+
+
+class InvalidTokenError(Exception):
+    pass
+
+
+class TokenService:
+    """Verifies Supabase access tokens locally, falling back to the auth server when needed."""
+
+    ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
+    def __init__(self, supabase_client, supabase_url: str = None, jwt_secret: str = None,
+                 audience: str = "authenticated", cache_size: int = 10_000, cache_ttl: int = 300,
+                 session_recheck: int = 300, key_refresh_interval: int = 600, min_key_refresh: int = 30):
+        self.supabase = supabase_client
+        self.jwt_secret = jwt_secret
+        self.audience = audience
+        self.jwks_url = f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json" if supabase_url else None
+        self.issuer = f"{supabase_url.rstrip('/')}/auth/v1" if supabase_url else None
+        self.key_refresh_interval = key_refresh_interval
+        self.min_key_refresh = min_key_refresh
+
+        # token -> (user, exp). Bounded both in size and in age.
+        self._tokens = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # session_id -> True for sessions the auth server confirmed recently (0 disables the recheck)
+        self._live_sessions = TTLCache(maxsize=cache_size, ttl=session_recheck) if session_recheck > 0 else None
+
+        self._signing_keys = {}
+        self._keys_fetched_at = 0.0
+
+    # ==========================================================
+    # region Signing Keys
+    # ==========================================================
+
+    async def refresh_signing_keys(self):
+        if not self.jwks_url:
+            return
+        self._keys_fetched_at = time.monotonic()
+        response = await self.supabase.http.get(self.jwks_url, timeout=10)
+        response.raise_for_status()
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            try:
+                keys[jwk.get("kid")] = jwt.PyJWK(jwk)
+            except jwt.PyJWKError:
+                continue  # unsupported key type — tokens signed with it go to the remote check
+        self._signing_keys = keys
+
+    async def run_key_refresher(self):
+        # Keeps the JWKS warm so the request path never waits on it
+        while True:
+            try:
+                await self.refresh_signing_keys()
+            except Exception:
+                pass  # keep the previous key set; the next run retries
+            await asyncio.sleep(self.key_refresh_interval)
+
+    async def _get_signing_key(self, kid: str):
+        key = self._signing_keys.get(kid)
+        if key is None and time.monotonic() - self._keys_fetched_at >= self.min_key_refresh:
+            # Unknown kid — keys may have been rotated. Throttled so bogus tokens can't hammer the endpoint.
+            try:
+                await self.refresh_signing_keys()
+            except Exception:
+                return None
+            key = self._signing_keys.get(kid)
+        return key
+
+    # endregion Signing Keys
+
+
+    # ==========================================================
+    # region Verification
+    # ==========================================================
+
+    async def decode_locally(self, token: str):
+        """Returns the verified claims, or None when there is no key material to verify the token here."""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            raise InvalidTokenError("Malformed token")
+
+        alg = header.get("alg")
+        if alg == "HS256":
+            if not self.jwt_secret:
+                return None
+            key = self.jwt_secret
+        elif alg in self.ASYMMETRIC_ALGORITHMS:
+            signing_key = await self._get_signing_key(header.get("kid"))
+            if signing_key is None:
+                return None
+            key = signing_key.key
+        else:
+            raise InvalidTokenError(f"Unsupported signing algorithm: {alg}")
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[alg],
+                audience=self.audience,
+                issuer=self.issuer,
+                options={"require": ["exp", "sub"]}
+            )
+        except jwt.InvalidTokenError as e:
+            raise InvalidTokenError(str(e))
+
+    async def verify_remotely(self, token: str):
+        try:
+            response = await self.supabase.auth.get_user(token)
+        except Exception:
+            response = None
+        if not response or not response.user:
+            AUTH_TOKEN_VERIFICATIONS.labels(method="remote", outcome="rejected").inc()
+            raise InvalidTokenError("Invalid token")
+        AUTH_TOKEN_VERIFICATIONS.labels(method="remote", outcome="accepted").inc()
+        return {"user_id": response.user.id, "email": response.user.email}
+
+    async def verify(self, token: str) -> dict:
+        now = time.time()
+        cached = self._tokens.get(token)
+        if cached and cached[1] > now:
+            AUTH_TOKEN_CACHE_HITS.inc()
+            return cached[0]
+        AUTH_TOKEN_CACHE_MISSES.inc()
+
+        # Cache misses only: a hit costs a dict lookup
+        with track("auth", "verify", ignore=(InvalidTokenError,)):
+            try:
+                claims = await self.decode_locally(token)
+            except InvalidTokenError:
+                AUTH_TOKEN_VERIFICATIONS.labels(method="local", outcome="rejected").inc()
+                raise
+
+            if claims is None:
+                # No key to check the signature with — the auth server decides
+                user = await self.verify_remotely(token)
+                exp = jwt.decode(token, options={"verify_signature": False}).get("exp", now)
+            else:
+                AUTH_TOKEN_VERIFICATIONS.labels(method="local", outcome="accepted").inc()
+                user = {"user_id": claims["sub"], "email": claims.get("email")}
+                exp = claims["exp"]
+                await self._check_session(token, claims.get("session_id"))
+
+        self._tokens[token] = (user, exp)
+        return user
+
+    async def _check_session(self, token: str, session_id: str):
+        # A signature can't tell us about logouts; confirm each session with the auth server
+        # once per recheck window instead of once per request.
+        if self._live_sessions is None or not session_id:
+            return
+        if session_id in self._live_sessions:
+            return
+        await self.verify_remotely(token)
+        self._live_sessions[session_id] = True
+
+    # endregion Verification
@@ -1,12 +1,22 @@
-from datetime import datetime
+import base64
+import json
+from datetime import datetime, date, timedelta
+from app.repositories import get_repository
+from app.services.account_cache import account_cache
+from app.services.data_versions import data_versions
+from app.services.live_updates import live_updates
 
 
 class TransactionService:
 
     TRANSACTION_TYPES = ["income", "expense"]
+    EDITABLE_FIELDS = ["account_id", "amount", "type", "category", "description", "date"]
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
 
     def __init__(self, supabase_client):
         self.supabase = supabase_client
+        self.repository = get_repository(supabase_client)
 
     # ==========================================================
     # region Validations
@@ -22,32 +32,58 @@ class TransactionService:
 
 
     # ==========================================================
-    # region Transaction CRUD
+    # region Pagination
     # ==========================================================
 
-    def create_transaction(self, user_id: str, account_id: int, amount: float,
-                           tx_type: str, category: str, description: str = None, date: str = None):
+    @staticmethod
+    def encode_cursor(tx_date: str, tx_id: int) -> str:
+        raw = json.dumps([tx_date, tx_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            tx_date, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+            datetime.fromisoformat(tx_date)  # rejects anything that isn't a timestamp before it reaches the filter
+            return tx_date, int(tx_id)
+        except Exception:
+            raise ValueError("Invalid cursor.")
+
+    @staticmethod
+    def like_literal(value: str) -> str:
+        """Escapes LIKE wildcards so `value` only matches itself (case-insensitively, with ilike).
+
+        PostgREST also reads `*` in an ilike pattern as `%` and has no escape for it, so it is rejected.
+        """
+        if "*" in value:
+            raise ValueError("Category filter can't contain '*'.")
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _day_after(day: str) -> str:
+        try:
+            return (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        except ValueError:
+            raise ValueError("Invalid date. Use YYYY-MM-DD.")
+
+    # endregion
+
+
+    # ==========================================================
+    # region Transaction CRUD
+    # ==========================================================
 
+    def build_transaction(self, account_id: int, amount: float, tx_type: str, category: str,
+                          description: str = None, date: str = None) -> dict:
+        """Validates a transaction and returns the row to insert (ownership is checked by the caller)."""
         if not self.is_valid_type(tx_type):
             raise ValueError(f"Invalid type. Must be: {self.TRANSACTION_TYPES}")
 
         if not self.is_valid_amount(amount):
             raise ValueError("Amount must be greater than zero.")
 
-        # Confirm account belongs to user
-        account = (
-            self.supabase.table("accounts")
-            .select("id")
-            .eq("id", account_id)
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
-        if not account.data:
-            raise Exception("Account not found or unauthorized.")
-
-        # Insert transaction — the DB trigger handles balance update automatically
-        data = {
+        return {
             "account_id": account_id,
             "amount": amount,
             "type": tx_type.lower(),
@@ -56,46 +92,83 @@ class TransactionService:
             "date": (date + "T12:00:00") if date and "T" not in date else (date if date else datetime.utcnow().isoformat())
         }
 
+    async def create_transaction(self, user_id: str, account_id: int, amount: float,
+                           tx_type: str, category: str, description: str = None, date: str = None):
+
+        data = self.build_transaction(account_id, amount, tx_type, category, description, date)
+
+        # Confirm account belongs to user
+        if not await account_cache.owns_account(self.supabase, user_id, account_id):
+            raise Exception("Account not found or unauthorized.")
+
+        # Insert transaction — the DB trigger handles balance update automatically
         try:
-            response = self.supabase.table("transactions").insert(data).execute()
-            return response.data[0] if response.data else None
+            response = await self.supabase.table("transactions").insert(data).execute()
         except Exception as e:
             error_msg = str(e)
             if "Insufficient funds" in error_msg:
                 raise Exception("Insufficient funds for this transaction.")
             raise Exception(f"Error creating transaction: {error_msg}")
 
-    def list_transactions(self, user_id: str, account_id: int = None):
-        # Get all account IDs for this user
-        accounts = (
-            self.supabase.table("accounts")
-            .select("id")
-            .eq("user_id", user_id)
-            .execute()
-        )
-        account_ids = [a["id"] for a in accounts.data]
-
-        if not account_ids:
-            return []
+        # The balance and budget triggers changed those collections too
+        data_versions.touch(user_id, "transactions", "accounts", "budgets")
+        live_updates.transactions_changed(self.supabase, user_id, inserted=response.data or [])
+        return response.data[0] if response.data else None
 
-        query = (
-            self.supabase.table("transactions")
-            .select("*")
-            .in_("account_id", account_ids)
-            .order("date", desc=True)
-        )
+    async def list_transactions(self, user_id: str, account_id: int = None, cursor: str = None,
+                                limit: int = None, date_from: str = None, date_to: str = None,
+                                tx_type: str = None, category: str = None,
+                                min_amount: float = None, max_amount: float = None):
+        """Returns one page of transactions, newest first, as {"items": [...], "next_cursor": ...}."""
+        limit = max(1, min(limit or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE))
 
         if account_id:
-            if account_id not in account_ids:
+            if not await account_cache.owns_account(self.supabase, user_id, account_id):
                 raise Exception("Account not found or unauthorized.")
-            query = query.eq("account_id", account_id)
+            account_ids = [account_id]
+        else:
+            # Get all account IDs for this user
+            account_ids = await account_cache.get_account_ids(self.supabase, user_id)
+            if not account_ids:
+                return {"items": [], "next_cursor": None}
+
+        if tx_type:
+            if not self.is_valid_type(tx_type):
+                raise ValueError(f"Invalid type. Must be: {self.TRANSACTION_TYPES}")
+            tx_type = tx_type.lower()
+
+        # A bare date_to includes the whole day
+        date_before = date_until = None
+        if date_to:
+            if "T" in date_to:
+                date_until = date_to
+            else:
+                date_before = self._day_after(date_to)
+
+        # Keyset order: (date, id) is unique, so pages never skip or repeat rows
+        rows = await self.repository.list_transactions(
+            account_ids,
+            limit + 1,
+            tx_type=tx_type,
+            # Matched case-insensitively but literally: "%" or "_" in a category are not wildcards
+            category=self.like_literal(category.strip()) if category else None,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            date_from=date_from,
+            date_before=date_before,
+            date_until=date_until,
+            after=self.decode_cursor(cursor) if cursor else None,
+        )
 
-        response = query.execute()
-        return response.data
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = self.encode_cursor(items[-1]["date"], items[-1]["id"])
+        return {"items": items, "next_cursor": next_cursor}
 
-    def delete_transaction(self, user_id: str, transaction_id: int):
+    async def delete_transaction(self, user_id: str, transaction_id: int):
         # Verify ownership via account
-        tx = (
+        tx = await (
             self.supabase.table("transactions")
             .select("*, accounts!inner(user_id)")
             .eq("id", transaction_id)
@@ -109,7 +182,92 @@ class TransactionService:
             raise Exception("Unauthorized.")
 
         # Delete — trigger handles balance reversal automatically
-        self.supabase.table("transactions").delete().eq("id", transaction_id).execute()
+        await self.supabase.table("transactions").delete().eq("id", transaction_id).execute()
+        data_versions.touch(user_id, "transactions", "accounts", "budgets")
+        live_updates.transactions_changed(self.supabase, user_id, deleted=[tx.data])
         return True
 
+    # endregion
+
+
+    # ==========================================================
+    # region Transfers & Edits
+    # ==========================================================
+
+    async def _live_snapshot(self, user_id: str, transaction_id: int):
+        # The row as it was before an edit, for live updates — only read when someone is listening
+        if not transaction_id or not live_updates.has_subscribers(user_id):
+            return None
+        response = await (
+            self.supabase.table("transactions")
+            .select("*, accounts!inner(user_id)")
+            .eq("id", transaction_id)
+            .execute()
+        )
+        row = response.data[0] if response.data else None
+        return row if row and row["accounts"]["user_id"] == user_id else None
+
+    async def _write_rpc(self, user_id: str, fn: str, params: dict) -> list:
+        # Ownership, balances and rollback are handled inside the SQL function
+        try:
+            response = await self.supabase.rpc(fn, params).execute()
+        except Exception as e:
+            error_msg = getattr(e, "message", None) or str(e)
+            if "Insufficient funds" in error_msg:
+                raise Exception("Insufficient funds for this transaction.")
+            if "must be different" in error_msg:
+                raise ValueError(error_msg)
+            if "not found" in error_msg:
+                raise Exception(error_msg)
+            raise Exception(f"Error saving transaction: {error_msg}")
+        data_versions.touch(user_id, "transactions", "accounts", "budgets")
+        return response.data or []
+
+    async def create_transfer(self, user_id: str, from_account_id: int, to_account_id: int, amount: float,
+                              date: str = None, description: str = None, replace_transaction_id: int = None):
+        """Moves money between two of the user's accounts; returns [outgoing expense, incoming income]."""
+        if from_account_id == to_account_id:
+            raise ValueError("Origin and destination accounts must be different.")
+        data = self.build_transaction(from_account_id, amount, "expense", "Transfer", description, date)
+
+        replaced = await self._live_snapshot(user_id, replace_transaction_id)
+        rows = await self._write_rpc(user_id, "create_transfer", {
+            "p_user_id": user_id,
+            "p_from_account": from_account_id,
+            "p_to_account": to_account_id,
+            "p_amount": data["amount"],
+            "p_date": data["date"],
+            "p_description": description,
+            "p_replace_id": replace_transaction_id,
+        })
+        live_updates.transactions_changed(self.supabase, user_id, inserted=rows, deleted=[replaced] if replaced else [])
+        return rows
+
+    async def update_transaction(self, user_id: str, transaction_id: int, changes: dict):
+        """Changes some fields of a transaction in place; balances follow through the trigger."""
+        changes = {k: v for k, v in changes.items() if k in self.EDITABLE_FIELDS}
+        if not changes:
+            raise ValueError("Nothing to update.")
+        if "type" in changes:
+            if not changes["type"] or not self.is_valid_type(changes["type"]):
+                raise ValueError(f"Invalid type. Must be: {self.TRANSACTION_TYPES}")
+            changes["type"] = changes["type"].lower()
+        if "amount" in changes and (changes["amount"] is None or not self.is_valid_amount(changes["amount"])):
+            raise ValueError("Amount must be greater than zero.")
+        for required in ("account_id", "date"):
+            if required in changes and not changes[required]:
+                raise ValueError(f"{required} cannot be empty.")
+        if "date" in changes and "T" not in changes["date"]:
+            changes["date"] += "T12:00:00"
+
+        old = await self._live_snapshot(user_id, transaction_id)
+        rows = await self._write_rpc(user_id, "update_transaction", {
+            "p_user_id": user_id,
+            "p_transaction_id": transaction_id,
+            "p_changes": changes,
+        })
+        if old and rows:
+            live_updates.transactions_changed(self.supabase, user_id, updated=[(old, rows[0])])
+        return rows[0] if rows else None
+
     # endregion
\ No newline at end of file
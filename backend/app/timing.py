@@ -0,0 +1,123 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.metrics import DEPENDENCY_LATENCY, DEPENDENCY_ERRORS, DEPENDENCY_RETRIES
+
+# Timings of the current request (or forecast job): [(dependency, operation, seconds, outcome)].
+# Tasks and threads started from a request copy its context, so they append to the same list.
+_timings = ContextVar("dependency_timings", default=None)
+
+
+# ==========================================================
+# region Recording
+# ==========================================================
+
+def observe(dependency: str, operation: str, seconds: float, outcome: str = "ok"):
+    """Records one attempt. outcome: "ok", "error" (gave up) or "retried" (failed, tried again)."""
+    DEPENDENCY_LATENCY.labels(dependency, operation).observe(seconds)
+    if outcome == "error":
+        DEPENDENCY_ERRORS.labels(dependency, operation).inc()
+    elif outcome == "retried":
+        DEPENDENCY_RETRIES.labels(dependency, operation).inc()
+    timings = _timings.get()
+    if timings is not None:
+        timings.append((dependency, operation, seconds, outcome))
+
+
+def replay(timings: list):
+    # Timings collected in a worker process, whose metrics registry /metrics never sees
+    for timing in timings:
+        observe(*timing)
+
+
+@contextmanager
+def track(dependency: str, operation: str, ignore: tuple = ()):
+    """Times the block as one call; exceptions count as errors unless they are in `ignore`."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except ignore:
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        observe(dependency, operation, time.perf_counter() - started, outcome)
+
+
+def call_with_retries(dependency: str, operation: str, fn, *args, attempts: int = 3, backoff: float = 0.5):
+    """Calls fn(*args) up to `attempts` times, sleeping backoff, 2×backoff… between failures."""
+    for attempt in range(1, attempts + 1):
+        started = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception:
+            last = attempt == attempts
+            observe(dependency, operation, time.perf_counter() - started, "error" if last else "retried")
+            if last:
+                raise
+            time.sleep(backoff * 2 ** (attempt - 1))
+        else:
+            observe(dependency, operation, time.perf_counter() - started)
+            return result
+
+
+@contextmanager
+def collecting():
+    """Collects the timings recorded inside the block (a request, a forecast job)."""
+    timings = []
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+# endregion Recording
+
+
+# ==========================================================
+# region Server-Timing
+# ==========================================================
+
+def server_timing(timings: list, total: float) -> str:
+    # One entry per (dependency, operation): summed duration, with the call count when > 1
+    grouped = {}
+    for dependency, operation, seconds, _ in list(timings):
+        entry = grouped.setdefault((dependency, operation), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [
+        f'{dependency};desc="{operation}{f" x{count}" if count > 1 else ""}";dur={seconds * 1000:.1f}'
+        for (dependency, operation), (seconds, count) in grouped.items()
+    ]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header with the time each dependency took during the request.
+
+    Plain ASGI (not BaseHTTPMiddleware) so streamed responses pass through untouched; the
+    header covers the work done before the response started.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        with collecting() as timings:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    header = server_timing(timings, time.perf_counter() - started)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
+
+# endregion Server-Timing
@@ -0,0 +1,384 @@
+"""Benchmarks every API endpoint against an in-memory Supabase stand-in.
+
+    cd backend && python -m benchmarks.api [--transactions 100000] [--latency-ms 0] [--repeat 5]
+    cd backend && python -m benchmarks.api --save-baseline    # after an intended change
+    cd backend && python -m benchmarks.api --check            # exits 1 on a regression (CI)
+
+The app runs in-process (ASGI transport, real auth with locally signed tokens) on top of
+benchmarks.fake_supabase, seeded with one user holding `--transactions` transactions plus
+some neighbours. For each endpoint it reports:
+
+    round trips  database calls per request — deterministic, compared exactly in --check
+    app ms       time spent outside the database (wall time minus the time any call was
+                 in flight) — what our code costs; compared with --tolerance in --check
+    wall ms      end-to-end time, including `--latency-ms` per simulated round trip
+
+Timings depend on the machine, so the baseline's app ms only catches large regressions;
+round-trip counts catch N+1 queries and lost batching anywhere.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SUPABASE_URL = "http://supabase.bench"
+JWT_SECRET = "benchmark-only-signing-secret-0123456789"
+CATEGORIES = ["Food", "Rent", "Transport", "Health", "Leisure", "Shopping", "Bills", "Travel"]
+TICKERS = ["BNCH", "BNCHA", "BNCHB"]
+
+
+def configure_environment(workdir: str):
+    # Must run before the app is imported: its singletons read these at import time
+    os.environ.update({
+        "SUPABASE_URL": SUPABASE_URL,
+        "SUPABASE_KEY": "benchmark",
+        "SUPABASE_JWT_SECRET": JWT_SECRET,
+        "AUTH_SESSION_RECHECK": "0",
+        "MARKET_DATA_FIXTURES": os.path.join(workdir, "fixtures"),
+        "MARKET_DATA_DIR": os.path.join(workdir, "market-data"),
+        "FORECAST_CACHE_DIR": os.path.join(workdir, "forecasts"),
+        "FORECAST_PREWARM": "0",
+    })
+
+
+def sign_token(user_id: str, email: str) -> str:
+    import jwt
+    now = int(time.time())
+    return jwt.encode({
+        "sub": user_id, "email": email, "aud": "authenticated", "iss": f"{SUPABASE_URL}/auth/v1",
+        "iat": now, "exp": now + 3600,
+    }, JWT_SECRET, algorithm="HS256")
+
+
+# ==========================================================
+# region Fixtures
+# ==========================================================
+
+def write_market_fixtures(directory: str):
+    import numpy as np
+    import pandas as pd
+    os.makedirs(directory, exist_ok=True)
+    days = pd.bdate_range(end=pd.Timestamp.today().normalize() - pd.Timedelta(days=1), periods=1200)
+    rng = np.random.default_rng(7)
+    for i, ticker in enumerate(TICKERS):
+        closes = 100 + i * 20 + np.cumsum(rng.normal(0.05, 1.0, len(days)))
+        pd.DataFrame({"date": days.strftime("%Y-%m-%d"), "close": closes.round(4)}).to_csv(
+            os.path.join(directory, f"{ticker}.csv"), index=False)
+        with open(os.path.join(directory, f"{ticker}.json"), "w") as f:
+            json.dump({"longName": f"Benchmark {ticker}", "currency": "USD", "regularMarketPrice": float(closes[-1])}, f)
+
+
+def seed_user(db, user_id: str, transactions: int, rng: random.Random, accounts: int = 3):
+    today = date.today()
+    ids = db.seed("accounts", [
+        {"user_id": user_id, "name": f"Account {n}", "type": "current",
+         "balance": 10_000_000.0, "created_at": "2023-01-01T00:00:00"}
+        for n in range(accounts)
+    ])
+
+    span = 3 * 365
+    db.seed("transactions", [
+        {
+            "account_id": rng.choice(ids),
+            "amount": round(rng.uniform(2, 300), 2),
+            "type": "income" if rng.random() < 0.15 else "expense",
+            "category": rng.choice(CATEGORIES),
+            "description": None,
+            "date": f"{(today - timedelta(days=rng.randrange(span))).isoformat()}T12:00:00",
+        }
+        for _ in range(transactions)
+    ])
+
+    budgets = []
+    for months_back in range(12):
+        year, month = divmod(today.year * 12 + today.month - 1 - months_back, 12)
+        for category in CATEGORIES[:5]:
+            budgets.append({"user_id": user_id, "category": category, "limit_amount": 500.0,
+                            "month": month + 1, "year": year})
+    db.seed("budgets", budgets)
+    db.seed("goals", [
+        {"user_id": user_id, "name": f"Goal {n}", "target_amount": 1000.0 * (n + 1), "current_amount": 100.0 * n,
+         "deadline": (today + timedelta(days=90 * (n + 1))).isoformat()}
+        for n in range(5)
+    ])
+    return ids
+
+# endregion Fixtures
+
+
+# ==========================================================
+# region Scenarios
+# ==========================================================
+
+def build_scenarios(db, ctx: dict) -> list:
+    """(name, setup, request): setup(client) runs untimed and returns the kwargs for request."""
+    user_id, accounts = ctx["user_id"], ctx["accounts"]
+    today = date.today()
+    month_start = today.replace(day=1).isoformat()
+    counter = iter(range(10**9))
+
+    def seeded(table, row):
+        def setup(client):
+            return {"row_id": db.seed(table, [row])[0]}
+        return setup
+
+    def numbered(client):
+        return {"n": next(counter)}
+
+    goal = {"user_id": user_id, "name": "Tmp", "target_amount": 1000.0, "current_amount": 0.0, "deadline": None}
+
+    def goal_batch(client):
+        return {"deposits": [{"goal_id": goal_id, "amount": 25} for goal_id in db.seed("goals", [goal] * 5)]}
+
+    import_csv = "date,amount,category,description\n" + "".join(
+        f"{today - timedelta(days=i % 60)},-{1 + i % 50}.5,{CATEGORIES[i % len(CATEGORIES)]},import {i}\n"
+        for i in range(1000)
+    )
+
+    export_window = {"date_from": (today - timedelta(days=180)).isoformat(),
+                     "date_to": (today - timedelta(days=91)).isoformat()}
+
+    async def etag_of_accounts(client):
+        response = await client.get("/accounts/")
+        return {"etag": response.headers["etag"]}
+
+    async def sync_cursor(client, write=False):
+        page, params = {"has_more": True}, {}
+        while page["has_more"]:
+            page = (await client.get("/sync/", params=params)).json()
+            params = {"since": page["cursor"]}
+        if write:
+            await client.post("/transactions/", json={
+                "account_id": accounts[0], "amount": 3.5, "type": "expense", "category": "Food"})
+        return params
+
+    def forecast_cold(client):
+        from app.services.forecast_cache import forecast_cache
+        forecast_cache.clear()
+        return {}
+
+    async def run_job(client):
+        job = (await client.post("/predict/jobs", json={"ticker": TICKERS[0], "model": "fast"})).json()
+        return await client.get(f"/predict/jobs/{job['job_id']}", params={"wait": 30})
+
+    return [
+        # Auth
+        ("POST /auth/register", numbered, lambda c, n: c.post("/auth/register", json={
+            "username": f"bench{n}", "email": f"bench{n}@example.com", "password": "Bench#1234"})),
+        ("POST /auth/login", None, lambda c: c.post("/auth/login", json={"identifier": "bench0", "password": "Bench#1234"})),
+
+        # Accounts
+        ("GET /accounts", None, lambda c: c.get("/accounts/")),
+        ("GET /accounts (304)", etag_of_accounts,
+         lambda c, etag: c.get("/accounts/", headers={"If-None-Match": etag})),
+        ("GET /accounts/{id}", None, lambda c: c.get(f"/accounts/{accounts[0]}")),
+        ("POST /accounts", None, lambda c: c.post("/accounts/", json={"name": "Bench", "type": "saving", "balance": 10})),
+        ("PATCH /accounts/{id}", None, lambda c: c.patch(f"/accounts/{accounts[1]}", json={"name": "Renamed"})),
+        ("DELETE /accounts/{id}", seeded("accounts", {"user_id": user_id, "name": "Tmp", "type": "saving", "balance": 0.0}),
+         lambda c, row_id: c.delete(f"/accounts/{row_id}")),
+
+        # Transactions
+        ("GET /transactions (page)", None, lambda c: c.get("/transactions/")),
+        ("GET /transactions (filtered)", None, lambda c: c.get("/transactions/", params={
+            "account_id": accounts[0], "type": "expense", "category": "food", "date_from": month_start, "limit": 200})),
+        ("POST /transactions", None, lambda c: c.post("/transactions/", json={
+            "account_id": accounts[0], "amount": 12.5, "type": "expense", "category": "Food"})),
+        ("DELETE /transactions/{id}", seeded("transactions", {
+            "account_id": accounts[0], "amount": 1.0, "type": "expense", "category": "Food",
+            "description": None, "date": f"{today}T12:00:00"}),
+         lambda c, row_id: c.delete(f"/transactions/{row_id}")),
+        ("PATCH /transactions/{id}", seeded("transactions", {
+            "account_id": accounts[0], "amount": 1.0, "type": "expense", "category": "Food",
+            "description": None, "date": f"{today}T12:00:00"}),
+         lambda c, row_id: c.patch(f"/transactions/{row_id}", json={"account_id": accounts[1], "amount": 2.5, "category": "Rent"})),
+        ("POST /transactions/transfer", None, lambda c: c.post("/transactions/transfer", json={
+            "from_account_id": accounts[0], "to_account_id": accounts[1], "amount": 10})),
+        ("POST /transactions/import (1k csv)", None, lambda c: c.post(
+            "/transactions/import", params={"account_id": accounts[2]}, content=import_csv.encode())),
+
+        # Budgets
+        ("GET /budgets", None, lambda c: c.get("/budgets/")),
+        ("GET /budgets/history (12m)", None, lambda c: c.get("/budgets/history", params={
+            "month_from": f"{today.year - 1:04d}-{today.month:02d}", "month_to": f"{today.year:04d}-{today.month:02d}"})),
+        ("POST /budgets", numbered, lambda c, n: c.post("/budgets/", json={"category": f"Bench {n}", "limit_amount": 100})),
+        ("PATCH /budgets/{id}", None, lambda c: c.patch(f"/budgets/{ctx['budget_id']}", json={"limit_amount": 650})),
+        ("DELETE /budgets/{id}", seeded("budgets", {"user_id": user_id, "category": "Tmp", "limit_amount": 1.0,
+                                                     "month": today.month, "year": today.year}),
+         lambda c, row_id: c.delete(f"/budgets/{row_id}")),
+        ("POST /budgets/reconcile", None, lambda c: c.post("/budgets/reconcile")),
+
+        # Goals
+        ("GET /goals", None, lambda c: c.get("/goals/")),
+        ("POST /goals", None, lambda c: c.post("/goals/", json={"name": "Bench", "target_amount": 500})),
+        ("PATCH /goals/{id}", seeded("goals", goal),
+         lambda c, row_id: c.patch(f"/goals/{row_id}", json={"name": "Renamed", "target_amount": 900})),
+        ("POST /goals/{id}/add-funds", seeded("goals", goal),
+         lambda c, row_id: c.post(f"/goals/{row_id}/add-funds", json={"amount": 25})),
+        ("POST /goals/add-funds (5 goals)", goal_batch,
+         lambda c, deposits: c.post("/goals/add-funds", json={"deposits": deposits})),
+        ("DELETE /goals/{id}", seeded("goals", goal), lambda c, row_id: c.delete(f"/goals/{row_id}")),
+
+        # Reports, exports, dashboard
+        ("GET /reports (6 months)", None, lambda c: c.get("/reports/")),
+        ("GET /reports (daily, 1 year)", None, lambda c: c.get("/reports/", params={
+            "granularity": "day", "date_from": (today - timedelta(days=365)).isoformat()})),
+        # Windows end before anything the write scenarios add, so page counts stay fixed
+        ("GET /export/transactions.csv (90d)", None, lambda c: c.get("/export/transactions.csv", params=export_window)),
+        ("GET /export/backup.json (90d, gzip)", None, lambda c: c.get("/export/backup.json", params={**export_window, "gzip": True})),
+        ("GET /dashboard", None, lambda c: c.get("/dashboard/")),
+        ("GET /sync (up to date)", sync_cursor, lambda c, since: c.get("/sync/", params={"since": since})),
+        ("GET /sync (after a write)", lambda c: sync_cursor(c, write=True),
+         lambda c, since: c.get("/sync/", params={"since": since})),
+
+        # Forecasts (fast engine; fixture market data)
+        ("GET /predict/search", None, lambda c: c.get("/predict/search", params={"q": TICKERS[0]})),
+        ("GET /predict/forecast (cold)", forecast_cold, lambda c: c.get("/predict/forecast", params={"ticker": TICKERS[0], "model": "fast"})),
+        ("GET /predict/forecast (cached)", None, lambda c: c.get("/predict/forecast", params={"ticker": TICKERS[0], "model": "fast"})),
+        ("POST /predict/forecast/batch", forecast_cold, lambda c: c.post("/predict/forecast/batch", json={"tickers": TICKERS, "model": "fast"})),
+        ("POST /predict/jobs + long-poll", forecast_cold, lambda c: run_job(c)),
+    ]
+
+# endregion Scenarios
+
+
+# ==========================================================
+# region Measurement
+# ==========================================================
+
+def busy_time(calls: list, start: float, end: float) -> float:
+    """Length of the union of the database-call intervals within [start, end]."""
+    total, reach = 0.0, start
+    for _, begin, finish in sorted(calls, key=lambda c: c[1]):
+        begin, finish = max(begin, reach), min(finish, end)
+        if finish > begin:
+            total += finish - begin
+            reach = finish
+    return total
+
+
+async def measure(client, db, scenarios: list, repeat: int, only: str = None) -> dict:
+    results = {}
+    for name, setup, request in scenarios:
+        if only and only.lower() not in name.lower():
+            continue
+        walls, apps, trips = [], [], []
+        for _ in range(repeat):
+            kwargs = setup(client) if setup else {}
+            if asyncio.iscoroutine(kwargs):
+                kwargs = await kwargs
+            db.reset_calls()
+            started = time.perf_counter()
+            response = await request(client, **kwargs)
+            finished = time.perf_counter()
+            if response.status_code >= 400:
+                raise RuntimeError(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+            walls.append((finished - started) * 1000)
+            apps.append((finished - started - busy_time(db.calls, started, finished)) * 1000)
+            trips.append(len(db.calls))
+        results[name] = {
+            "round_trips": int(statistics.median(trips)),
+            "app_ms": round(statistics.median(apps), 2),
+            "wall_ms": round(statistics.median(walls), 2),
+        }
+        r = results[name]
+        print(f"{name:<40} {r['round_trips']:>6} {r['app_ms']:>10.2f} {r['wall_ms']:>10.2f}", flush=True)
+    return results
+
+
+def check_against(baseline: dict, results: dict, tolerance: float, slack_ms: float) -> list:
+    failures = []
+    for name, base in baseline.get("results", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current["round_trips"] > base["round_trips"]:
+            failures.append(f"{name}: {current['round_trips']} round trips (baseline {base['round_trips']})")
+        if current["app_ms"] > base["app_ms"] * tolerance + slack_ms:
+            failures.append(f"{name}: {current['app_ms']:.2f} app ms (baseline {base['app_ms']:.2f}, tolerance x{tolerance})")
+    return failures
+
+# endregion Measurement
+
+
+async def main(args) -> int:
+    workdir = tempfile.mkdtemp(prefix="fincontrol-bench-")
+    configure_environment(workdir)
+    write_market_fixtures(os.environ["MARKET_DATA_FIXTURES"])
+
+    import httpx
+    from benchmarks.fake_supabase import FakeSupabase
+    from app.main import app
+    from app.database import supabase
+    from app.services.forecast_jobs import forecast_jobs
+
+    db = FakeSupabase(latency=args.latency_ms / 1000, token_factory=sign_token)
+    supabase.client = db   # what Database.connect() would have set
+
+    print(f"seeding {args.transactions} transactions ...", flush=True)
+    rng = random.Random(1234)
+    user_id = "00000000-0000-4000-8000-000000000001"
+    accounts = seed_user(db, user_id, args.transactions, rng)
+    for n in range(args.neighbours):
+        seed_user(db, f"00000000-0000-4000-8000-{n + 2:012d}", args.neighbour_transactions, rng, accounts=1)
+    budget_id = next(b["id"] for b in db.tables["budgets"].values() if b["user_id"] == user_id)
+    ctx = {"user_id": user_id, "accounts": accounts, "budget_id": budget_id}
+
+    forecast_jobs.start()
+    headers = {"Authorization": f"Bearer {sign_token(user_id, 'bench@example.com')}"}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://api.bench", headers=headers, timeout=120) as client:
+            # Warm-up: first-request costs (imports, token verification, caches) are not what we compare
+            await client.get("/accounts/")
+            print(f"\n{'endpoint':<40} {'trips':>6} {'app ms':>10} {'wall ms':>10}")
+            results = await measure(client, db, build_scenarios(db, ctx), args.repeat, args.only)
+    finally:
+        forecast_jobs.shutdown()
+
+    config = {"transactions": args.transactions, "neighbours": args.neighbours,
+              "neighbour_transactions": args.neighbour_transactions, "latency_ms": args.latency_ms}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": config, "results": results}, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"recorded_at": datetime.utcnow().isoformat() + "Z", "config": config, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"\nbaseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print(f"\nwarning: baseline was recorded with {baseline.get('config')}, this run used {config}")
+        failures = check_against(baseline, results, args.tolerance, args.slack_ms)
+        if failures:
+            print("\nregressions:\n  " + "\n  ".join(failures))
+            return 1
+        print("\nno regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=100_000, help="transactions of the benchmarked user")
+    parser.add_argument("--neighbours", type=int, default=50, help="other users sharing the tables")
+    parser.add_argument("--neighbour-transactions", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated latency per database round trip")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="run only endpoints whose name contains this text")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if slower or chattier than the baseline")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed app ms ratio over the baseline")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="absolute app ms allowance on top of the ratio")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,664 @@
+"""In-memory stand-in for the Supabase client, for benchmarks that need no live project.
+
+Implements the slice of supabase-py the services use — table().select/insert/update/delete
+with eq/in_/gte/lte/lt/ilike/or_/order/limit/single, rpc() for the SQL functions in
+supabase/migrations, and auth sign-up/sign-in/get_user — plus the database triggers the
+services rely on (account balances, category_spend counters).
+
+Every execute() is one simulated round trip: it sleeps `latency` seconds and is recorded
+in `calls`, so benchmarks can report both round-trip counts and time spent "in the database".
+"""
+import asyncio
+import heapq
+import itertools
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from postgrest.exceptions import APIError as PostgrestAPIError
+
+
+class APIError(PostgrestAPIError):
+    """Raised where PostgREST would answer with an error; code is the SQLSTATE (P0001: raise exception)."""
+
+    def __init__(self, message: str, code: str = "P0001"):
+        super().__init__({"message": message, "code": code})
+
+
+# ==========================================================
+# region Filters
+# ==========================================================
+
+_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _coerce(raw: str, like):
+    # PostgREST filter values arrive as text; compare them as the column's type
+    if isinstance(like, bool):
+        return raw == "true"
+    if isinstance(like, int):
+        return int(raw)
+    if isinstance(like, float):
+        return float(raw)
+    return raw
+
+
+def _split_top_level(expr: str) -> list:
+    parts, depth, current = [], 0, ""
+    for ch in expr:
+        depth += ch == "("
+        depth -= ch == ")"
+        if ch == "," and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    parts.append(current)
+    return parts
+
+
+def _parse_logic(expr: str):
+    """Parses the or_() mini-language: `col.op.value`, `and(...)`, `or(...)`."""
+    if expr.startswith("and(") or expr.startswith("or("):
+        combine = all if expr.startswith("and(") else any
+        inner = [_parse_logic(p) for p in _split_top_level(expr[expr.index("(") + 1:-1])]
+        return lambda row: combine(f(row) for f in inner)
+    column, op, raw = expr.split(".", 2)
+    raw = raw.strip('"')
+    compare = _OPS[op]
+
+    def check(row):
+        value = row.get(column)
+        return value is not None and compare(value, _coerce(raw, value))
+    return check
+
+# endregion Filters
+
+
+# ==========================================================
+# region Query Builder
+# ==========================================================
+
+class Query:
+
+    INDEXED = ("id", "account_id", "user_id")
+
+    def __init__(self, db, table: str):
+        self.db = db
+        self.table = table
+        self.op = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self.lookups = []   # (column, values, filter) equalities the table indexes can answer
+        self.orders = []
+        self._limit = None
+        self._single = False
+
+    def select(self, columns: str = "*", count=None):
+        self.op, self.columns = "select", columns
+        return self
+
+    def insert(self, data):
+        self.op, self.payload = "insert", data
+        return self
+
+    def update(self, data: dict):
+        self.op, self.payload = "update", data
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def _filter(self, check):
+        self.filters.append(check)
+        return self
+
+    def eq(self, column: str, value):
+        check = lambda r: r.get(column) == value
+        if column in self.INDEXED:
+            self.lookups.append((column, {value}, check))
+        return self._filter(check)
+
+    def neq(self, column: str, value):
+        return self._filter(lambda r: r.get(column) != value)
+
+    def in_(self, column: str, values):
+        values = set(values)
+        check = lambda r: r.get(column) in values
+        if column in self.INDEXED:
+            self.lookups.append((column, values, check))
+        return self._filter(check)
+
+    def gt(self, column: str, value):
+        return self._filter(lambda r: r.get(column) is not None and r[column] > value)
+
+    def gte(self, column: str, value):
+        return self._filter(lambda r: r.get(column) is not None and r[column] >= value)
+
+    def lt(self, column: str, value):
+        return self._filter(lambda r: r.get(column) is not None and r[column] < value)
+
+    def lte(self, column: str, value):
+        return self._filter(lambda r: r.get(column) is not None and r[column] <= value)
+
+    def ilike(self, column: str, pattern: str):
+        # "%" and "_" are wildcards unless escaped with a backslash, as in Postgres
+        parts = []
+        for escaped, char in re.findall(r"(\\)?(.)", pattern, re.DOTALL):
+            parts.append(re.escape(char) if escaped else {"%": ".*", "_": "."}.get(char, re.escape(char)))
+        regex = re.compile("^" + "".join(parts) + "$", re.IGNORECASE | re.DOTALL)
+        return self._filter(lambda r: r.get(column) is not None and regex.match(str(r[column])) is not None)
+
+    def or_(self, expr: str):
+        checks = [_parse_logic(p) for p in _split_top_level(expr)]
+        return self._filter(lambda r: any(c(r) for c in checks))
+
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = None):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, n: int):
+        self._limit = n
+        return self
+
+    def single(self):
+        self._single = True
+        return self
+
+    async def execute(self):
+        return await self.db.round_trip(f"{self.table}.{self.op}", self._run)
+
+    # ── evaluation ──
+
+    def _matches(self) -> list:
+        rows = self.db.tables.setdefault(self.table, {})
+        if not self.lookups:
+            candidates, filters = rows.values(), self.filters
+        else:
+            # Narrow with the most selective indexed equality, then apply the other filters
+            column, values, check = min(self.lookups, key=lambda lookup: len(lookup[1]))
+            if column == "id":
+                candidates = [rows[v] for v in values if v in rows]
+            else:
+                index = self.db.index(self.table, column)
+                candidates = [rows[i] for v in values for i in index.get(v, ())]
+            filters = [f for f in self.filters if f is not check]
+        if not filters:
+            return list(candidates)
+        return [r for r in candidates if all(f(r) for f in filters)]
+
+    def _ordered(self, matches: list) -> list:
+        directions = {desc for _, desc in self.orders}
+        if self._limit is not None and len(directions) == 1:
+            # Keyset pages over big tables: a bounded heap instead of sorting everything
+            pick = heapq.nlargest if directions.pop() else heapq.nsmallest
+            try:
+                return pick(self._limit, matches, key=lambda r: tuple(r[c] for c, _ in self.orders))
+            except (TypeError, KeyError):
+                pass  # NULLs in an ordered column: fall back to the full sort
+        for column, desc in reversed(self.orders):
+            present = [r for r in matches if r.get(column) is not None]
+            missing = [r for r in matches if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=desc)
+            matches = present + missing  # NULLs last
+        return matches
+
+    def _project(self, row: dict) -> dict:
+        if self.columns.strip() == "*":
+            return dict(row)
+        out = {}
+        for part in _split_top_level(self.columns):
+            part = part.strip()
+            embed = re.match(r"(\w+)(!inner)?\((.*)\)$", part)
+            if embed:
+                # accounts!inner(user_id) → the account referenced by account_id
+                name, _, cols = embed.groups()
+                parent = self.db.tables.get(name, {}).get(row.get(name.rstrip("s") + "_id"))
+                out[name] = {c.strip(): parent.get(c.strip()) for c in cols.split(",")} if parent else None
+            elif part == "*":
+                out.update(row)
+            else:
+                out[part] = row.get(part)
+        return out
+
+    def _run(self):
+        if self.op == "insert":
+            data = self.payload if isinstance(self.payload, list) else [self.payload]
+            return self.db.insert_rows(self.table, data)
+
+        matches = self._matches()
+        if self.op == "update":
+            return [self.db.update_row(self.table, r, self.payload) for r in matches]
+        if self.op == "delete":
+            return [self.db.delete_row(self.table, r) for r in matches]
+
+        matches = self._ordered(matches)
+        if self._limit is not None:
+            matches = matches[:self._limit]
+
+        out = [self._project(r) for r in matches]
+        if self._single:
+            if len(out) != 1:
+                raise APIError("JSON object requested, multiple (or no) rows returned", code="PGRST116")
+            return out[0]
+        return out
+
+
+class RpcCall:
+
+    def __init__(self, db, fn: str, params: dict):
+        self.db = db
+        self.fn = fn
+        self.params = params or {}
+
+    async def execute(self):
+        handler = getattr(self.db, f"rpc_{self.fn}", None)
+        if handler is None:
+            raise APIError(f"Could not find the function public.{self.fn}", code="PGRST202")
+        return await self.db.round_trip(f"rpc.{self.fn}", lambda: handler(**self.params))
+
+# endregion Query Builder
+
+
+# ==========================================================
+# region Auth
+# ==========================================================
+
+class FakeAuth:
+
+    def __init__(self, db):
+        self.db = db
+        self.users = {}      # email -> (user, password)
+        self.tokens = {}     # access token -> user
+
+    async def sign_up(self, credentials: dict):
+        async def run():
+            user = SimpleNamespace(id=str(uuid.uuid4()), email=credentials["email"])
+            self.users[credentials["email"]] = (user, credentials["password"])
+            return SimpleNamespace(user=user, session=None)
+        return await self.db.round_trip("auth.sign_up", run)
+
+    async def sign_in_with_password(self, credentials: dict):
+        def run():
+            user, password = self.users.get(credentials["email"], (None, None))
+            if user is None or password != credentials["password"]:
+                raise APIError("Invalid login credentials")
+            token = self.db.token_factory(user.id, user.email) if self.db.token_factory else uuid.uuid4().hex
+            self.tokens[token] = user
+            return SimpleNamespace(user=user, session=SimpleNamespace(access_token=token))
+        return await self.db.round_trip("auth.sign_in", run)
+
+    async def get_user(self, token: str):
+        return await self.db.round_trip("auth.get_user", lambda: SimpleNamespace(user=self.tokens.get(token)))
+
+# endregion Auth
+
+
+class FakeSupabase:
+    """Tables are dicts of id -> row, with lazily built secondary indexes."""
+
+    def __init__(self, latency: float = 0.0, token_factory=None):
+        self.latency = latency
+        self.token_factory = token_factory
+        self.tables = {name: {} for name in ("profiles", "accounts", "transactions", "budgets", "goals", "category_spend")}
+        self.auth = FakeAuth(self)
+        self.http = None
+        self.calls = []     # (operation, started, finished) per round trip
+        self._ids = itertools.count(1)
+        self._indexes = {}
+        self.change_log = []   # the change_log triggers: {id, user_id, collection, row_id, op}
+
+    # ==========================================================
+    # region Client Surface
+    # ==========================================================
+
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    def rpc(self, fn: str, params: dict = None) -> RpcCall:
+        return RpcCall(self, fn, params)
+
+    async def round_trip(self, operation: str, run):
+        started = time.perf_counter()
+        try:
+            result = run()
+            if asyncio.iscoroutine(result):
+                result = await result
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return result if operation.startswith("auth.") else SimpleNamespace(data=result)
+        finally:
+            self.calls.append((operation, started, time.perf_counter()))
+
+    # endregion Client Surface
+
+
+    # ==========================================================
+    # region Storage
+    # ==========================================================
+
+    def index(self, table: str, column: str) -> dict:
+        key = (table, column)
+        if key not in self._indexes:
+            index = {}
+            for row in self.tables[table].values():
+                index.setdefault(row.get(column), []).append(row["id"])
+            self._indexes[key] = index
+        return self._indexes[key]
+
+    def _index_add(self, table: str, row: dict):
+        for (t, column), index in self._indexes.items():
+            if t == table:
+                index.setdefault(row.get(column), []).append(row["id"])
+
+    def _index_remove(self, table: str, row: dict):
+        for (t, column), index in self._indexes.items():
+            if t == table:
+                ids = index.get(row.get(column))
+                if ids and row["id"] in ids:
+                    ids.remove(row["id"])
+
+    def insert_rows(self, table: str, rows: list) -> list:
+        # One statement: if any row fails its trigger, nothing is kept
+        applied = []
+        try:
+            for data in rows:
+                row = dict(data)
+                row.setdefault("id", next(self._ids))
+                if table == "transactions":
+                    self._apply_transaction(row, +1)
+                self.tables[table][row["id"]] = row
+                self._index_add(table, row)
+                self._log_change(table, row, "insert")
+                applied.append(row)
+        except APIError:
+            for row in applied:
+                self.delete_row(table, row)
+            raise
+        return [dict(r) for r in applied]
+
+    def update_row(self, table: str, row: dict, changes: dict) -> dict:
+        if table == "transactions":
+            self._apply_transaction(row, -1)
+            try:
+                self._apply_transaction({**row, **changes}, +1)
+            except APIError:
+                self._apply_transaction(row, +1)
+                raise
+        self._index_remove(table, row)
+        accounts = {row.get("account_id"), changes.get("account_id", row.get("account_id"))}
+        row.update(changes)
+        self._index_add(table, row)
+        self._log_change(table, row, "update", accounts)
+        return dict(row)
+
+    def delete_row(self, table: str, row: dict) -> dict:
+        if table == "transactions":
+            self._apply_transaction(row, -1, check_funds=False)
+        if table == "accounts":
+            # log_account_cascade: its transactions are logged before the account goes
+            for i in self.index("transactions", "account_id").get(row["id"], ()):
+                self._log_change("transactions", self.tables["transactions"][i], "delete", accounts=set())
+        self._log_change(table, row, "delete")
+        self.tables[table].pop(row["id"], None)
+        self._index_remove(table, row)
+        if table == "accounts":
+            # on delete cascade: the balance trigger has no account left to update, and the
+            # account's category_spend counters go with it
+            for tx in [self.tables["transactions"][i] for i in list(self.index("transactions", "account_id").get(row["id"], ()))]:
+                self.tables["transactions"].pop(tx["id"], None)
+                self._index_remove("transactions", tx)
+            spend = self.tables["category_spend"]
+            for key in [key for key, counter in spend.items() if counter["account_id"] == row["id"]]:
+                del spend[key]
+        return dict(row)
+
+    def _log_change(self, table: str, row: dict, op: str, accounts: set = None):
+        if table not in ("accounts", "transactions", "budgets", "goals"):
+            return
+        if table == "transactions":
+            account = self.tables["accounts"].get(row["account_id"])
+            if account is None:
+                return
+            user_id = account["user_id"]
+        else:
+            user_id = row["user_id"]
+        entries = [(table, row["id"], op)]
+        if table == "transactions":
+            # The balance trigger updated the account(s) as well
+            entries += [("accounts", a, "update") for a in sorted({row["account_id"]} if accounts is None else accounts) if a in self.tables["accounts"]]
+        for collection, row_id, entry_op in entries:
+            self.change_log.append({"id": len(self.change_log) + 1, "user_id": user_id,
+                                    "collection": collection, "row_id": row_id, "op": entry_op})
+
+    # endregion Storage
+
+
+    # ==========================================================
+    # region Triggers
+    # ==========================================================
+
+    @staticmethod
+    def _month_key(tx: dict):
+        day = datetime.fromisoformat(str(tx["date"]))
+        return day.year, day.month, (tx.get("category") or "").strip().lower()
+
+    def _apply_transaction(self, tx: dict, sign: int, check_funds: bool = True):
+        """Balance trigger + category_spend trigger, applied (+1) or reverted (-1)."""
+        account = self.tables["accounts"].get(tx["account_id"])
+        if account is None:
+            raise APIError('insert or update on table "transactions" violates foreign key constraint', code="23503")
+        delta = sign * (float(tx["amount"]) if tx["type"] == "income" else -float(tx["amount"]))
+        if check_funds and float(account["balance"]) + delta < 0:
+            raise APIError("Insufficient funds")
+        account["balance"] = round(float(account["balance"]) + delta, 2)
+
+        if tx["type"] == "expense":
+            year, month, category = self._month_key(tx)
+            key = (tx["account_id"], year, month, category)
+            counter = self.tables["category_spend"].setdefault(key, {
+                "id": key, "account_id": tx["account_id"], "year": year, "month": month,
+                "category": category, "spent": 0.0,
+            })
+            counter["spent"] += sign * float(tx["amount"])
+
+    # endregion Triggers
+
+
+    # ==========================================================
+    # region SQL Functions
+    # ==========================================================
+
+    def _user_account_ids(self, user_id: str) -> set:
+        return {self.tables["accounts"][i]["id"] for i in self.index("accounts", "user_id").get(user_id, ())}
+
+    def _user_spend(self, user_id: str):
+        accounts = self._user_account_ids(user_id)
+        return [c for c in self.tables["category_spend"].values() if c["account_id"] in accounts]
+
+    @staticmethod
+    def _trunc(day: datetime, granularity: str) -> date:
+        d = day.date()
+        if granularity == "week":
+            return d - timedelta(days=d.weekday())
+        if granularity == "month":
+            return d.replace(day=1)
+        if granularity == "year":
+            return d.replace(month=1, day=1)
+        return d
+
+    def rpc_report_aggregates(self, p_user_id, p_from, p_to, p_granularity, p_account_id=None):
+        accounts = {p_account_id} if p_account_id else self._user_account_ids(p_user_id)
+        index = self.index("transactions", "account_id")
+        groups = {}
+        for account_id in accounts:
+            for tx_id in index.get(account_id, ()):
+                tx = self.tables["transactions"][tx_id]
+                if not (p_from <= tx["date"] < p_to):
+                    continue
+                key = (self._trunc(datetime.fromisoformat(tx["date"]), p_granularity), tx["type"],
+                       (tx["category"] or "").strip().lower())
+                total, count = groups.get(key, (0.0, 0))
+                groups[key] = (total + float(tx["amount"]), count + 1)
+        return [
+            {"period": period.isoformat(), "type": tx_type, "category": category, "total": total, "tx_count": count}
+            for (period, tx_type, category), (total, count) in groups.items()
+        ]
+
+    def rpc_budgets_with_spent(self, p_user_id, p_year, p_month):
+        spent = {}
+        for c in self._user_spend(p_user_id):
+            if c["year"] == p_year and c["month"] == p_month:
+                spent[c["category"]] = spent.get(c["category"], 0.0) + c["spent"]
+        budgets = [
+            self.tables["budgets"][i] for i in self.index("budgets", "user_id").get(p_user_id, ())
+            if self.tables["budgets"][i]["year"] == p_year and self.tables["budgets"][i]["month"] == p_month
+        ]
+        return [
+            {**b, "spent": spent.get(b["category"].strip().lower(), 0.0)}
+            for b in sorted(budgets, key=lambda b: b["category"])
+        ]
+
+    def rpc_budget_history(self, p_user_id, p_from_month, p_to_month):
+        rows = {}
+        for c in self._user_spend(p_user_id):
+            if p_from_month <= c["year"] * 12 + c["month"] <= p_to_month:
+                row = rows.setdefault((c["year"], c["month"], c["category"]), [c["category"], None, 0.0])
+                row[2] += c["spent"]
+        for i in self.index("budgets", "user_id").get(p_user_id, ()):
+            b = self.tables["budgets"][i]
+            if p_from_month <= b["year"] * 12 + b["month"] <= p_to_month:
+                row = rows.setdefault((b["year"], b["month"], b["category"].strip().lower()), [None, None, 0.0])
+                row[0] = b["category"].strip()
+                row[1] = (row[1] or 0.0) + float(b["limit_amount"])
+        return [
+            {"year": y, "month": m, "category": label, "limit_amount": limit, "spent": spent}
+            for (y, m, _), (label, limit, spent) in sorted(rows.items())
+            if spent or limit is not None
+        ]
+
+    def rpc_rebuild_category_spend(self, p_user_id=None):
+        accounts = self._user_account_ids(p_user_id) if p_user_id else set(self.tables["accounts"])
+        spend = self.tables["category_spend"]
+        for key in [k for k, c in spend.items() if c["account_id"] in accounts]:
+            del spend[key]
+        index = self.index("transactions", "account_id")
+        for account_id in accounts:
+            for tx_id in index.get(account_id, ()):
+                tx = self.tables["transactions"][tx_id]
+                if tx["type"] == "expense":
+                    year, month, category = self._month_key(tx)
+                    key = (account_id, year, month, category)
+                    counter = spend.setdefault(key, {
+                        "id": key, "account_id": account_id, "year": year, "month": month,
+                        "category": category, "spent": 0.0,
+                    })
+                    counter["spent"] += float(tx["amount"])
+        return None
+
+    def rpc_fund_goals(self, p_user_id, p_deposits):
+        amounts = {}
+        for d in p_deposits:
+            amounts[d["goal_id"]] = amounts.get(d["goal_id"], 0.0) + d["amount"]
+        goals = self.tables["goals"]
+        # Check every deposit before writing any: the SQL function is all-or-nothing
+        for goal_id, amount in sorted(amounts.items()):
+            goal = goals.get(goal_id)
+            if amount <= 0:
+                raise APIError("Amount must be greater than zero.")
+            if goal is None or goal["user_id"] != p_user_id:
+                raise APIError(f"Goal {goal_id} not found or unauthorized.")
+            room = float(goal["target_amount"]) - float(goal["current_amount"])
+            if amount > room:
+                raise APIError(f"Amount exceeds target of goal {goal_id}. Max you can add: €{max(room, 0):.2f}")
+        for goal_id, amount in amounts.items():
+            goals[goal_id]["current_amount"] = float(goals[goal_id]["current_amount"]) + amount
+        return [dict(goals[goal_id]) for goal_id in sorted(amounts)]
+
+    def _owned_transaction(self, user_id: str, transaction_id: int) -> dict:
+        tx = self.tables["transactions"].get(transaction_id)
+        account = self.tables["accounts"].get(tx["account_id"]) if tx else None
+        if account is None or account["user_id"] != user_id:
+            raise APIError("Transaction not found.")
+        return tx
+
+    def rpc_create_transfer(self, p_user_id, p_from_account, p_to_account, p_amount,
+                            p_date=None, p_description=None, p_replace_id=None):
+        if p_from_account == p_to_account:
+            raise APIError("Origin and destination accounts must be different.")
+        accounts = self.tables["accounts"]
+        source, target = accounts.get(p_from_account), accounts.get(p_to_account)
+        if not source or not target or source["user_id"] != p_user_id or target["user_id"] != p_user_id:
+            raise APIError("Account not found or unauthorized.")
+        replaced = self._owned_transaction(p_user_id, p_replace_id) if p_replace_id else None
+        if replaced:
+            self.delete_row("transactions", replaced)
+        legs = [
+            {"account_id": p_from_account, "amount": p_amount, "type": "expense", "category": "Transfer",
+             "description": p_description or f"Transfer to {target['name']}", "date": p_date},
+            {"account_id": p_to_account, "amount": p_amount, "type": "income", "category": "Transfer",
+             "description": p_description or f"Transfer from {source['name']}", "date": p_date},
+        ]
+        try:
+            return self.insert_rows("transactions", legs)
+        except APIError:
+            if replaced:
+                self.insert_rows("transactions", [replaced])
+            raise
+
+    def rpc_update_transaction(self, p_user_id, p_transaction_id, p_changes):
+        tx = self._owned_transaction(p_user_id, p_transaction_id)
+        account = self.tables["accounts"].get(p_changes.get("account_id", tx["account_id"]))
+        if account is None or account["user_id"] != p_user_id:
+            raise APIError("Account not found or unauthorized.")
+        return [self.update_row("transactions", tx, p_changes)]
+
+    def rpc_sync_changes(self, p_user_id, p_after_xact, p_after_id, p_limit):
+        # No concurrent writers here: every entry is final, and its id doubles as its xact
+        after = max(p_after_xact, p_after_id)
+        page = [e for e in self.change_log[after:] if e["user_id"] == p_user_id][:p_limit]
+        touched = sorted({(e["collection"], e["row_id"]) for e in page})
+        changes = []
+        for collection, row_id in touched:
+            row = self.tables[collection].get(row_id)
+            changes.append({"collection": collection, "id": row_id,
+                            "op": "delete" if row is None else "upsert", "row": dict(row) if row else None})
+        full = len(page) == p_limit
+        last = page[-1]["id"] if full else len(self.change_log)
+        return {"changes": changes, "has_more": full, "next_xact": last, "next_id": last}
+
+    # endregion SQL Functions
+
+
+    # ==========================================================
+    # region Seeding
+    # ==========================================================
+
+    def seed(self, table: str, rows: list):
+        """Bulk-loads rows without round trips (triggers still apply to transactions). Returns their ids."""
+        ids = []
+        for row in rows:
+            row = dict(row)
+            row.setdefault("id", next(self._ids))
+            if table == "transactions":
+                self._apply_transaction(row, +1, check_funds=False)
+            self.tables[table][row["id"]] = row
+            self._index_add(table, row)
+            ids.append(row["id"])
+        return ids
+
+    def reset_calls(self):
+        self.calls = []
+
+    # endregion Seeding
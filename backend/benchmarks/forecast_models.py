@@ -0,0 +1,58 @@
+"""Compares the forecast engines on fixed synthetic series.
+
+    cd backend && python -m benchmarks.forecast_models [--repeat 5] [--skip-neuralprophet]
+
+Every series is generated from a fixed seed, so runs are comparable across machines
+and commits. NeuralProphet is skipped automatically when it isn't installed.
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.forecast_service import MODELS
+
+
+def fixture_series():
+    days = pd.bdate_range("2022-01-03", periods=750)
+    t = np.arange(len(days))
+    rng = np.random.default_rng(42)
+    return days, {
+        "trend+seasonal": 100 + 0.08 * t + 6 * np.sin(2 * np.pi * t / 252) + rng.normal(0, 1.5, len(t)),
+        "random-walk": 50 + np.cumsum(rng.normal(0.02, 1.0, len(t))),
+        "regime-change": np.where(t < 400, 80 + 0.1 * t, 120 - 0.05 * (t - 400)) + rng.normal(0, 2, len(t)),
+    }
+
+
+def run(repeat: int, periods: int, engines: list):
+    days, series = fixture_series()
+    print(f"{'series':<16} {'model':<14} {'median ms':>10} {'r2':>8} {'mae':>8} {'mape %':>8}")
+    for name, values in series.items():
+        data = pd.DataFrame({"ds": days, "y": values})
+        for engine in engines:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                _, result = MODELS[engine](data, periods)
+                timings.append((time.perf_counter() - started) * 1000)
+            m = result["metrics"]
+            print(f"{name:<16} {engine:<14} {statistics.median(timings):>10.1f} {m['r2']:>8} {m['mae']:>8} {m['mape']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--periods", type=int, default=180)
+    parser.add_argument("--skip-neuralprophet", action="store_true")
+    args = parser.parse_args()
+
+    engines = ["fast"]
+    if not args.skip_neuralprophet:
+        try:
+            import neuralprophet  # noqa: F401
+            engines.append("neuralprophet")
+        except ImportError:
+            print("neuralprophet not installed — benchmarking the fast engine only\n")
+    run(args.repeat, args.periods, engines)
@@ -0,0 +1,87 @@
+-- Plain-Postgres stand-in for the hosted Supabase schema, for running the API's SQL locally
+-- (DB_BACKEND=postgres, benchmarks.repository). Apply it before supabase/migrations/.
+-- Only the tables, columns and triggers the API relies on; no auth schema and no RLS policies.
+
+create table if not exists public.profiles (
+    id uuid primary key,
+    username text,
+    email text,
+    phone_number text,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.accounts (
+    id bigint generated by default as identity primary key,
+    user_id uuid not null,
+    name text not null,
+    type text not null,
+    balance numeric not null default 0,
+    created_at timestamptz not null default now()
+);
+
+create index if not exists accounts_user_id_idx on public.accounts (user_id);
+
+create table if not exists public.transactions (
+    id bigint generated by default as identity primary key,
+    account_id bigint not null references public.accounts (id) on delete cascade,
+    amount numeric not null check (amount > 0),
+    type text not null check (type in ('income', 'expense')),
+    category text,
+    description text,
+    date timestamptz not null default now(),
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.budgets (
+    id bigint generated by default as identity primary key,
+    user_id uuid not null,
+    category text not null,
+    limit_amount numeric not null,
+    month integer not null,
+    year integer not null,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists public.goals (
+    id bigint generated by default as identity primary key,
+    user_id uuid not null,
+    name text not null,
+    target_amount numeric not null,
+    current_amount numeric not null default 0,
+    deadline date,
+    created_at timestamptz not null default now()
+);
+
+
+-- ── Account balances ────────────────────────────────────────
+-- Income adds to the balance, expenses subtract; a write that leaves it below zero fails.
+
+create or replace function public.update_account_balance()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        update public.accounts
+           set balance = balance - case when old.type = 'income' then old.amount else -old.amount end
+         where id = old.account_id;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        update public.accounts
+           set balance = balance + case when new.type = 'income' then new.amount else -new.amount end
+         where id = new.account_id;
+    end if;
+
+    if tg_op <> 'DELETE' and (select balance from public.accounts where id = new.account_id) < 0 then
+        raise exception 'Insufficient funds';
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists update_account_balance on public.transactions;
+create trigger update_account_balance
+    after insert or update or delete on public.transactions
+    for each row execute function public.update_account_balance();
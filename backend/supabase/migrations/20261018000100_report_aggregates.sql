@@ -0,0 +1,32 @@
+-- Grouped totals for the /reports API.
+-- One row per (period, type, category); categories are grouped case-insensitively,
+-- the same way BudgetService matches spending to budgets.
+
+create index if not exists transactions_account_id_date_idx
+    on public.transactions (account_id, date desc, id desc);
+
+create or replace function public.report_aggregates(
+    p_user_id uuid,
+    p_from timestamptz,
+    p_to timestamptz,
+    p_granularity text,
+    p_account_id bigint default null
+)
+returns table (period date, type text, category text, total numeric, tx_count bigint)
+language sql
+stable
+as $$
+    select
+        date_trunc(p_granularity, t.date)::date as period,
+        t.type::text as type,
+        lower(btrim(t.category)) as category,
+        sum(t.amount) as total,
+        count(*) as tx_count
+    from public.transactions t
+    join public.accounts a on a.id = t.account_id
+    where a.user_id = p_user_id
+      and t.date >= p_from
+      and t.date < p_to
+      and (p_account_id is null or t.account_id = p_account_id)
+    group by 1, 2, 3
+$$;
@@ -0,0 +1,115 @@
+-- Running expense totals per (account, month, category), kept up to date by a trigger on
+-- transactions, so GET /budgets reads one counter per budget instead of re-summing the month.
+-- Categories are normalised with lower(btrim()), the same way budgets are matched to spending.
+-- Counters are per account (not per user) so deleting an account cascades to its counters.
+
+create table if not exists public.category_spend (
+    account_id bigint not null references public.accounts (id) on delete cascade,
+    year integer not null,
+    month integer not null,
+    category text not null,
+    spent numeric not null default 0,
+    primary key (account_id, year, month, category)
+);
+
+alter table public.category_spend enable row level security;
+
+
+-- ── Incremental maintenance ─────────────────────────────────
+
+create or replace function public.track_category_spend()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') and old.type::text = 'expense' then
+        -- Plain update: on an account cascade the counter row is already gone
+        update public.category_spend
+           set spent = spent - old.amount
+         where account_id = old.account_id
+           and year = extract(year from old.date)::int
+           and month = extract(month from old.date)::int
+           and category = lower(btrim(old.category));
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') and new.type::text = 'expense' then
+        insert into public.category_spend as cs (account_id, year, month, category, spent)
+        values (
+            new.account_id,
+            extract(year from new.date)::int,
+            extract(month from new.date)::int,
+            lower(btrim(new.category)),
+            new.amount
+        )
+        on conflict (account_id, year, month, category)
+        do update set spent = cs.spent + excluded.spent;
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists transactions_category_spend on public.transactions;
+create trigger transactions_category_spend
+    after insert or update or delete on public.transactions
+    for each row execute function public.track_category_spend();
+
+
+-- ── Reconciliation ──────────────────────────────────────────
+-- Rebuilds the counters from the transactions table: one user, or everyone when p_user_id
+-- is null (e.g. nightly from pg_cron). Concurrent writes wait on the table lock, so no
+-- transaction is counted twice or missed.
+
+create or replace function public.rebuild_category_spend(p_user_id uuid default null)
+returns void
+language plpgsql
+as $$
+begin
+    lock table public.category_spend in share row exclusive mode;
+
+    delete from public.category_spend cs
+     using public.accounts a
+     where a.id = cs.account_id
+       and (p_user_id is null or a.user_id = p_user_id);
+
+    insert into public.category_spend (account_id, year, month, category, spent)
+    select
+        t.account_id,
+        extract(year from t.date)::int,
+        extract(month from t.date)::int,
+        lower(btrim(t.category)),
+        sum(t.amount)
+    from public.transactions t
+    join public.accounts a on a.id = t.account_id
+    where t.type::text = 'expense'
+      and (p_user_id is null or a.user_id = p_user_id)
+    group by 1, 2, 3, 4;
+end;
+$$;
+
+select public.rebuild_category_spend();
+
+
+-- ── Budgets with spending ───────────────────────────────────
+-- One row per budget of the month: the budget row plus "spent", summed over the user's accounts.
+
+create or replace function public.budgets_with_spent(p_user_id uuid, p_year integer, p_month integer)
+returns setof jsonb
+language sql
+stable
+as $$
+    select to_jsonb(b) || jsonb_build_object('spent', coalesce((
+        select sum(cs.spent)
+        from public.category_spend cs
+        join public.accounts a on a.id = cs.account_id
+        where a.user_id = p_user_id
+          and cs.year = p_year
+          and cs.month = p_month
+          and cs.category = lower(btrim(b.category))
+    ), 0))
+    from public.budgets b
+    where b.user_id = p_user_id
+      and b.year = p_year
+      and b.month = p_month
+    order by b.category
+$$;
@@ -0,0 +1,37 @@
+-- Budget vs. actual for every month of a range in one grouped query, for GET /budgets/history.
+-- Months are compared as year * 12 + month. A category with spending but no budget that
+-- month is returned with a null limit_amount; a budget without spending has spent = 0.
+
+create or replace function public.budget_history(p_user_id uuid, p_from_month integer, p_to_month integer)
+returns table (year integer, month integer, category text, limit_amount numeric, spent numeric)
+language sql
+stable
+as $$
+    with spend as (
+        select cs.year, cs.month, cs.category, sum(cs.spent) as spent
+        from public.category_spend cs
+        join public.accounts a on a.id = cs.account_id
+        where a.user_id = p_user_id
+          and cs.year * 12 + cs.month between p_from_month and p_to_month
+        group by 1, 2, 3
+    ),
+    limits as (
+        select b.year, b.month, lower(btrim(b.category)) as category,
+               min(btrim(b.category)) as label, sum(b.limit_amount) as limit_amount
+        from public.budgets b
+        where b.user_id = p_user_id
+          and b.year * 12 + b.month between p_from_month and p_to_month
+        group by 1, 2, 3
+    )
+    select
+        coalesce(l.year, s.year),
+        coalesce(l.month, s.month),
+        coalesce(l.label, s.category),
+        l.limit_amount,
+        coalesce(s.spent, 0)
+    from limits l
+    full join spend s
+      on s.year = l.year and s.month = l.month and s.category = l.category
+    where coalesce(s.spent, 0) <> 0 or l.limit_amount is not null
+    order by 1, 2, 3
+$$;
@@ -0,0 +1,49 @@
+-- Adds money to one or more savings goals in a single statement, for POST /goals/{id}/add-funds
+-- and POST /goals/add-funds. Each goal is funded by one conditional UPDATE: the row lock makes
+-- concurrent deposits queue up, and the target check is re-evaluated on the row they find, so
+-- no deposit is lost and no goal goes past its target. The call is all-or-nothing: if any
+-- goal is unknown or would overshoot, nothing is written.
+-- p_deposits: [{"goal_id": 1, "amount": 50.0}, ...]; repeated goal ids are summed.
+
+create or replace function public.fund_goals(p_user_id uuid, p_deposits jsonb)
+returns setof public.goals
+language plpgsql
+as $$
+declare
+    v_deposit record;
+    v_goal public.goals;
+begin
+    for v_deposit in
+        select d.goal_id, sum(d.amount) as amount
+        from jsonb_to_recordset(p_deposits) as d(goal_id bigint, amount numeric)
+        group by d.goal_id
+        order by d.goal_id  -- every call locks goals in the same order, so batches cannot deadlock
+    loop
+        if v_deposit.amount is null or v_deposit.amount <= 0 then
+            raise exception 'Amount must be greater than zero.';
+        end if;
+
+        update public.goals g
+           set current_amount = g.current_amount + v_deposit.amount
+         where g.id = v_deposit.goal_id
+           and g.user_id = p_user_id
+           and g.current_amount + v_deposit.amount <= g.target_amount
+        returning g.* into v_goal;
+
+        if not found then
+            select * into v_goal
+              from public.goals g
+             where g.id = v_deposit.goal_id
+               and g.user_id = p_user_id;
+            if not found then
+                raise exception 'Goal % not found or unauthorized.', v_deposit.goal_id;
+            end if;
+            raise exception 'Amount exceeds target of goal %. Max you can add: €%',
+                v_deposit.goal_id,
+                to_char(greatest(v_goal.target_amount - v_goal.current_amount, 0), 'FM999999999990.00');
+        end if;
+
+        return next v_goal;
+    end loop;
+end;
+$$;
@@ -0,0 +1,182 @@
+-- Transfers and transaction edits as single database transactions, for POST /transactions/transfer
+-- and PATCH /transactions/{id}. Ownership is checked here, the balance and category_spend
+-- triggers fire as for any write, and a failure (e.g. 'Insufficient funds') rolls back every
+-- row the call touched.
+
+
+-- ── Account balances ────────────────────────────────────────
+-- Edits rely on the balance trigger firing on UPDATE too: the old row's amount comes off its
+-- account and the new one's goes onto (possibly another) account. The project's own balance
+-- trigger is not in this repository, so it is found by what it does (a trigger on transactions
+-- whose function updates accounts.balance), dropped by its real name and replaced by
+-- transactions_balance below. Its function is left in place for reference. With no such
+-- trigger the migration fails rather than leave balances unmaintained.
+
+do $$
+declare
+    v_trigger record;
+    v_dropped integer := 0;
+begin
+    for v_trigger in
+        select t.tgname, p.oid::regprocedure as function_name
+          from pg_trigger t
+          join pg_proc p on p.oid = t.tgfoid
+         where t.tgrelid = 'public.transactions'::regclass
+           and not t.tgisinternal
+           and t.tgname <> 'transactions_balance'
+           and p.prosrc ~* 'update\s+("?public"?\.)?"?accounts"?\s'
+           and p.prosrc ~* 'balance'
+    loop
+        raise notice 'Replacing balance trigger % on public.transactions (function % is kept)',
+            v_trigger.tgname, v_trigger.function_name;
+        execute format('drop trigger %I on public.transactions', v_trigger.tgname);
+        v_dropped := v_dropped + 1;
+    end loop;
+
+    if v_dropped = 0 and not exists (
+        select 1 from pg_trigger
+         where tgrelid = 'public.transactions'::regclass
+           and tgname = 'transactions_balance'
+    ) then
+        raise exception 'No balance trigger found on public.transactions: check how balances are maintained before applying this migration.';
+    end if;
+end;
+$$;
+
+create or replace function public.transactions_update_balances()
+returns trigger
+language plpgsql
+as $$
+begin
+    if tg_op in ('UPDATE', 'DELETE') then
+        update public.accounts
+           set balance = balance - case when old.type = 'income' then old.amount else -old.amount end
+         where id = old.account_id;
+    end if;
+
+    if tg_op in ('INSERT', 'UPDATE') then
+        update public.accounts
+           set balance = balance + case when new.type = 'income' then new.amount else -new.amount end
+         where id = new.account_id;
+    end if;
+
+    if tg_op <> 'DELETE' and exists (
+        select 1 from public.accounts
+         where id in (new.account_id, case when tg_op = 'UPDATE' then old.account_id end)
+           and balance < 0
+    ) then
+        raise exception 'Insufficient funds';
+    end if;
+
+    return null;
+end;
+$$;
+
+drop trigger if exists transactions_balance on public.transactions;
+create trigger transactions_balance
+    after insert or update or delete on public.transactions
+    for each row execute function public.transactions_update_balances();
+
+
+-- ── Transfers ───────────────────────────────────────────────
+-- An expense on the origin account and an income on the destination, both categorised
+-- 'Transfer'. p_replace_id optionally deletes an existing transaction in the same call
+-- (an edit that turns a transaction into a transfer).
+
+create or replace function public.create_transfer(
+    p_user_id uuid,
+    p_from_account bigint,
+    p_to_account bigint,
+    p_amount numeric,
+    p_date timestamptz default now(),
+    p_description text default null,
+    p_replace_id bigint default null
+)
+returns setof public.transactions
+language plpgsql
+as $$
+declare
+    v_from public.accounts;
+    v_to public.accounts;
+begin
+    if p_from_account = p_to_account then
+        raise exception 'Origin and destination accounts must be different.';
+    end if;
+
+    -- Both accounts are locked in id order, so opposite transfers running at once cannot deadlock
+    perform 1
+       from public.accounts
+      where id in (p_from_account, p_to_account)
+        and user_id = p_user_id
+      order by id
+        for update;
+
+    select * into v_from from public.accounts where id = p_from_account and user_id = p_user_id;
+    select * into v_to from public.accounts where id = p_to_account and user_id = p_user_id;
+    if v_from.id is null or v_to.id is null then
+        raise exception 'Account not found or unauthorized.';
+    end if;
+
+    if p_replace_id is not null then
+        delete from public.transactions t
+         using public.accounts a
+         where t.id = p_replace_id
+           and a.id = t.account_id
+           and a.user_id = p_user_id;
+        if not found then
+            raise exception 'Transaction not found.';
+        end if;
+    end if;
+
+    return query
+    insert into public.transactions (account_id, amount, type, category, description, date)
+    values
+        (v_from.id, p_amount, 'expense', 'Transfer', coalesce(p_description, 'Transfer to ' || v_to.name), p_date),
+        (v_to.id, p_amount, 'income', 'Transfer', coalesce(p_description, 'Transfer from ' || v_from.name), p_date)
+    returning *;
+end;
+$$;
+
+
+-- ── Edits ───────────────────────────────────────────────────
+-- p_changes holds only the columns to change (account_id, amount, type, category,
+-- description, date); jsonb_populate_record casts each to its column type.
+
+create or replace function public.update_transaction(p_user_id uuid, p_transaction_id bigint, p_changes jsonb)
+returns setof public.transactions
+language plpgsql
+as $$
+declare
+    v_old public.transactions;
+    v_new public.transactions;
+begin
+    select t.* into v_old
+      from public.transactions t
+      join public.accounts a on a.id = t.account_id
+     where t.id = p_transaction_id
+       and a.user_id = p_user_id
+       for update of t;
+    if not found then
+        raise exception 'Transaction not found.';
+    end if;
+
+    v_new := jsonb_populate_record(v_old, p_changes);
+
+    if v_new.account_id <> v_old.account_id and not exists (
+        select 1 from public.accounts where id = v_new.account_id and user_id = p_user_id
+    ) then
+        raise exception 'Account not found or unauthorized.';
+    end if;
+
+    return query
+    update public.transactions t
+       set account_id = v_new.account_id,
+           amount = v_new.amount,
+           type = v_new.type,
+           category = v_new.category,
+           description = v_new.description,
+           date = v_new.date
+     where t.id = p_transaction_id
+    returning t.*;
+end;
+$$;
@@ -0,0 +1,175 @@
+-- Append-only log of inserts, updates and deletes on accounts, transactions, budgets and goals,
+-- for GET /sync. Triggers write it, so API writes, SQL functions, balance updates, cascades and
+-- the SQL editor are all recorded.
+--
+-- Readers page through one user's entries in (xact, id) order, and only up to the oldest
+-- transaction still running anywhere (the snapshot xmin). Everything before that point is
+-- final: no entry can commit behind a cursor that has already passed it. Ordering by id
+-- alone would not work, because ids are handed out when rows are written, not when they
+-- commit. A long-running transaction therefore delays sync until it finishes.
+
+create table if not exists public.change_log (
+    id bigint generated always as identity primary key,
+    user_id uuid not null,
+    collection text not null,
+    row_id bigint not null,
+    op text not null check (op in ('insert', 'update', 'delete')),
+    xact xid8 not null default pg_current_xact_id(),
+    changed_at timestamptz not null default now()
+);
+
+create index if not exists change_log_user_xact_idx on public.change_log (user_id, xact, id);
+
+alter table public.change_log enable row level security;
+
+
+-- ── Backfill ────────────────────────────────────────────────
+-- Rows that existed before the log did, as inserts, so a sync from the start returns everything.
+-- Runs only while the log is empty (before the triggers below exist).
+
+insert into public.change_log (user_id, collection, row_id, op)
+select s.user_id, s.collection, s.row_id, 'insert'
+from (
+    select user_id, 'accounts' as collection, id as row_id from public.accounts
+    union all
+    select a.user_id, 'transactions', t.id from public.transactions t join public.accounts a on a.id = t.account_id
+    union all
+    select user_id, 'budgets', id from public.budgets
+    union all
+    select user_id, 'goals', id from public.goals
+) s
+where not exists (select 1 from public.change_log);
+
+
+-- ── Recording ───────────────────────────────────────────────
+
+create or replace function public.log_change()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_row record;
+    v_user_id uuid;
+begin
+    if tg_op = 'DELETE' then
+        v_row := old;
+    else
+        v_row := new;
+    end if;
+
+    if tg_table_name = 'transactions' then
+        -- Missing on an account cascade: log_account_cascade already recorded those deletes
+        select a.user_id into v_user_id from public.accounts a where a.id = v_row.account_id;
+    else
+        v_user_id := v_row.user_id;
+    end if;
+
+    if v_user_id is not null then
+        insert into public.change_log (user_id, collection, row_id, op)
+        values (v_user_id, tg_table_name, v_row.id, lower(tg_op));
+    end if;
+    return null;
+end;
+$$;
+
+create or replace function public.log_account_cascade()
+returns trigger
+language plpgsql
+as $$
+begin
+    -- The cascade deletes an account's transactions after the account row is gone
+    insert into public.change_log (user_id, collection, row_id, op)
+    select old.user_id, 'transactions', t.id, 'delete'
+    from public.transactions t
+    where t.account_id = old.id;
+    return old;
+end;
+$$;
+
+drop trigger if exists accounts_change_log on public.accounts;
+create trigger accounts_change_log
+    after insert or update or delete on public.accounts
+    for each row execute function public.log_change();
+
+drop trigger if exists accounts_change_log_cascade on public.accounts;
+create trigger accounts_change_log_cascade
+    before delete on public.accounts
+    for each row execute function public.log_account_cascade();
+
+drop trigger if exists transactions_change_log on public.transactions;
+create trigger transactions_change_log
+    after insert or update or delete on public.transactions
+    for each row execute function public.log_change();
+
+drop trigger if exists budgets_change_log on public.budgets;
+create trigger budgets_change_log
+    after insert or update or delete on public.budgets
+    for each row execute function public.log_change();
+
+drop trigger if exists goals_change_log on public.goals;
+create trigger goals_change_log
+    after insert or update or delete on public.goals
+    for each row execute function public.log_change();
+
+
+-- ── Reading ─────────────────────────────────────────────────
+-- Up to p_limit entries after (p_after_xact, p_after_id). Each row touched by them is
+-- returned once, in its current state: {"collection", "id", "op": "upsert", "row"}, or
+-- "op": "delete" with a null row when it no longer exists. next_xact/next_id is where the
+-- following call resumes.
+
+create or replace function public.sync_changes(p_user_id uuid, p_after_xact bigint, p_after_id bigint, p_limit integer)
+returns jsonb
+language sql
+stable
+as $$
+    with horizon as (
+        select pg_snapshot_xmin(pg_current_snapshot()) as xmin
+    ),
+    page as (
+        select c.xact, c.id, c.collection, c.row_id
+        from public.change_log c, horizon h
+        where c.user_id = p_user_id
+          and (c.xact, c.id) > (p_after_xact::text::xid8, p_after_id)
+          and c.xact < h.xmin
+        order by c.xact, c.id
+        limit p_limit
+    ),
+    last as (
+        select xact, id from page order by xact desc, id desc limit 1
+    ),
+    touched as (
+        select distinct collection, row_id from page
+    ),
+    changes as (
+        select t.collection, t.row_id, case t.collection
+            when 'accounts' then (select to_jsonb(r) from public.accounts r where r.id = t.row_id)
+            when 'transactions' then (select to_jsonb(r) from public.transactions r where r.id = t.row_id)
+            when 'budgets' then (select to_jsonb(r) from public.budgets r where r.id = t.row_id)
+            when 'goals' then (select to_jsonb(r) from public.goals r where r.id = t.row_id)
+        end as row
+        from touched t
+    )
+    select jsonb_build_object(
+        'changes', coalesce((
+            select jsonb_agg(jsonb_build_object(
+                'collection', c.collection,
+                'id', c.row_id,
+                'op', case when c.row is null then 'delete' else 'upsert' end,
+                'row', c.row
+            ) order by c.collection, c.row_id)
+            from changes c
+        ), '[]'::jsonb),
+        'has_more', (select count(*) from page) = p_limit,
+        -- A full page resumes after its last entry; otherwise everything before the horizon was read
+        'next_xact', case
+            when (select count(*) from page) = p_limit then (select xact from last)::text::bigint
+            else greatest((select xmin from horizon)::text::bigint, p_after_xact)
+        end,
+        'next_id', case
+            when (select count(*) from page) = p_limit then (select id from last)
+            when (select xmin from horizon)::text::bigint > p_after_xact then 0
+            else p_after_id
+        end
+    )
+$$;
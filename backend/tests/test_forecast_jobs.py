@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+
+from app.services.forecast_jobs import ForecastJobManager
+
+
+class ForecastJobCancelTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.jobs = ForecastJobManager(max_workers=1, prewarm=False)
+        self.jobs.start()
+
+    async def asyncTearDown(self):
+        self.jobs.shutdown()
+
+    async def test_cancel_right_after_submit(self):
+        # The task is cancelled before _run ever starts
+        job = self.jobs.submit("AAPL", "2022-01-01", 30, "fast", client="a")
+        self.assertTrue(self.jobs.cancel(job, "a"))
+        await asyncio.wait_for(self.jobs.wait(job), 5)
+
+        self.assertEqual(job.status, "cancelled")
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(self.jobs.pending_count(), 0)
+
+        # An identical forecast starts a new job instead of joining the cancelled one
+        again = self.jobs.submit("AAPL", "2022-01-01", 30, "fast", client="a")
+        self.assertIsNot(again, job)
+        self.assertTrue(self.jobs.cancel(again, "a"))
+        await asyncio.wait_for(self.jobs.wait(again), 5)
+
+    async def test_callers_only_cancel_their_own_subscription(self):
+        job = self.jobs.submit("AAPL", "2022-01-01", 30, "fast", client="a")
+        self.assertIs(self.jobs.submit("AAPL", "2022-01-01", 30, "fast", client="b"), job)
+
+        self.assertFalse(self.jobs.cancel(job, "c"))
+        self.assertTrue(self.jobs.cancel(job, "a"))
+        self.assertFalse(self.jobs.cancel(job, "a"))   # repeating it doesn't count again
+        self.assertFalse(job.task.cancelling())
+        self.assertEqual(job.subscribers, {"b"})
+
+        self.assertTrue(self.jobs.cancel(job, "b"))
+        await asyncio.wait_for(self.jobs.wait(job), 5)
+        self.assertEqual(job.status, "cancelled")
+
+
+if __name__ == "__main__":
+    unittest.main()
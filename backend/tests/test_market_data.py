@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from app.services.market_data import FixtureProvider, MarketDataStore
+
+
+class CountingProvider(FixtureProvider):
+    """FixtureProvider that records every call made to it."""
+
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.calls = []
+
+    def history(self, ticker, start, end):
+        self.calls.append(("history", ticker, start, end))
+        return super().history(ticker, start, end)
+
+    def history_many(self, tickers, start, end):
+        self.calls.append(("history_many", tuple(tickers), start, end))
+        return {ticker: super(CountingProvider, self).history(ticker, start, end) for ticker in tickers}
+
+    def info(self, ticker):
+        self.calls.append(("info", ticker))
+        return super().info(ticker)
+
+
+class MarketDataStoreTest(unittest.TestCase):
+    """MarketDataStore over fixture CSVs (business days, Jan–Mar 2022) in a temporary directory."""
+
+    TODAY = date(2022, 3, 31)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        fixtures = os.path.join(self.tmp.name, "fixtures")
+        os.makedirs(fixtures)
+        self.days = pd.bdate_range("2022-01-03", "2022-03-31")
+        for ticker, base in (("ABC", 100.0), ("XYZ", 50.0)):
+            frame = pd.DataFrame({"date": self.days.strftime("%Y-%m-%d"), "close": base + pd.RangeIndex(len(self.days))})
+            frame.to_csv(os.path.join(fixtures, f"{ticker}.csv"), index=False)
+        with open(os.path.join(fixtures, "ABC.json"), "w") as f:
+            json.dump({"longName": "ABC Corp", "currency": "USD"}, f)
+
+        self.provider = CountingProvider(fixtures)
+        self.store = MarketDataStore(os.path.join(self.tmp.name, "store"), self.provider,
+                                     refresh_interval=3600, info_ttl=100, missing_info_ttl=10, retry_backoff=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_second_sync_within_refresh_interval_fetches_nothing(self):
+        bars = self.store.sync("ABC", date(2022, 2, 1), today=self.TODAY)
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(len(bars), len(self.days[self.days >= "2022-02-01"]))
+
+        again = self.store.sync("ABC", date(2022, 2, 1), today=self.TODAY)
+        self.assertEqual(len(self.provider.calls), 1)
+        self.assertEqual(len(again), len(bars))
+
+    def test_earlier_start_fetches_only_the_missing_range(self):
+        self.store.sync("ABC", date(2022, 2, 1), today=self.TODAY)
+        self.provider.calls.clear()
+
+        bars = self.store.sync("ABC", date(2022, 1, 10), today=self.TODAY)
+        self.assertEqual(self.provider.calls, [("history", "ABC", date(2022, 1, 10), date(2022, 2, 1))])
+        self.assertEqual(len(bars), len(self.days[self.days >= "2022-01-10"]))
+
+    def test_get_history_slices_at_start_and_end(self):
+        history = self.store.get_history("ABC", "2022-01-01")
+        window = self.store.get_history("ABC", "2022-01-10", "2022-01-20")
+
+        expected = self.days[(self.days >= "2022-01-10") & (self.days < "2022-01-20")]
+        self.assertEqual(list(window.index), list(expected))
+        self.assertEqual(list(window["Close"]), list(history.loc[expected, "Close"]))
+        # A later start is served from the store
+        self.assertEqual(len(self.provider.calls), 1)
+
+    def test_get_info_respects_info_ttl(self):
+        with mock.patch("app.services.market_data.time.time", return_value=1000.0):
+            self.assertEqual(self.store.get_info("ABC")["longName"], "ABC Corp")
+        with mock.patch("app.services.market_data.time.time", return_value=1099.0):
+            self.store.get_info("ABC")
+        self.assertEqual(len(self.provider.calls), 1)
+
+        with mock.patch("app.services.market_data.time.time", return_value=1101.0):
+            self.store.get_info("ABC")
+        self.assertEqual(len(self.provider.calls), 2)
+
+    def test_missing_info_expires_after_missing_info_ttl(self):
+        with mock.patch("app.services.market_data.time.time", return_value=1000.0):
+            self.assertEqual(self.store.get_info("XYZ"), {})
+        with mock.patch("app.services.market_data.time.time", return_value=1009.0):
+            self.store.get_info("XYZ")
+        self.assertEqual(len(self.provider.calls), 1)
+
+        with mock.patch("app.services.market_data.time.time", return_value=1011.0):
+            self.store.get_info("XYZ")
+        self.assertEqual(len(self.provider.calls), 2)
+
+    def test_sync_many_makes_one_grouped_call(self):
+        self.store.sync_many(["ABC", "xyz", "ABC"], date(2022, 1, 3), today=self.TODAY)
+        self.assertEqual(self.provider.calls, [
+            ("history_many", ("ABC", "XYZ"), date(2022, 1, 3), date(2022, 4, 1)),
+        ])
+
+        # Both are now fresh: neither another grouped call nor a per-ticker download
+        self.store.sync_many(["ABC", "XYZ"], date(2022, 1, 3), today=self.TODAY)
+        self.assertEqual(len(self.store.sync("XYZ", date(2022, 1, 3), today=self.TODAY)), len(self.days))
+        self.assertEqual(len(self.provider.calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import unittest
+import uuid
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+@unittest.skipUnless(DATABASE_URL and asyncpg, "needs DATABASE_URL (a Postgres server) and asyncpg")
+class UpdateTransactionBalanceTest(unittest.IsolatedAsyncioTestCase):
+    """update_transaction against supabase/local/schema.sql plus the migrations, on a throwaway database."""
+
+    async def asyncSetUp(self):
+        from benchmarks.repository import create_database
+
+        self.name = f"finance_test_{uuid.uuid4().hex[:8]}"
+        self.conn = await asyncpg.connect(await create_database(DATABASE_URL, self.name))
+        self.user_id = uuid.uuid4()
+        self.first = await self.account("First", 100)
+        self.second = await self.account("Second", 50)
+
+    async def asyncTearDown(self):
+        from benchmarks.repository import drop_database
+
+        await self.conn.close()
+        await drop_database(DATABASE_URL, self.name)
+
+    async def account(self, name: str, balance: float) -> int:
+        return await self.conn.fetchval(
+            "insert into public.accounts (user_id, name, type, balance) values ($1, $2, 'current', $3) returning id",
+            self.user_id, name, balance,
+        )
+
+    async def balances(self) -> tuple:
+        rows = dict(await self.conn.fetch("select id, balance from public.accounts"))
+        return float(rows[self.first]), float(rows[self.second])
+
+    async def expense(self, account_id: int, amount: float) -> int:
+        return await self.conn.fetchval(
+            "insert into public.transactions (account_id, amount, type, category) values ($1, $2, 'expense', 'Food') returning id",
+            account_id, amount,
+        )
+
+    async def update(self, transaction_id: int, changes: str):
+        return await self.conn.fetch(
+            "select * from public.update_transaction($1, $2, $3::jsonb)", self.user_id, transaction_id, changes,
+        )
+
+    async def test_edit_amount_and_account_moves_the_balance(self):
+        transaction_id = await self.expense(self.first, 30)
+        self.assertEqual(await self.balances(), (70, 50))
+
+        await self.update(transaction_id, f'{{"amount": 20, "account_id": {self.second}}}')
+        self.assertEqual(await self.balances(), (100, 30))
+
+    async def test_edit_that_overdraws_rolls_back(self):
+        transaction_id = await self.expense(self.first, 30)
+
+        with self.assertRaisesRegex(asyncpg.RaiseError, "Insufficient funds"):
+            await self.update(transaction_id, f'{{"amount": 80, "account_id": {self.second}}}')
+        self.assertEqual(await self.balances(), (70, 50))
+
+    async def test_moving_spent_income_away_rolls_back(self):
+        income_id = await self.conn.fetchval(
+            "insert into public.transactions (account_id, amount, type) values ($1, 50, 'income') returning id",
+            self.first,
+        )
+        await self.expense(self.first, 120)
+
+        with self.assertRaisesRegex(asyncpg.RaiseError, "Insufficient funds"):
+            await self.update(income_id, f'{{"account_id": {self.second}}}')
+        self.assertEqual(await self.balances(), (30, 50))
+
+
+@unittest.skipUnless(DATABASE_URL and asyncpg, "needs DATABASE_URL (a Postgres server) and asyncpg")
+class BalanceTriggerMigrationTest(unittest.IsolatedAsyncioTestCase):
+    """The edits migration replaces whatever the project's balance trigger is called, and only that."""
+
+    async def asyncSetUp(self):
+        self.name = f"finance_test_{uuid.uuid4().hex[:8]}"
+
+    async def asyncTearDown(self):
+        from benchmarks.repository import drop_database
+
+        await drop_database(DATABASE_URL, self.name)
+
+    async def test_balance_trigger_under_another_name_is_replaced(self):
+        from benchmarks.repository import create_database
+
+        url = await create_database(DATABASE_URL, self.name, before_migrations=(
+            "alter trigger update_account_balance on public.transactions rename to on_transaction_written"
+        ))
+        conn = await asyncpg.connect(url)
+        try:
+            triggers = {r["tgname"] for r in await conn.fetch(
+                "select tgname from pg_trigger where tgrelid = 'public.transactions'::regclass and not tgisinternal"
+            )}
+            self.assertIn("transactions_balance", triggers)
+            self.assertNotIn("on_transaction_written", triggers)
+
+            # Moved once, not by two triggers
+            account_id = await conn.fetchval(
+                "insert into public.accounts (user_id, name, type, balance) values ($1, 'A', 'current', 100) returning id",
+                uuid.uuid4(),
+            )
+            await conn.execute(
+                "insert into public.transactions (account_id, amount, type, category) values ($1, 30, 'expense', 'Food')", account_id,
+            )
+            self.assertEqual(float(await conn.fetchval("select balance from public.accounts")), 70)
+        finally:
+            await conn.close()
+
+    async def test_missing_balance_trigger_fails_the_migration(self):
+        from benchmarks.repository import create_database
+
+        with self.assertRaisesRegex(asyncpg.RaiseError, "No balance trigger found"):
+            await create_database(DATABASE_URL, self.name, before_migrations=(
+                "drop trigger update_account_balance on public.transactions"
+            ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,4 +17,13 @@ export const deleteBudget = async (id) => {
 export const updateBudget = async (id, limit_amount) => {
   const response = await api.patch(`/budgets/${id}`, { limit_amount })
   return response.data
-}
\ No newline at end of file
+}
+
+// monthFrom / monthTo: 'YYYY-MM' (defaults to the last 6 months)
+export const getBudgetHistory = async (monthFrom = null, monthTo = null) => {
+  const params = {}
+  if (monthFrom) params.month_from = monthFrom
+  if (monthTo) params.month_to = monthTo
+  const response = await api.get('/budgets/history', { params })
+  return response.data
+}
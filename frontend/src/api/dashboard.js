@@ -0,0 +1,8 @@
+import api from './client'
+
+// { accounts, transactions: { items, next_cursor }, budgets, goals, summary }
+// params: tx_limit (size of the first transactions page)
+export const getDashboard = async (params = {}) => {
+  const response = await api.get('/dashboard/', { params })
+  return response.data
+}
@@ -0,0 +1,63 @@
+import api from './client'
+
+// Live updates from GET /events (server-sent events).
+// EventSource can't send the Authorization header, so the stream is read with fetch.
+// handlers: { transaction, balance, budget, resync } — each gets the event's data.
+// Reconnects after the server's retry delay; call the returned function to stop.
+export const subscribeEvents = (handlers) => {
+  let stopped = false
+  let controller = null
+  let retry = 3000
+  let connectedBefore = false
+
+  const dispatch = (block) => {
+    let event = 'message'
+    const data = []
+    for (const line of block.split('\n')) {
+      if (line.startsWith(':')) continue   // heartbeat
+      const [field, ...rest] = line.split(':')
+      const value = rest.join(':').replace(/^ /, '')
+      if (field === 'event') event = value
+      else if (field === 'data') data.push(value)
+      else if (field === 'retry') retry = Number(value) || retry
+    }
+    if (data.length && handlers[event]) handlers[event](JSON.parse(data.join('\n')))
+  }
+
+  const connect = async () => {
+    while (!stopped) {
+      controller = new AbortController()
+      try {
+        const token = localStorage.getItem('access_token')
+        const response = await fetch(new URL('events/', api.defaults.baseURL), {
+          headers: { Authorization: `Bearer ${token}`, Accept: 'text/event-stream' },
+          signal: controller.signal
+        })
+        if (response.status === 401) { stopped = true; break }
+        if (response.ok) {
+          // Anything may have changed while we were disconnected
+          if (connectedBefore) handlers.resync?.({})
+          connectedBefore = true
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+          let buffer = ''
+          while (true) {
+            const { value, done } = await reader.read()
+            if (done) break
+            buffer += value.replace(/\r\n?/g, '\n')
+            let end
+            while ((end = buffer.indexOf('\n\n')) >= 0) {
+              dispatch(buffer.slice(0, end))
+              buffer = buffer.slice(end + 2)
+            }
+          }
+        }
+      } catch (e) {
+        if (stopped) break
+      }
+      await new Promise(resolve => setTimeout(resolve, retry))
+    }
+  }
+
+  connect()
+  return () => { stopped = true; controller?.abort() }
+}
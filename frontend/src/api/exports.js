@@ -0,0 +1,15 @@
+import api from './client'
+
+// Streams the export from the API and saves it as a download.
+// Params: account_id, date_from, date_to, gzip
+const download = async (path, fallbackName, params = {}) => {
+  const response = await api.get(path, { params, responseType: 'blob' })
+  const match = /filename="([^"]+)"/.exec(response.headers['content-disposition'] || '')
+  const url = URL.createObjectURL(response.data)
+  const a = document.createElement('a'); a.href = url; a.download = match ? match[1] : fallbackName; a.click()
+  URL.revokeObjectURL(url)
+}
+
+export const exportTransactionsCSV = (params) => download('/export/transactions.csv', 'transactions.csv', params)
+
+export const exportBackupJSON = (params) => download('/export/backup.json', 'fincontrol-backup.json', params)
@@ -17,4 +17,16 @@ export const addFunds = async (goalId, amount) => {
 
 export const deleteGoal = async (id) => {
   await api.delete(`/goals/${id}`)
-}
\ No newline at end of file
+}
+
+// deposits: [{ goal_id, amount }] — applied together, or not at all
+export const addFundsBatch = async (deposits) => {
+  const response = await api.post('/goals/add-funds', { deposits })
+  return response.data
+}
+
+// changes: any of { name, target_amount, deadline } (deadline: null clears it)
+export const updateGoal = async (id, changes) => {
+  const response = await api.patch(`/goals/${id}`, changes)
+  return response.data
+}
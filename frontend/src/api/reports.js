@@ -0,0 +1,9 @@
+import api from './client'
+
+// granularity: 'day' | 'week' | 'month' | 'year'
+export const getReport = async (dateFrom, dateTo, granularity = 'month', accountId = null) => {
+  const params = { date_from: dateFrom, date_to: dateTo, granularity }
+  if (accountId) params.account_id = accountId
+  const response = await api.get('/reports/', { params })
+  return response.data
+}
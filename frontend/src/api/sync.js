@@ -0,0 +1,24 @@
+import api from './client'
+
+// Rows changed since `since` (every row when null), across all pages.
+// Returns { changes: [{ collection, id, op: 'upsert' | 'delete', row }], cursor } — keep cursor for the next call
+export const syncChanges = async (since = null) => {
+  const changes = []
+  let page = { has_more: true, cursor: since }
+  while (page.has_more) {
+    const response = await api.get('/sync/', { params: page.cursor ? { since: page.cursor } : {} })
+    page = response.data
+    changes.push(...page.changes)
+  }
+  return { changes, cursor: page.cursor }
+}
+
+// Applies changes to a local copy: { accounts: [...], transactions: [...], budgets: [...], goals: [...] }
+export const applyChanges = (store, changes) => {
+  const next = { ...store }
+  for (const { collection, id, op, row } of changes) {
+    const rows = (next[collection] || []).filter(r => r.id !== id)
+    next[collection] = op === 'delete' ? rows : [...rows, row]
+  }
+  return next
+}
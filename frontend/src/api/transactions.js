@@ -1,8 +1,8 @@
 import api from './client'
 
-export const listTransactions = async (accountId = null) => {
-  const params = accountId ? `?account_id=${accountId}` : ''
-  const response = await api.get(`/transactions/${params}`)
+// One page, newest first. Filters: account_id, date_from, date_to, type, category, min_amount, max_amount
+export const listTransactionsPage = async (params = {}) => {
+  const response = await api.get('/transactions/', { params })
   return response.data
 }
 
@@ -11,6 +11,28 @@ export const createTransaction = async (data) => {
   return response.data
 }
 
+// data: { from_account_id, to_account_id, amount, date?, description?, replace_transaction_id? }
+// Both legs are written together; returns [outgoing expense, incoming income]
+export const createTransfer = async (data) => {
+  const response = await api.post('/transactions/transfer', data)
+  return response.data
+}
+
+// changes: only the fields to change (account_id, amount, type, category, description, date)
+export const updateTransaction = async (id, changes) => {
+  const response = await api.patch(`/transactions/${id}`, changes)
+  return response.data
+}
+
+// file: a File/Blob, sent as the raw body. Params: format ('csv' | 'ofx'), account_id, default_category
+export const importTransactions = async (file, params = {}) => {
+  const response = await api.post('/transactions/import', file, {
+    params,
+    headers: { 'Content-Type': 'application/octet-stream' },
+  })
+  return response.data
+}
+
 export const deleteTransaction = async (id) => {
   await api.delete(`/transactions/${id}`)
 }
\ No newline at end of file
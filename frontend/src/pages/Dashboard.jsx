@@ -5,8 +5,13 @@ import {
   PieChart, Pie, Cell, BarChart, Bar, AreaChart, Area, Legend
 } from 'recharts'
 import { listAccounts, createAccount, deleteAccount } from '../api/accounts'
-import { listTransactions, createTransaction, deleteTransaction } from '../api/transactions'
+import { listTransactionsPage, createTransaction, createTransfer, updateTransaction, deleteTransaction } from '../api/transactions'
 import { listBudgets, createBudget, deleteBudget, updateBudget } from '../api/budgets'
+import { exportTransactionsCSV, exportBackupJSON } from '../api/exports'
+import { getDashboard } from '../api/dashboard'
+import { getReport } from '../api/reports'
+import { listGoals, createGoal, updateGoal, addFunds, deleteGoal } from '../api/goals'
+import { subscribeEvents } from '../api/events'
 import api from '../api/client'
 // ── useIsMobile hook ──────────────────────────────────────────────────────────
 function useIsMobile() {
@@ -53,6 +58,41 @@ function fmtEur(val) {
   return `€${Number(val || 0).toLocaleString('pt-PT', { minimumFractionDigits: 2 })}`
 }
 
+// ── Dates and reports ─────────────────────────────────────────────────────────
+const TX_PAGE_SIZE = 100
+const isoDay     = (d) => `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`
+const parseDay   = (s) => { const [y, m, d] = s.split('-').map(Number); return new Date(y, m - 1, d) }
+const daysAgo    = (n) => { const d = new Date(); d.setDate(d.getDate() - n); return d }
+const monthRange = (year, month) => [isoDay(new Date(year, month, 1)), isoDay(new Date(year, month + 1, 0))]
+const ddmm       = (d) => `${d.getDate().toString().padStart(2,'0')}/${(d.getMonth()+1).toString().padStart(2,'0')}`
+
+// GET /reports periods → chart rows; label gets the period's first day
+const periodRows = (report, label) => (report?.periods || []).map(p => ({
+  label: label(parseDay(p.period)), start: parseDay(p.period),
+  income: p.income, expenses: p.expense, net: p.net, txCount: p.count,
+}))
+// Categories come back normalised (trimmed, lower case)
+const reportCategories = (report, type = 'expense') => (report?.categories || [])
+  .filter(c => c.type === type)
+  .map(c => ({ name: c.category ? c.category[0].toUpperCase() + c.category.slice(1) : 'Uncategorised', value: c.total }))
+const reportCount = (report) => (report?.periods || []).reduce((s, p) => s + p.count, 0)
+
+// Calls onLoad when scrolled into view (or clicked), for paged lists
+function LoadMore({ onLoad, loading }) {
+  const ref = useRef(null)
+  useEffect(() => {
+    if (!ref.current || typeof IntersectionObserver === 'undefined') return
+    const observer = new IntersectionObserver(entries => { if (entries[0].isIntersecting && !loading) onLoad() })
+    observer.observe(ref.current)
+    return () => observer.disconnect()
+  }, [onLoad, loading])
+  return (
+    <div ref={ref} style={{ display: 'flex', justifyContent: 'center', padding: '10px 0' }}>
+      <button onClick={onLoad} disabled={loading} style={{ ...cs.ghostBtn, opacity: loading ? 0.6 : 1 }}>{loading ? 'Loading...' : 'Load more'}</button>
+    </div>
+  )
+}
+
 const CustomTooltip = ({ active, payload, label }) => {
   if (active && payload && payload.length) {
     return (
@@ -197,8 +237,7 @@ function CreateTransactionModal({ accounts, onClose, onCreated }) {
     try {
       if (form.type === 'transfer') {
         if (form.account_id === String(form.to_account_id)) { setError('Origin and destination accounts must be different.'); setLoading(false); return }
-        await createTransaction({ account_id: parseInt(form.account_id),    type: 'expense', category: 'Transfer', amount: parseFloat(form.amount), description: `Transfer to ${accounts.find(a=>a.id===parseInt(form.to_account_id))?.name || ''}`, date: form.date })
-        await createTransaction({ account_id: parseInt(form.to_account_id), type: 'income',  category: 'Transfer', amount: parseFloat(form.amount), description: `Transfer from ${accounts.find(a=>a.id===parseInt(form.account_id))?.name || ''}`, date: form.date })
+        await createTransfer({ from_account_id: parseInt(form.account_id), to_account_id: parseInt(form.to_account_id), amount: parseFloat(form.amount), date: form.date })
       } else {
         await createTransaction({ account_id: parseInt(form.account_id), type: form.type, category: form.category, amount: parseFloat(form.amount), description: form.description || null, date: form.date })
       }
@@ -288,12 +327,16 @@ function CreateTransactionModal({ accounts, onClose, onCreated }) {
 
 function CreateGoalModal({ onClose, onCreated }) {
   const [form, setForm] = useState({ name: '', target: '', saved: '', deadline: '' })
-  const handleSubmit = (e) => {
-    e.preventDefault()
-    const goals = JSON.parse(localStorage.getItem('goals') || '[]')
-    goals.push({ id: Date.now(), name: form.name, target: parseFloat(form.target), saved: parseFloat(form.saved) || 0, deadline: form.deadline })
-    localStorage.setItem('goals', JSON.stringify(goals))
-    onCreated(); onClose()
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState('')
+  const handleSubmit = async (e) => {
+    e.preventDefault(); setLoading(true); setError('')
+    try {
+      const goal = await createGoal(form.name, parseFloat(form.target), form.deadline || null)
+      if (parseFloat(form.saved) > 0) await addFunds(goal.id, parseFloat(form.saved))
+      await onCreated(); onClose()
+    } catch (err) { setError(err.response?.data?.detail || 'Failed to create goal.') }
+    finally { setLoading(false) }
   }
   return (
     <div style={cs.overlay} onClick={onClose}>
@@ -306,30 +349,29 @@ function CreateGoalModal({ onClose, onCreated }) {
             <div style={cs.field}><label style={cs.label}>Already Saved (€)</label><input style={cs.input} type="number" step="0.01" placeholder="0.00" value={form.saved} onChange={e => setForm({ ...form, saved: e.target.value })} /></div>
           </div>
           <div style={cs.field}><label style={cs.label}>Deadline</label><input style={{ ...cs.input, colorScheme: 'dark' }} type="date" value={form.deadline} onChange={e => setForm({ ...form, deadline: e.target.value })} /></div>
-          <button type="submit" style={cs.submitBtn}>Create Goal</button>
+          {error && <p style={cs.error}>{error}</p>}
+          <button type="submit" disabled={loading} style={{ ...cs.submitBtn, opacity: loading ? 0.7 : 1 }}>{loading ? 'Creating...' : 'Create Goal'}</button>
         </form>
       </div>
     </div>
   )
 }
 
-// ── BUG FIX: EditGoalModal ────────────────────────────────────────────────────
 function EditGoalModal({ goal, onClose, onSaved }) {
   const [form, setForm] = useState({
     name: goal.name,
-    target: String(goal.target),
-    saved: String(goal.saved),
+    target: String(goal.target_amount),
     deadline: goal.deadline || '',
   })
-  const handleSubmit = (e) => {
-    e.preventDefault()
-    const goals = JSON.parse(localStorage.getItem('goals') || '[]')
-    const updated = goals.map(g => g.id === goal.id
-      ? { ...g, name: form.name, target: parseFloat(form.target), saved: parseFloat(form.saved) || 0, deadline: form.deadline }
-      : g
-    )
-    localStorage.setItem('goals', JSON.stringify(updated))
-    onSaved(); onClose()
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState('')
+  const handleSubmit = async (e) => {
+    e.preventDefault(); setLoading(true); setError('')
+    try {
+      await updateGoal(goal.id, { name: form.name, target_amount: parseFloat(form.target), deadline: form.deadline || null })
+      await onSaved(); onClose()
+    } catch (err) { setError(err.response?.data?.detail || 'Failed to update goal.') }
+    finally { setLoading(false) }
   }
   return (
     <div style={cs.overlay} onClick={onClose}>
@@ -344,24 +386,52 @@ function EditGoalModal({ goal, onClose, onSaved }) {
             <input style={cs.input} placeholder="e.g. Emergency Fund" value={form.name}
               onChange={e => setForm({ ...form, name: e.target.value })} required />
           </div>
-          <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: 14 }}>
-            <div style={cs.field}>
-              <label style={cs.label}>Target (€)</label>
-              <input style={cs.input} type="number" step="0.01" placeholder="5000.00"
-                value={form.target} onChange={e => setForm({ ...form, target: e.target.value })} required />
-            </div>
-            <div style={cs.field}>
-              <label style={cs.label}>Saved so far (€)</label>
-              <input style={cs.input} type="number" step="0.01" placeholder="0.00"
-                value={form.saved} onChange={e => setForm({ ...form, saved: e.target.value })} />
-            </div>
+          <div style={cs.field}>
+            <label style={cs.label}>Target (€) — {fmtEur(Number(goal.current_amount))} saved so far</label>
+            <input style={cs.input} type="number" step="0.01" min={Number(goal.current_amount) || 0.01} placeholder="5000.00"
+              value={form.target} onChange={e => setForm({ ...form, target: e.target.value })} required />
           </div>
           <div style={cs.field}>
             <label style={cs.label}>Deadline</label>
             <input style={{ ...cs.input, colorScheme: 'dark' }} type="date"
               value={form.deadline} onChange={e => setForm({ ...form, deadline: e.target.value })} />
           </div>
-          <button type="submit" style={cs.submitBtn}>Save Changes</button>
+          {error && <p style={cs.error}>{error}</p>}
+          <button type="submit" disabled={loading} style={{ ...cs.submitBtn, opacity: loading ? 0.7 : 1 }}>{loading ? 'Saving...' : 'Save Changes'}</button>
+        </form>
+      </div>
+    </div>
+  )
+}
+
+function AddFundsModal({ goal, onClose, onSaved }) {
+  const [amount, setAmount] = useState('')
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState('')
+  const remaining = Number(goal.target_amount) - Number(goal.current_amount)
+  const handleSubmit = async (e) => {
+    e.preventDefault(); setLoading(true); setError('')
+    try {
+      await addFunds(goal.id, parseFloat(amount))
+      await onSaved(); onClose()
+    } catch (err) { setError(err.response?.data?.detail || 'Failed to add funds.') }
+    finally { setLoading(false) }
+  }
+  return (
+    <div style={cs.overlay} onClick={onClose}>
+      <div style={cs.modal} onClick={e => e.stopPropagation()}>
+        <div style={cs.modalHeader}>
+          <h2 style={cs.modalTitle}>Add Funds — {goal.name}</h2>
+          <button onClick={onClose} style={cs.iconBtn}><IconClose /></button>
+        </div>
+        <form onSubmit={handleSubmit} style={cs.form}>
+          <div style={cs.field}>
+            <label style={cs.label}>Amount (€) — up to {fmtEur(remaining)}</label>
+            <input style={cs.input} type="number" step="0.01" min="0.01" max={remaining} placeholder="0.00"
+              value={amount} onChange={e => setAmount(e.target.value)} required />
+          </div>
+          {error && <p style={cs.error}>{error}</p>}
+          <button type="submit" disabled={loading} style={{ ...cs.submitBtn, opacity: loading ? 0.7 : 1 }}>{loading ? 'Saving...' : 'Add Funds'}</button>
         </form>
       </div>
     </div>
@@ -427,33 +497,23 @@ function EditTransactionModal({ tx, accounts, onClose, onSaved }) {
   const handleSubmit = async (e) => {
     e.preventDefault(); setLoading(true); setError('')
     try {
-      await deleteTransaction(tx.id)
       if (form.type === 'transfer') {
         if (!form.to_account_id) { setError('Please select a destination account.'); setLoading(false); return }
-        await createTransaction({
-          account_id: parseInt(form.account_id),
-          type: 'expense',
-          category: 'Transfer',
-          amount: parseFloat(form.amount),
-          description: `Transfer to ${accounts.find(a => a.id === parseInt(form.to_account_id))?.name || ''}`,
-          date: originalDate,   // ← data original preservada
-        })
-        await createTransaction({
-          account_id: parseInt(form.to_account_id),
-          type: 'income',
-          category: 'Transfer',
+        // Replaces this transaction with both legs of the transfer, in one request
+        await createTransfer({
+          from_account_id: parseInt(form.account_id),
+          to_account_id: parseInt(form.to_account_id),
           amount: parseFloat(form.amount),
-          description: `Transfer from ${accounts.find(a => a.id === parseInt(form.account_id))?.name || ''}`,
           date: originalDate,   // ← data original preservada
+          replace_transaction_id: tx.id,
         })
       } else {
-        await createTransaction({
+        await updateTransaction(tx.id, {
           account_id: parseInt(form.account_id),
           type: form.type,
           category: form.category,
           amount: parseFloat(form.amount),
           description: form.description || null,
-          date: originalDate,   // ← data original preservada
         })
       }
       onSaved(); onClose()
@@ -551,10 +611,15 @@ export default function Dashboard() {
   const [currentMonth, setCurrentMonth] = useState(now.getMonth())
   const [currentYear, setCurrentYear] = useState(now.getFullYear())
   const [accounts, setAccounts] = useState([])
-  const [transactions, setTransactions] = useState([])
+  const [transactions, setTransactions] = useState([])   // the month on screen, as far as it has been paged in
+  const [txCursor, setTxCursor] = useState(null)
+  const [loadingMoreTx, setLoadingMoreTx] = useState(false)
+  const [reports, setReports] = useState({})              // GET /reports: month, trend, daily, weekly, monthly, yearly
+  const [accountView, setAccountView] = useState({ account: null, items: [], cursor: null, allTime: null, last30: null })
   const [budgets, setBudgets] = useState([])
   const [editBudget, setEditBudget] = useState(null)
   const [editGoal,   setEditGoal]   = useState(null)
+  const [fundGoal,   setFundGoal]   = useState(null)
   const [goals, setGoals] = useState([])
   const [categories, setCategories] = useState([])
   const [loading, setLoading] = useState(true)
@@ -597,113 +662,202 @@ export default function Dashboard() {
   const [settingsSaved, setSettingsSaved] = useState(false)
 
   const fetchAccounts     = async () => { try { setAccounts(await listAccounts()) } catch (e) { console.error(e) } finally { setLoading(false) } }
-  const fetchTransactions = async () => { try { setTransactions(await listTransactions()) } catch (e) { console.error(e) } }
+  // What is on screen: read by fetches started from event handlers, and to drop stale responses
+  const view = useRef({})
+  view.current = { month: currentMonth, year: currentYear, account: selectedAccount }
+  const isOnScreen = (month, year) => view.current.month === month && view.current.year === year
+
+  const fetchTransactions = async (cursor = null) => {
+    const { month, year } = view.current
+    const [date_from, date_to] = monthRange(year, month)
+    try {
+      const page = await listTransactionsPage({ date_from, date_to, limit: TX_PAGE_SIZE, ...(cursor ? { cursor } : {}) })
+      if (!isOnScreen(month, year)) return
+      setTransactions(prev => {
+        if (!cursor) return page.items
+        const loaded = new Set(prev.map(t => t.id))
+        return [...prev, ...page.items.filter(t => !loaded.has(t.id))]
+      })
+      setTxCursor(page.next_cursor)
+    } catch (e) { console.error(e) }
+  }
+  const loadMoreTransactions = async () => {
+    if (!txCursor || loadingMoreTx) return
+    setLoadingMoreTx(true)
+    try { await fetchTransactions(txCursor) } finally { setLoadingMoreTx(false) }
+  }
+
+  // Totals and charts are grouped in the database (GET /reports), not summed from loaded transactions
+  const fetchReports = async () => {
+    const { month, year } = view.current
+    const today = new Date()
+    const [monthFrom, monthTo] = monthRange(year, month)
+    const weeksFrom = daysAgo((today.getDay() + 6) % 7 + 21)   // Monday three weeks back: 4 weeks
+    try {
+      const [monthReport, trend, daily, weekly, monthly, yearly] = await Promise.all([
+        getReport(monthFrom, monthTo, 'month'),
+        getReport(monthRange(year, month - 5)[0], monthTo, 'month'),
+        getReport(isoDay(daysAgo(6)), isoDay(today), 'day'),
+        getReport(isoDay(weeksFrom), isoDay(today), 'week'),
+        getReport(isoDay(new Date(today.getFullYear(), today.getMonth() - 11, 1)), isoDay(today), 'month'),
+        getReport(`${today.getFullYear() - 9}-01-01`, isoDay(today), 'year'),
+      ])
+      if (!isOnScreen(month, year)) return
+      setReports({ month: monthReport, trend, daily, weekly, monthly, yearly })
+    } catch (e) { console.error(e) }
+  }
+
+  // The open account: its first page of transactions, totals over the last 10 years and the last 30 days
+  const fetchAccountView = async (cursor = null) => {
+    const account = view.current.account
+    if (!account) return
+    const today = isoDay(new Date())
+    try {
+      if (cursor) {
+        const page = await listTransactionsPage({ account_id: account, limit: TX_PAGE_SIZE, cursor })
+        if (view.current.account !== account) return
+        setAccountView(prev => ({ ...prev, items: [...prev.items, ...page.items], cursor: page.next_cursor }))
+        return
+      }
+      const [page, allTime, last30] = await Promise.all([
+        listTransactionsPage({ account_id: account, limit: TX_PAGE_SIZE }),
+        getReport(`${new Date().getFullYear() - 9}-01-01`, today, 'year', account),
+        getReport(isoDay(daysAgo(29)), today, 'day', account),
+      ])
+      if (view.current.account !== account) return
+      setAccountView({ account, items: page.items, cursor: page.next_cursor, allTime, last30 })
+    } catch (e) { console.error(e) }
+  }
+
+  const refreshTransactions = () => { fetchTransactions(); fetchReports(); fetchAccountView() }
+  // Bursts of live events (an import) refresh the aggregates once
+  const refreshTimer = useRef(null)
+  const refreshReportsSoon = () => {
+    clearTimeout(refreshTimer.current)
+    refreshTimer.current = setTimeout(() => { fetchReports(); fetchAccountView() }, 500)
+  }
   const fetchBudgets      = async () => { try { setBudgets(await listBudgets()) } catch (e) { console.error(e) } }
-  const fetchGoals        = () => setGoals(JSON.parse(localStorage.getItem('goals') || '[]'))
+  const fetchGoals        = async () => { try { setGoals(await listGoals()) } catch (e) { console.error(e) } }
   const fetchCategories   = () => setCategories(JSON.parse(localStorage.getItem('categories') || '[]'))
 
+  // Goals used to be kept in localStorage ({ name, target, saved, deadline }): move them to the API once.
+  // Each one leaves localStorage as soon as it is created, so an interrupted import never doubles a goal.
+  const importingGoals = useRef(false)
+  const importLocalGoals = async () => {
+    let pending = JSON.parse(localStorage.getItem('goals') || '[]')
+    if (!pending.length) { localStorage.removeItem('goals'); return }
+    if (importingGoals.current) return
+    importingGoals.current = true
+    let imported = 0
+    try {
+      while (pending.length) {
+        const old = pending[0]
+        const target = parseFloat(old.target)
+        let goal = null
+        try { goal = await createGoal(old.name || 'Goal', target, old.deadline || null) }
+        catch (e) {
+          // Anything but a rejected goal (network, auth, server): stop, the rest is tried again next visit
+          if (![400, 422].includes(e.response?.status)) return
+          console.error('Skipped local goal', old, e)
+        }
+        pending = pending.slice(1)
+        localStorage.setItem('goals', JSON.stringify(pending))
+        const saved = Math.min(parseFloat(old.saved) || 0, target)
+        if (goal) { imported++; if (saved > 0) await addFunds(goal.id, saved).catch(console.error) }
+      }
+      localStorage.removeItem('goals')
+    } finally {
+      importingGoals.current = false
+      if (imported) await fetchGoals()
+    }
+  }
+
   useEffect(() => {
-    const load = async () => { await fetchAccounts(); await fetchTransactions(); await fetchBudgets() }
-    load(); fetchGoals(); fetchCategories()
+    // One round trip for the first render; older transactions (if any) follow in the background
+    const load = async () => {
+      try {
+        // Transactions are paged in per month below, so none are needed here
+        const data = await getDashboard({ tx_limit: 1 })
+        setAccounts(data.accounts); setBudgets(data.budgets); setGoals(data.goals)
+      } catch (e) { console.error(e) } finally { setLoading(false) }
+    }
+    load().then(importLocalGoals); fetchCategories()
   }, [])
 
+  useEffect(() => { setTransactions([]); setTxCursor(null); fetchTransactions(); fetchReports() }, [currentMonth, currentYear])
+  useEffect(() => {
+    setAccountView({ account: null, items: [], cursor: null, allTime: null, last30: null })
+    fetchAccountView()
+  }, [selectedAccount])
+
+  // Changes made elsewhere (another tab, an import) arrive over /events instead of being refetched
+  const knownAccounts = useRef(new Set())
+  useEffect(() => { knownAccounts.current = new Set(accounts.map(a => a.id)) }, [accounts])
+  useEffect(() => subscribeEvents({
+    transaction: ({ op, transaction }) => {
+      refreshReportsSoon()
+      setTransactions(prev => {
+        const rest = prev.filter(t => t.id !== transaction.id)
+        const d = new Date(transaction.date)
+        if (op === 'delete' || !isOnScreen(d.getMonth(), d.getFullYear())) return rest
+        return [transaction, ...rest].sort((a, b) => new Date(b.date) - new Date(a.date) || b.id - a.id)
+      })
+    },
+    balance: ({ account_id, balance, deleted }) => {
+      if (deleted) {
+        // Its transactions, and the spending they counted in budgets, went with it
+        setAccounts(prev => prev.filter(a => a.id !== account_id))
+        setTransactions(prev => prev.filter(t => t.account_id !== account_id))
+        refreshReportsSoon()
+        return fetchBudgets()
+      }
+      // A new account: fetch it whole
+      if (!knownAccounts.current.has(account_id)) return fetchAccounts()
+      setAccounts(prev => prev.map(a => a.id === account_id ? { ...a, balance } : a))
+    },
+    budget: ({ budget_id, limit_amount, spent, percentage }) => setBudgets(prev => prev.map(b => b.id === budget_id ? { ...b, limit_amount, spent, percentage } : b)),
+    resync: () => { fetchAccounts(); refreshTransactions(); fetchBudgets() },
+  }), [])
+
   const prevMonth = () => { if (currentMonth === 0) { setCurrentMonth(11); setCurrentYear(y => y - 1) } else setCurrentMonth(m => m - 1) }
   const nextMonth = () => { if (currentMonth === 11) { setCurrentMonth(0); setCurrentYear(y => y + 1) } else setCurrentMonth(m => m + 1) }
 
-  const monthTxs      = useMemo(() => transactions.filter(tx => { const d = new Date(tx.date); return d.getMonth() === currentMonth && d.getFullYear() === currentYear }), [transactions, currentMonth, currentYear])
-  const totalIncome   = useMemo(() => monthTxs.filter(t => t.type === 'income').reduce((s, t) => s + Number(t.amount), 0), [monthTxs])
-  const totalExpenses = useMemo(() => monthTxs.filter(t => t.type === 'expense').reduce((s, t) => s + Number(t.amount), 0), [monthTxs])
+  const monthTxs      = transactions   // only the month on screen is loaded
+  const totalIncome   = reports.month?.totals.income ?? 0
+  const totalExpenses = reports.month?.totals.expense ?? 0
   const totalBalance  = useMemo(() => accounts.reduce((s, a) => s + Number(a.balance), 0), [accounts])
+  const totalTxCount  = reportCount(reports.yearly)
 
-  const last7Days = useMemo(() => {
-    const days = []
-    for (let i = 6; i >= 0; i--) {
-      const d = new Date(); d.setDate(d.getDate() - i)
-      const label = `${d.getDate().toString().padStart(2,'0')}/${(d.getMonth()+1).toString().padStart(2,'0')}`
-      const dayStr = d.toISOString().split('T')[0]
-      days.push({ label, expenses: transactions.filter(t => t.type==='expense' && t.date?.startsWith(dayStr)).reduce((s,t)=>s+Number(t.amount),0), income: transactions.filter(t => t.type==='income' && t.date?.startsWith(dayStr)).reduce((s,t)=>s+Number(t.amount),0) })
-    }
-    return days
-  }, [transactions])
-
-  const expensesByCategory = useMemo(() => {
-    const map = {}
-    monthTxs.filter(t => t.type === 'expense').forEach(t => { map[t.category] = (map[t.category] || 0) + Number(t.amount) })
-    return Object.entries(map).map(([name, value]) => ({ name, value: Math.round(value * 100) / 100 })).sort((a, b) => b.value - a.value)
-  }, [monthTxs])
-
-  const last6Months = useMemo(() => {
-    const result = []
-    for (let i = 5; i >= 0; i--) {
-      const d = new Date(currentYear, currentMonth - i, 1)
-      const m = d.getMonth(); const y = d.getFullYear()
-      const txs = transactions.filter(t => { const td = new Date(t.date); return td.getMonth() === m && td.getFullYear() === y })
-      result.push({ label: MONTHS[m].slice(0,3), expenses: txs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0), income: txs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0) })
-    }
-    return result
-  }, [transactions, currentMonth, currentYear])
-
-  const weeklyReport = useMemo(() => {
-    const weeks = []
-    for (let w = 3; w >= 0; w--) {
-      const start = new Date(); start.setDate(start.getDate() - (w+1)*7)
-      const end   = new Date(); end.setDate(end.getDate() - w*7)
-      const txs   = transactions.filter(t => { const d = new Date(t.date); return d >= start && d < end })
-      const label = `${start.getDate().toString().padStart(2,'0')}/${(start.getMonth()+1).toString().padStart(2,'0')}`
-      weeks.push({
-        label, period: `${start.toLocaleDateString('pt-PT')} – ${end.toLocaleDateString('pt-PT')}`,
-        income:   txs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0),
-        expenses: txs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0),
-        txCount:  txs.length
-      })
-    }
-    return weeks
-  }, [transactions])
-
-  const monthlyReport = useMemo(() => {
-    const result = []
-    for (let i = 11; i >= 0; i--) {
-      const d = new Date(now.getFullYear(), now.getMonth() - i, 1)
-      const m = d.getMonth(); const y = d.getFullYear()
-      const txs = transactions.filter(t => { const td = new Date(t.date); return td.getMonth() === m && td.getFullYear() === y })
-      const income   = txs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0)
-      const expenses = txs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0)
-      result.push({ label: `${MONTHS[m].slice(0,3)} ${y}`, income, expenses, net: income - expenses, txCount: txs.length })
-    }
-    return result
-  }, [transactions])
+  const monthLabel = (d) => MONTHS[d.getMonth()].slice(0,3)
+  const last7Days          = useMemo(() => periodRows(reports.daily, ddmm), [reports])
+  const expensesByCategory = useMemo(() => reportCategories(reports.month), [reports])
+  const last6Months        = useMemo(() => periodRows(reports.trend, monthLabel), [reports])
+  const last12Months       = useMemo(() => periodRows(reports.monthly, monthLabel), [reports])
+
+  const weeklyReport = useMemo(() => periodRows(reports.weekly, ddmm).map(w => {
+    const end = new Date(w.start); end.setDate(end.getDate() + 6)
+    return { ...w, period: `${w.start.toLocaleDateString('pt-PT')} – ${end.toLocaleDateString('pt-PT')}` }
+  }), [reports])
+
+  const monthlyReport = useMemo(() => periodRows(reports.monthly, d => `${monthLabel(d)} ${d.getFullYear()}`), [reports])
 
   const annualReport = useMemo(() => {
-    const years = [...new Set(transactions.map(t => new Date(t.date).getFullYear()))].sort()
-    if (years.length === 0) years.push(now.getFullYear())
-    return years.map(y => {
-      const txs = transactions.filter(t => new Date(t.date).getFullYear() === y)
-      const income   = txs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0)
-      const expenses = txs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0)
-      return { label: String(y), income, expenses, net: income - expenses, txCount: txs.length }
-    })
-  }, [transactions])
+    // From the first year with any transaction
+    const years = periodRows(reports.yearly, d => String(d.getFullYear()))
+    const first = years.findIndex(y => y.txCount > 0)
+    return first < 0 ? years.slice(-1) : years.slice(first)
+  }, [reports])
 
   const chartData = useMemo(() => {
     if (chartPeriod === '7days') return last7Days
-    if (chartPeriod === '6months') return last6Months
-    if (chartPeriod === '12months') {
-      const result = []
-      for (let i = 11; i >= 0; i--) {
-        const d = new Date(now.getFullYear(), now.getMonth() - i, 1)
-        const m = d.getMonth(); const y = d.getFullYear()
-        const txs = transactions.filter(t => { const td = new Date(t.date); return td.getMonth() === m && td.getFullYear() === y })
-        result.push({ label: MONTHS[m].slice(0,3), expenses: txs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0), income: txs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0) })
-      }
-      return result
-    }
+    if (chartPeriod === '12months') return last12Months
     return last6Months
-  }, [chartPeriod, last7Days, last6Months, transactions])
+  }, [chartPeriod, last7Days, last6Months, last12Months])
 
   const handleDelete       = async (id) => { if (!confirm('Delete this account?')) return; try { await deleteAccount(id); fetchAccounts() } catch { alert('Failed.') } }
-  const handleDeleteTx     = async (id) => { if (!confirm('Delete?')) return; try { await deleteTransaction(id); fetchTransactions(); fetchAccounts() } catch { alert('Failed.') } }
+  const handleDeleteTx     = async (id) => { if (!confirm('Delete?')) return; try { await deleteTransaction(id); refreshTransactions(); fetchAccounts() } catch { alert('Failed.') } }
   const handleDeleteBudget = async (id) => { if (!confirm('Delete?')) return; try { await deleteBudget(id); fetchBudgets() } catch { alert('Failed.') } }
-  const handleDeleteGoal   = (id) => { if (!confirm('Delete goal?')) return; const updated = goals.filter(g => g.id !== id); localStorage.setItem('goals', JSON.stringify(updated)); setGoals(updated) }
+  const handleDeleteGoal   = async (id) => { if (!confirm('Delete goal?')) return; try { await deleteGoal(id); fetchGoals() } catch { alert('Failed.') } }
   const handleDeleteCategory = (id) => { if (!confirm('Delete category?')) return; const updated = categories.filter(c => c.id !== id); localStorage.setItem('categories', JSON.stringify(updated)); setCategories(updated) }
   const handleLogout       = () => { localStorage.removeItem('access_token'); localStorage.removeItem('user'); navigate('/login') }
 
@@ -715,26 +869,8 @@ export default function Dashboard() {
     setSettingsSaved(true); setTimeout(() => setSettingsSaved(false), 2500)
   }
 
-  const exportCSV = () => {
-    const headers = ['Date','Type','Category','Amount','Description','Account']
-    const rows = transactions.map(tx => {
-      const acc = accounts.find(a => a.id === tx.account_id)
-      return [tx.date, tx.type, tx.category, tx.amount, tx.description || '', acc?.name || '']
-    })
-    const csv = [headers, ...rows].map(r => r.join(',')).join('\n')
-    const blob = new Blob([csv], { type: 'text/csv' })
-    const url  = URL.createObjectURL(blob)
-    const a    = document.createElement('a'); a.href = url; a.download = 'transactions.csv'; a.click()
-    URL.revokeObjectURL(url)
-  }
-
-  const exportJSON = () => {
-    const data = { accounts, transactions, budgets, exportedAt: new Date().toISOString() }
-    const blob = new Blob([JSON.stringify(data, null, 2)], { type: 'application/json' })
-    const url  = URL.createObjectURL(blob)
-    const a    = document.createElement('a'); a.href = url; a.download = 'fincontrol-backup.json'; a.click()
-    URL.revokeObjectURL(url)
-  }
+  const exportCSV  = async () => { try { await exportTransactionsCSV() } catch { alert('Export failed.') } }
+  const exportJSON = async () => { try { await exportBackupJSON() } catch { alert('Export failed.') } }
 
   const handleTabChange = (tab) => { setActiveTab(tab); setSelectedAccount(null) }
 
@@ -946,27 +1082,14 @@ export default function Dashboard() {
                 (() => {
                   const acc = accounts.find(a => a.id === selectedAccount)
                   if (!acc) return null
-                  const accTxs = transactions.filter(t => t.account_id === acc.id)
-                  const accIncome   = accTxs.filter(t=>t.type==='income').reduce((s,t)=>s+Number(t.amount),0)
-                  const accExpenses = accTxs.filter(t=>t.type==='expense').reduce((s,t)=>s+Number(t.amount),0)
-                  const accColor    = accentColor(acc.type)
-                  const accLast30 = []
-                  for (let i = 29; i >= 0; i--) {
-                    const d = new Date(); d.setDate(d.getDate() - i)
-                    const dayStr = d.toISOString().split('T')[0]
-                    const label  = `${d.getDate().toString().padStart(2,'0')}/${(d.getMonth()+1).toString().padStart(2,'0')}`
-                    accLast30.push({
-                      label,
-                      income:   accTxs.filter(t=>t.type==='income'  && t.date?.startsWith(dayStr)).reduce((s,t)=>s+Number(t.amount),0),
-                      expenses: accTxs.filter(t=>t.type==='expense' && t.date?.startsWith(dayStr)).reduce((s,t)=>s+Number(t.amount),0),
-                    })
-                  }
-                  const accByCategory = (() => {
-                    const map = {}
-                    accTxs.filter(t=>t.type==='expense').forEach(t => { map[t.category]=(map[t.category]||0)+Number(t.amount) })
-                    return Object.entries(map).map(([name,value])=>({name,value:Math.round(value*100)/100})).sort((a,b)=>b.value-a.value)
-                  })()
-                  const sortedAccTxs = [...accTxs].sort((a,b)=>new Date(b.date)-new Date(a.date))
+                  const accTxs        = accountView.account === acc.id ? accountView.items : []   // newest first, paged
+                  const accIncome     = accountView.allTime?.totals.income ?? 0
+                  const accExpenses   = accountView.allTime?.totals.expense ?? 0
+                  const accTxCount    = reportCount(accountView.allTime)
+                  const accColor      = accentColor(acc.type)
+                  const accLast30     = periodRows(accountView.last30, ddmm)
+                  const accByCategory = reportCategories(accountView.allTime)
+                  const sortedAccTxs  = accTxs
                   return (
                     <div>
                       <div style={cs.pageHeader}>
@@ -993,7 +1116,7 @@ export default function Dashboard() {
                           { label: 'Current Balance', value: fmtEur(acc.balance),         color: accColor },
                           { label: 'Total Income',    value: fmtEur(accIncome),            color: '#4D9FF0' },
                           { label: 'Total Expenses',  value: fmtEur(accExpenses),          color: '#F04D4D' },
-                          { label: 'Transactions',    value: accTxs.length,                color: '#F0A04D' },
+                          { label: 'Transactions',    value: accTxCount,                   color: '#F0A04D' },
                         ].map(c => (
                           <div key={c.label} style={{ ...cs.statCard, borderTop: `3px solid ${c.color}` }}>
                             <p style={cs.statLabel}>{c.label}</p>
@@ -1043,7 +1166,7 @@ export default function Dashboard() {
                         </div>
                       </div>
                       <div style={cs.section}>
-                        <h2 style={cs.sectionTitle}>All Transactions ({sortedAccTxs.length})</h2>
+                        <h2 style={cs.sectionTitle}>All Transactions ({accTxCount})</h2>
                         {sortedAccTxs.length === 0 ? <p style={cs.muted}>No transactions for this account.</p> : sortedAccTxs.map((tx, i) => {
                           const color = tx.type === 'income' ? '#4D9FF0' : '#F04D4D'
                           return (
@@ -1064,6 +1187,7 @@ export default function Dashboard() {
                             </div>
                           )
                         })}
+                        {accountView.cursor && <LoadMore onLoad={() => fetchAccountView(accountView.cursor)} loading={false} />}
                       </div>
                     </div>
                   )
@@ -1088,7 +1212,7 @@ export default function Dashboard() {
                               </div>
                               <div>
                                 <p style={{ margin: 0, fontSize: 14, fontWeight: 600 }}>{acc.name}</p>
-                                <p style={{ margin: 0, fontSize: 11, color: '#555', textTransform: 'capitalize' }}>{acc.type} · {transactions.filter(t=>t.account_id===acc.id).length} transactions</p>
+                                <p style={{ margin: 0, fontSize: 11, color: '#555', textTransform: 'capitalize' }}>{acc.type}</p>
                               </div>
                             </div>
                             <div style={{ display: 'flex', alignItems: 'center', gap: 14 }}>
@@ -1110,7 +1234,7 @@ export default function Dashboard() {
               <div style={{ marginBottom: 16 }}>
                 <h1 style={{ ...cs.pageTitle, fontSize: isMobile ? 20 : 24 }}>Transactions</h1>
               </div>
-              {transactions.length === 0 ? (
+              {totalTxCount === 0 && transactions.length === 0 ? (
                 <div style={cs.empty}><p style={cs.muted}>No transactions yet.</p></div>
               ) : (
                 <div style={{ display: 'flex', flexDirection: isMobile ? 'column' : 'row', gap: 14, alignItems: 'flex-start', minHeight: '100%' }}>
@@ -1186,6 +1310,7 @@ export default function Dashboard() {
                         )
                       })
                     })()}
+                    {txCursor && <LoadMore onLoad={loadMoreTransactions} loading={loadingMoreTx} />}
                   </div>
 
                   <div style={{ width: isMobile ? '100%' : '38%', flexShrink: 0, display: 'flex', flexDirection: 'column', gap: 10, position: 'sticky', top: 16 }}>
@@ -1196,7 +1321,7 @@ export default function Dashboard() {
                           { label: 'Income',   value: fmtEur(totalIncome),              color: '#4D9FF0' },
                           { label: 'Expenses', value: fmtEur(totalExpenses),             color: '#F04D4D' },
                           { label: 'Net',      value: fmtEur(totalIncome-totalExpenses), color: totalIncome-totalExpenses >= 0 ? '#C9F04D' : '#F04D4D' },
-                          { label: 'Txns',     value: monthTxs.length,                  color: '#aaa' },
+                          { label: 'Txns',     value: reportCount(reports.month),       color: '#aaa' },
                         ].map(s => (
                           <div key={s.label} style={{ background: '#161616', borderRadius: 8, padding: '8px 10px' }}>
                             <p style={{ margin: '0 0 2px', fontSize: 10, color: '#555', textTransform: 'uppercase' }}>{s.label}</p>
@@ -1321,12 +1446,12 @@ export default function Dashboard() {
                 <div style={{ display: 'flex', flexDirection: 'column', gap: 14 }}>
                   <div style={{ display: 'grid', gridTemplateColumns: isMobile ? '1fr 1fr' : 'repeat(3, 1fr)', gap: 12 }}>
                     <div style={cs.statCard}><p style={cs.statLabel}>Total Goals</p><p style={{ ...cs.statValue, fontSize: isMobile ? 16 : 20 }}>{goals.length}</p></div>
-                    <div style={cs.statCard}><p style={cs.statLabel}>Total Target</p><p style={{ ...cs.statValue, fontSize: isMobile ? 16 : 20 }}>{fmtEur(goals.reduce((s,g)=>s+g.target,0))}</p></div>
-                    <div style={cs.statCard}><p style={cs.statLabel}>Total Saved</p><p style={{ ...cs.statValue, color: '#4D9FF0', fontSize: isMobile ? 16 : 20 }}>{fmtEur(goals.reduce((s,g)=>s+g.saved,0))}</p></div>
+                    <div style={cs.statCard}><p style={cs.statLabel}>Total Target</p><p style={{ ...cs.statValue, fontSize: isMobile ? 16 : 20 }}>{fmtEur(goals.reduce((s,g)=>s+Number(g.target_amount),0))}</p></div>
+                    <div style={cs.statCard}><p style={cs.statLabel}>Total Saved</p><p style={{ ...cs.statValue, color: '#4D9FF0', fontSize: isMobile ? 16 : 20 }}>{fmtEur(goals.reduce((s,g)=>s+Number(g.current_amount),0))}</p></div>
                   </div>
                   {goals.map(goal => {
-                    const pct = Math.min(Math.round((goal.saved / goal.target) * 100), 100)
-                    const remaining = goal.target - goal.saved
+                    const pct = Math.min(Math.round(goal.percentage), 100)
+                    const remaining = goal.remaining
                     const daysLeft = goal.deadline ? Math.ceil((new Date(goal.deadline) - new Date()) / 86400000) : null
                     const barColor = pct >= 100 ? '#C9F04D' : pct > 60 ? '#4D9FF0' : '#F0A04D'
                     return (
@@ -1335,12 +1460,13 @@ export default function Dashboard() {
                           <div>
                             <p style={{ margin: '0 0 4px', fontSize: 16, fontWeight: 700 }}>{goal.name}</p>
                             <p style={{ margin: 0, fontSize: 12, color: '#555' }}>
-                              {fmtEur(goal.saved)} saved of {fmtEur(goal.target)}
+                              {fmtEur(Number(goal.current_amount))} saved of {fmtEur(Number(goal.target_amount))}
                               {daysLeft !== null && <span style={{ marginLeft: 10, color: daysLeft < 30 ? '#F04D4D' : '#555' }}>{daysLeft > 0 ? `${daysLeft} days left` : 'Overdue'}</span>}
                             </p>
                           </div>
                           <div style={{ display: 'flex', alignItems: 'center', gap: 10 }}>
                             <span style={{ fontSize: 20, fontWeight: 800, color: barColor }}>{pct}%</span>
+                            {pct < 100 && <button onClick={() => setFundGoal(goal)} style={{ ...cs.deleteBtn, color: '#4D9FF0' }}><IconPlus /></button>}
                             <button onClick={() => setEditGoal(goal)} style={{ ...cs.deleteBtn, color: '#4D9FF0' }}><IconEdit /></button>
                             <button onClick={() => handleDeleteGoal(goal.id)} style={cs.deleteBtn}><IconTrash /></button>
                           </div>
@@ -1602,7 +1728,7 @@ export default function Dashboard() {
                 <div style={{ display: 'grid', gridTemplateColumns: isMobile ? '1fr 1fr' : 'repeat(4, 1fr)', gap: 12 }}>
                   {[
                     { label: 'Accounts',     value: accounts.length },
-                    { label: 'Transactions', value: transactions.length },
+                    { label: 'Transactions', value: totalTxCount },
                     { label: 'Budgets',      value: budgets.length },
                     { label: 'Goals',        value: goals.length },
                   ].map(s => (
@@ -1617,9 +1743,9 @@ export default function Dashboard() {
                 <h2 style={{ ...cs.sectionTitle, color: '#F04D4D' }}>Danger Zone</h2>
                 <p style={{ color: '#666', fontSize: 13, marginBottom: 16 }}>These actions are irreversible. Please proceed with caution.</p>
                 <button
-                  onClick={() => { if (confirm('Clear all goals and categories stored locally? This cannot be undone.')) { localStorage.removeItem('goals'); localStorage.removeItem('categories'); fetchGoals(); fetchCategories() } }}
+                  onClick={() => { if (confirm('Clear all categories stored locally? This cannot be undone.')) { localStorage.removeItem('categories'); fetchCategories() } }}
                   style={{ background: 'transparent', border: '1px solid #F04D4D', color: '#F04D4D', borderRadius: 8, padding: '10px 18px', fontSize: 13, fontWeight: 600, cursor: 'pointer', fontFamily: "'DM Sans', sans-serif" }}>
-                  Clear Local Data (Goals & Categories)
+                  Clear Local Data (Categories)
                 </button>
               </div>
             </div>
@@ -1842,13 +1968,14 @@ export default function Dashboard() {
       )}
 
       {showModal         && <CreateAccountModal    onClose={() => setShowModal(false)}         onCreated={fetchAccounts} />}
-      {showTxModal       && <CreateTransactionModal accounts={accounts} onClose={() => setShowTxModal(false)} onCreated={() => { fetchTransactions(); fetchAccounts(); fetchBudgets() }} />}
+      {showTxModal       && <CreateTransactionModal accounts={accounts} onClose={() => setShowTxModal(false)} onCreated={() => { refreshTransactions(); fetchAccounts(); fetchBudgets() }} />}
       {showBudgetModal   && <CreateBudgetModal      onClose={() => setShowBudgetModal(false)}   onCreated={fetchBudgets} />}
       {showGoalModal     && <CreateGoalModal        onClose={() => setShowGoalModal(false)}     onCreated={fetchGoals} />}
       {showCategoryModal && <CreateCategoryModal    onClose={() => setShowCategoryModal(false)} onCreated={fetchCategories} />}
-      {editTx     && <EditTransactionModal tx={editTx}         accounts={accounts} onClose={() => setEditTx(null)}     onSaved={() => { fetchTransactions(); fetchAccounts(); fetchBudgets() }} />}
+      {editTx     && <EditTransactionModal tx={editTx}         accounts={accounts} onClose={() => setEditTx(null)}     onSaved={() => { refreshTransactions(); fetchAccounts(); fetchBudgets() }} />}
       {editBudget && <EditBudgetModal      budget={editBudget}                     onClose={() => setEditBudget(null)} onSaved={fetchBudgets} />}
       {editGoal   && <EditGoalModal        goal={editGoal}                         onClose={() => setEditGoal(null)}   onSaved={fetchGoals} />}
+      {fundGoal   && <AddFundsModal        goal={fundGoal}                         onClose={() => setFundGoal(null)}   onSaved={fetchGoals} />}
     </div>
   )
 }